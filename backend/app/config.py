@@ -9,6 +9,98 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: str
     TEST_MODE: bool = False  # Flag to enable test mode (bypasses Firebase auth)
 
+    # Total Postgres connections shared by all worker processes (keep below max_connections)
+    DB_CONNECTION_BUDGET: int = 40
+    DB_POOL_MIN_SIZE: int = 1
+    # Seconds a request waits for a free pooled connection before failing
+    DB_POOL_TIMEOUT: float = 10.0
+    # Named prepared statements kept per connection (0 disables preparing)
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    WEB_CONCURRENCY: int = 1  # Number of worker processes, set by main.py
+
+    # Optional comma-separated read replica URLs used by read-only GET handlers
+    DATABASE_REPLICA_URLS: str = ""
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DB_REPLICA_LAG_CHECK_INTERVAL: float = 2.0
+    # After a write, a user's reads stay on the primary for this long
+    DB_READ_YOUR_WRITES_SECONDS: float = 10.0
+
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0
+    # Safety net only; changes reach other workers through the invalidation bus
+    RELATION_CACHE_TTL_SECONDS: float = 300.0
+    # Users identity map (by id and firebase_uid); also invalidated over the bus
+    USER_CACHE_TTL_SECONDS: float = 300.0
+    USER_CACHE_MAX_SIZE: int = 10000
+    # One LISTEN connection per worker (taken from its share of the budget)
+    CACHE_INVALIDATION_BUS: bool = True
+    # How often sharded interest group member counts are folded (0 disables)
+    GROUP_MEMBER_COUNT_FOLD_INTERVAL: float = 60.0
+    # Let Postgres render the JSON for the heaviest list endpoints
+    RENDER_JSON_IN_DB: bool = False
+    # Rows fetched per server-side cursor round trip in admin exports
+    EXPORT_ITERSIZE: int = 2000
+    # Admin exports streaming at once per worker, each on its own connection
+    # (taken from the worker's share of the budget, like the dedicated listeners)
+    EXPORT_MAX_CONCURRENT: int = 1
+    # Per-row errors returned by an admin bulk import (the count is always exact)
+    BULK_IMPORT_MAX_ERRORS: int = 1000
+    # How often queued video analysis jobs are picked up (0 disables)
+    VIDEO_ANALYSIS_INTERVAL: float = 15.0
+    VIDEO_ANALYSIS_BATCH_SIZE: int = 5
+
+    # Monthly notifications partitions: how many future months to pre-create,
+    # and how long read / unread months are kept before their partition goes
+    NOTIFICATION_PARTITIONS_AHEAD: int = 3
+    NOTIFICATION_RETENTION_MONTHS: int = 6
+    NOTIFICATION_UNREAD_RETENTION_MONTHS: int = 12
+    # Detach and keep expired partitions (archived_notifications_YYYY_MM)
+    NOTIFICATION_ARCHIVE_EXPIRED: bool = False
+    NOTIFICATION_PARTITION_MAINTENANCE_INTERVAL: float = 3600.0
+
+    # Background purge of deleted users: poll interval (0 disables), rows per
+    # batch transaction, and the pause between batches
+    USER_PURGE_INTERVAL: float = 10.0
+    USER_PURGE_BATCH_SIZE: int = 500
+    USER_PURGE_BATCH_PAUSE: float = 0.05
+
+    # Task reminders and overdue notices; one worker leads (advisory lock) and
+    # holds one extra connection, taken from its share of the budget
+    TASK_SCHEDULER_ENABLED: bool = True
+    TASK_REMINDER_LEAD_MINUTES: int = 30
+    # Deadlines this far ahead are kept in memory; reloaded on this interval
+    TASK_SCHEDULER_HORIZON_HOURS: int = 6
+    TASK_SCHEDULER_RELOAD_INTERVAL: float = 900.0
+    # Tasks per notification statement
+    TASK_NOTIFICATION_BATCH_SIZE: int = 200
+
+    # Duplicate check on new tickets: trigram similarity that counts as a likely
+    # duplicate, how far back same-category tickets are compared, and the
+    # similarity at which the new ticket is linked to an open one (> 1 disables)
+    TICKET_DUPLICATE_SIMILARITY: float = 0.45
+    TICKET_DUPLICATE_WINDOW_DAYS: int = 30
+    TICKET_DUPLICATE_AUTO_LINK_SIMILARITY: float = 0.8
+
+    # SLA escalation of stale tickets: poll interval (0 disables) and tickets
+    # claimed per policy and status in one transaction
+    TICKET_ESCALATION_INTERVAL: float = 60.0
+    TICKET_ESCALATION_BATCH_SIZE: int = 100
+
+    # Idempotency-Key replays: how long responses are kept, how long a duplicate
+    # waits for the first request (polling when that runs in another worker),
+    # and after how long an unfinished first request that stopped renewing its
+    # claim (every third of that) is considered abandoned
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    IDEMPOTENCY_WAIT_TIMEOUT: float = 60.0
+    IDEMPOTENCY_POLL_INTERVAL: float = 0.2
+    IDEMPOTENCY_LOCK_TIMEOUT: float = 300.0
+
+    # Responses smaller than this are sent uncompressed
+    COMPRESSION_MIN_SIZE: int = 1024
+    # Bodies at least this large are compressed off the event loop
+    COMPRESSION_THREAD_THRESHOLD: int = 65536
+    GZIP_COMPRESSION_LEVEL: int = 6
+    BROTLI_COMPRESSION_QUALITY: int = 5
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
@@ -1,8 +1,26 @@
+import asyncio
+import tempfile
+
+from app.config import settings
 from app.database.db import get_db_connection
+from app.database.json_render import fetch_json_document
 from app.logger import logger
 from app.modules.auth.auth_service import auth_service
+from app.modules.cache.invalidation_bus import invalidation_bus
+from app.modules.cache.user_cache import user_cache
+from app.modules.export.data_export import (
+    EXPORTS,
+    FORMATS,
+    ExportStream,
+    build_export_query,
+)
+from app.modules.onboarding.bulk_import import IMPORT_FORMATS
+from app.modules.onboarding.bulk_import import import_users as run_user_import
 from app.payloads import TicketStatus, UserRole, UserStatus
-from app.utils.response_formatter import format_response
+from app.utils.response_formatter import format_response, json_data_response
+from fastapi.responses import StreamingResponse
+from psycopg2 import pool
+from starlette.background import BackgroundTask
 
 
 async def get_system_users(request):
@@ -24,9 +42,23 @@ async def get_system_users(request):
 
         with get_db_connection() as conn:
             with conn.cursor() as cur:
+                if settings.RENDER_JSON_IN_DB:
+                    data_json = fetch_json_document(
+                        cur,
+                        """SELECT id, gmail_id, full_name, role, status, created_at
+                           FROM users WHERE deleted_at IS NULL""",
+                        (),
+                        "users",
+                    )
+                    return json_data_response(
+                        status_code=200,
+                        message="System users retrieved successfully.",
+                        data_json=data_json,
+                    )
+
                 cur.execute(
                     """SELECT id, gmail_id, full_name, role, status, created_at
-                       FROM users"""
+                       FROM users WHERE deleted_at IS NULL"""
                 )
                 users_data = cur.fetchall()
 
@@ -74,13 +106,31 @@ async def delete_user(request, userId, validated_data):
                 status_code=403, message="Access denied. Only admins can delete users."
             )
 
+        # Hide the user now; user_purger removes their data in the background
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute("DELETE FROM users WHERE id = %s", (userId,))
-                if cur.rowcount == 0:
+                cur.execute(
+                    """WITH marked AS (
+                           UPDATE users SET deleted_at = CURRENT_TIMESTAMP
+                           WHERE id = %s AND deleted_at IS NULL
+                           RETURNING id
+                       )
+                       INSERT INTO user_deletions (user_id, requested_by)
+                       SELECT id, %s FROM marked
+                       RETURNING user_id""",
+                    (userId, user.id),
+                )
+                if cur.fetchone() is None:
                     return format_response(status_code=404, message="User not found.")
+                invalidation_bus.publish(cur, "users", userId)
 
-        return format_response(status_code=200, message="User deleted successfully.")
+        user_cache.invalidate(userId)
+
+        return format_response(
+            status_code=202,
+            message="User deletion scheduled.",
+            data={"user_id": userId, "status": "pending"},
+        )
 
     except ValueError as e:
         logger.error(f"Authentication failed: {e}")
@@ -92,6 +142,67 @@ async def delete_user(request, userId, validated_data):
         return format_response(status_code=500, message="Internal server error.")
 
 
+async def get_user_deletion(request, userId):
+    logger.info(f"Executing get_user_deletion controller logic for user ID: {userId}.")
+    try:
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            return format_response(
+                status_code=401, message="Authorization header missing or invalid."
+            )
+        id_token = auth_header.split(" ")[1]
+
+        user, is_registered = auth_service.authenticate_user(id_token)
+        if not is_registered or user.role != UserRole.ADMIN:
+            return format_response(
+                status_code=403,
+                message="Access denied. Only admins can view deletion progress.",
+            )
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """SELECT user_id, requested_by, status, current_step,
+                              rows_processed, tickets_reassigned, requested_at,
+                              updated_at, completed_at
+                       FROM user_deletions WHERE user_id = %s""",
+                    (userId,),
+                )
+                deletion_data = cur.fetchone()
+
+        if not deletion_data:
+            return format_response(
+                status_code=404, message="No deletion found for this user."
+            )
+
+        return format_response(
+            status_code=200,
+            message="Deletion progress retrieved successfully.",
+            data={
+                "deletion": {
+                    "user_id": deletion_data[0],
+                    "requested_by": deletion_data[1],
+                    "status": deletion_data[2],
+                    "current_step": deletion_data[3],
+                    "rows_processed": deletion_data[4],
+                    "tickets_reassigned": deletion_data[5],
+                    "requested_at": deletion_data[6],
+                    "updated_at": deletion_data[7],
+                    "completed_at": deletion_data[8],
+                }
+            },
+        )
+
+    except ValueError as e:
+        logger.error(f"Authentication failed: {e}")
+        return format_response(
+            status_code=401, message="Authentication failed. Invalid token."
+        )
+    except Exception as e:
+        logger.error(f"Error retrieving deletion progress: {e}")
+        return format_response(status_code=500, message="Internal server error.")
+
+
 async def get_caregivers_for_review(request):
     logger.info("Executing get_caregivers_for_review controller logic.")
     try:
@@ -114,7 +225,7 @@ async def get_caregivers_for_review(request):
                 cur.execute(
                     """SELECT id, full_name, gmail_id, youtube_url, description, tags, created_at
                        FROM users
-                       WHERE role = %s AND status = %s""",
+                       WHERE role = %s AND status = %s AND deleted_at IS NULL""",
                     (
                         UserRole.CAREGIVER.value,
                         UserStatus.PENDING_APPROVAL.value,
@@ -189,6 +300,9 @@ async def review_caregiver(request, caregiverId, validated_data):
                         status_code=404,
                         message="Caregiver not found or not in pending approval status.",
                     )
+                invalidation_bus.publish(cur, "users", caregiverId)
+
+        user_cache.invalidate(caregiverId)
 
         return format_response(
             status_code=200,
@@ -381,7 +495,7 @@ async def get_interest_group_admins_for_review(request):
                 cur.execute(
                     """SELECT id, full_name, gmail_id, youtube_url, description, tags, created_at
                        FROM users
-                       WHERE role = %s AND status = %s""",
+                       WHERE role = %s AND status = %s AND deleted_at IS NULL""",
                     (
                         UserRole.INTEREST_GROUP_ADMIN.value,
                         UserStatus.PENDING_APPROVAL.value,
@@ -456,6 +570,9 @@ async def review_interest_group_admin(request, interestGroupAdminId, validated_d
                         status_code=404,
                         message="Interest group admin not found or not in pending approval status.",
                     )
+                invalidation_bus.publish(cur, "users", interestGroupAdminId)
+
+        user_cache.invalidate(interestGroupAdminId)
 
         return format_response(
             status_code=200,
@@ -470,3 +587,106 @@ async def review_interest_group_admin(request, interestGroupAdminId, validated_d
     except Exception as e:
         logger.error(f"Error reviewing interest group admin: {e}")
         return format_response(status_code=500, message="Internal server error.")
+
+
+async def export_data(request, entity):
+    logger.info(f"Executing export_data controller logic for entity: {entity}.")
+    try:
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            return format_response(
+                status_code=401, message="Authorization header missing or invalid."
+            )
+        id_token = auth_header.split(" ")[1]
+
+        user, is_registered = auth_service.authenticate_user(id_token)
+        if not is_registered or user.role != UserRole.ADMIN:
+            return format_response(
+                status_code=403, message="Access denied. Only admins can export data."
+            )
+
+        if entity not in EXPORTS:
+            return format_response(
+                status_code=404,
+                message=f"Unknown export. Available: {', '.join(EXPORTS)}.",
+            )
+
+        fmt = request.query_params.get("format", "csv")
+        if fmt not in FORMATS:
+            return format_response(
+                status_code=400, message="Format must be csv or ndjson."
+            )
+
+        try:
+            query, params = build_export_query(entity, request.query_params)
+        except ValueError:
+            return format_response(status_code=400, message="Invalid filter parameter.")
+
+        # Opened before the response starts, so failures still get a status
+        try:
+            export = await asyncio.to_thread(ExportStream, entity, query, params, fmt)
+        except pool.PoolError:
+            return format_response(
+                status_code=503,
+                message="Too many exports are running. Please try again shortly.",
+            )
+
+        return StreamingResponse(
+            export,
+            media_type=FORMATS[fmt],
+            headers={"Content-Disposition": f'attachment; filename="{entity}.{fmt}"'},
+            # Also releases the connection if the body was never iterated
+            background=BackgroundTask(export.close),
+        )
+
+    except ValueError as e:
+        logger.error(f"Authentication failed: {e}")
+        return format_response(
+            status_code=401, message="Authentication failed. Invalid token."
+        )
+    except Exception as e:
+        logger.error(f"Error exporting {entity}: {e}")
+        return format_response(status_code=500, message="Internal server error.")
+
+
+async def import_users(request):
+    logger.info("Executing import_users controller logic.")
+    try:
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            return format_response(
+                status_code=401, message="Authorization header missing or invalid."
+            )
+        id_token = auth_header.split(" ")[1]
+
+        user, is_registered = auth_service.authenticate_user(id_token)
+        if not is_registered or user.role != UserRole.ADMIN:
+            return format_response(
+                status_code=403, message="Access denied. Only admins can import users."
+            )
+
+        fmt = request.query_params.get("format", "csv")
+        if fmt not in IMPORT_FORMATS:
+            return format_response(
+                status_code=400, message="Format must be csv or ndjson."
+            )
+
+        # Spool the upload (to disk once large) and import it off the event loop
+        with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as upload:
+            async for chunk in request.stream():
+                upload.write(chunk)
+            upload.seek(0)
+            result = await asyncio.to_thread(run_user_import, upload, fmt)
+
+        return format_response(
+            status_code=200, message="Bulk import completed.", data=result
+        )
+
+    except ValueError as e:
+        logger.error(f"Authentication failed: {e}")
+        return format_response(
+            status_code=401, message="Authentication failed. Invalid token."
+        )
+    except Exception as e:
+        logger.error(f"Error importing users: {e}")
+        return format_response(status_code=500, message="Internal server error.")
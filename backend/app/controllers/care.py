@@ -1,6 +1,22 @@
-from app.database.db import get_db_connection
+from app.config import settings
+from app.database.db import get_db_connection, get_read_connection
 from app.logger import logger
 from app.modules.auth.auth_service import auth_service
+from app.modules.cache.relation_cache import relation_cache
+from app.modules.cache.user_cache import user_cache
+from app.modules.care.nearby import (
+    DEFAULT_LIMIT,
+    DEFAULT_RADIUS_KM,
+    MAX_LIMIT,
+    MAX_RADIUS_KM,
+    find_nearby_caregivers,
+)
+from app.modules.care.visits import (
+    CONFLICT_MESSAGE,
+    fetch_availability,
+    find_conflicting_visit,
+    parse_availability_query,
+)
 from app.payloads import (
     AcceptCaregiverRequest,
     AcceptEngagement,
@@ -14,48 +30,112 @@ from app.payloads import (
     UserRole,
     UserStatus,
 )
-from app.utils.response_formatter import format_response
+from app.utils.http_cache import (
+    get_table_versions,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    set_cache_headers,
+)
+from app.utils.response_formatter import format_response, json_data_response
+from psycopg2 import errors
+
+CAREGIVERS_CACHE_CONTROL = "private, max-age=300"
+
+
+def _is_active_caregiver(caregiver):
+    return (
+        caregiver is not None
+        and caregiver.role == UserRole.CAREGIVER
+        and caregiver.status == UserStatus.ACTIVE
+    )
 
 
-def check_duplicate_care_request(cursor, senior_citizen_id, caregiver_id, made_by):
+def insert_care_request(
+    cursor,
+    senior_citizen_id,
+    caregiver_id,
+    made_by,
+    timing_to_visit,
+    location,
+    check_senior_citizen_id=None,
+    visit_duration_minutes=60,
+    latitude=None,
+    longitude=None,
+):
     """
-    Check for duplicate care requests based on business rules:
-    - PENDING/ACCEPTED: No duplicates allowed
+    Create a pending care request unless a business rule forbids it:
+    - PENDING/ACCEPTED: No duplicates allowed (uq_care_requests_active)
     - CANCELLED: Can create new (duplicate allowed)
-    - REJECTED: Can create new up to 3 times maximum
-    """
-    # Check for existing PENDING or ACCEPTED requests (no duplicates allowed)
-    cursor.execute(
-        """SELECT id, status FROM care_requests
-           WHERE senior_citizen_id = %s AND caregiver_id = %s AND made_by = %s
-           AND status IN ('pending', 'accepted')""",
-        (senior_citizen_id, caregiver_id, made_by),
-    )
-    active_requests = cursor.fetchall()
+    - REJECTED: Can create new up to 3 times maximum (care_request_rejections)
 
-    if active_requests:
-        return (
-            False,
-            f"Duplicate care request not allowed. You already have a {active_requests[0][1]} request with this caregiver.",
-        )
+    Rules are checked for `check_senior_citizen_id` (defaults to the request's
+    senior citizen); the no-duplicates rule also covers the stored senior
+    citizen, including NULL for direct requests. Everything happens in one INSERT ... ON CONFLICT statement,
+    so concurrent submissions cannot both succeed.
+
+    Returns (request_id, None) on success or (None, error_message).
+    """
+    if check_senior_citizen_id is None:
+        check_senior_citizen_id = senior_citizen_id
 
-    # Check for REJECTED requests (max 3 times)
     cursor.execute(
-        """SELECT COUNT(*) FROM care_requests
-           WHERE senior_citizen_id = %s AND caregiver_id = %s AND made_by = %s
-           AND status = 'rejected'""",
-        (senior_citizen_id, caregiver_id, made_by),
+        """WITH guard AS (
+               SELECT
+                   (SELECT status::text FROM care_requests
+                    WHERE (senior_citizen_id = %(check_senior_citizen_id)s
+                           OR senior_citizen_id IS NOT DISTINCT FROM %(senior_citizen_id)s::integer)
+                      AND caregiver_id = %(caregiver_id)s AND made_by = %(made_by)s
+                      AND status IN ('pending', 'accepted')
+                    LIMIT 1) AS active_status,
+                   (SELECT rejected_count FROM care_request_rejections
+                    WHERE senior_citizen_id = %(check_senior_citizen_id)s
+                      AND caregiver_id = %(caregiver_id)s AND made_by = %(made_by)s
+                   ) AS rejected_count
+           ),
+           created AS (
+               INSERT INTO care_requests (senior_citizen_id, caregiver_id, made_by, status, timing_to_visit,
+                                          visit_duration_minutes, location, latitude, longitude)
+               SELECT %(senior_citizen_id)s::integer, %(caregiver_id)s, %(made_by)s, %(status)s::care_request_status,
+                      %(timing_to_visit)s::timestamp, %(visit_duration_minutes)s, %(location)s,
+                      %(latitude)s::float8, %(longitude)s::float8
+               FROM guard
+               WHERE guard.active_status IS NULL AND COALESCE(guard.rejected_count, 0) < 3
+               ON CONFLICT (senior_citizen_id, caregiver_id, made_by)
+                   WHERE status IN ('pending', 'accepted') DO NOTHING
+               RETURNING id
+           )
+           SELECT (SELECT id FROM created), guard.active_status, guard.rejected_count
+           FROM guard""",
+        {
+            "senior_citizen_id": senior_citizen_id,
+            "check_senior_citizen_id": check_senior_citizen_id,
+            "caregiver_id": caregiver_id,
+            "made_by": made_by,
+            "status": CareRequestStatus.PENDING.value,
+            "timing_to_visit": timing_to_visit,
+            "visit_duration_minutes": visit_duration_minutes,
+            "location": location,
+            "latitude": latitude,
+            "longitude": longitude,
+        },
     )
-    rejected_count = cursor.fetchone()[0]
+    request_id, active_status, rejected_count = cursor.fetchone()
+    if request_id is not None:
+        return request_id, None
 
-    if rejected_count >= 3:
+    if active_status is None and (rejected_count or 0) >= 3:
         return (
-            False,
+            None,
             "Maximum limit of 3 rejected requests with this caregiver reached. Cannot create new request.",
         )
 
-    # CANCELLED requests are allowed to create new ones
-    return True, None
+    # A conflicting request committed concurrently is always a new pending one
+    active_status = active_status or CareRequestStatus.PENDING.value
+    return (
+        None,
+        f"Duplicate care request not allowed. You already have a {active_status} request with this caregiver.",
+    )
 
 
 async def view_open_requests(request):
@@ -77,6 +157,14 @@ async def view_open_requests(request):
 
         with get_db_connection() as conn:
             with conn.cursor() as cur:
+                if settings.RENDER_JSON_IN_DB:
+                    data_json = _render_open_requests_json(cur, user.id)
+                    return json_data_response(
+                        status_code=200,
+                        message="Care requests retrieved successfully.",
+                        data_json=data_json,
+                    )
+
                 # Get all care requests for this caregiver, grouped by senior citizen and sorted by latest first
                 cur.execute(
                     """SELECT
@@ -91,8 +179,8 @@ async def view_open_requests(request):
                            cr.made_by,
                            u.full_name as requester_name
                        FROM care_requests cr
-                       JOIN users sc ON cr.senior_citizen_id = sc.id
-                       JOIN users u ON cr.made_by = u.id
+                       JOIN users sc ON cr.senior_citizen_id = sc.id AND sc.deleted_at IS NULL
+                       JOIN users u ON cr.made_by = u.id AND u.deleted_at IS NULL
                        WHERE cr.caregiver_id = %s
                        ORDER BY cr.senior_citizen_id, cr.created_at DESC""",
                     (user.id,),
@@ -143,6 +231,42 @@ async def view_open_requests(request):
         return format_response(status_code=500, message="Internal server error.")
 
 
+def _render_open_requests_json(cur, caregiver_id):
+    """Same grouping and ordering as view_open_requests, rendered by Postgres."""
+    cur.execute(
+        """SELECT json_build_object(
+                      'care_requests',
+                      COALESCE(json_agg(g.doc ORDER BY g.latest DESC), '[]'::json)
+                  )::text
+           FROM (
+               SELECT json_build_object(
+                          'senior_citizen_id', cr.senior_citizen_id,
+                          'senior_citizen_name', sc.full_name,
+                          'requests', json_agg(
+                              json_build_object(
+                                  'id', cr.id,
+                                  'status', cr.status,
+                                  'timing_to_visit', cr.timing_to_visit,
+                                  'location', cr.location,
+                                  'created_at', cr.created_at,
+                                  'updated_at', cr.updated_at,
+                                  'made_by', cr.made_by,
+                                  'requester_name', u.full_name
+                              ) ORDER BY cr.created_at DESC
+                          )
+                      ) AS doc,
+                      MAX(cr.created_at) AS latest
+               FROM care_requests cr
+               JOIN users sc ON cr.senior_citizen_id = sc.id AND sc.deleted_at IS NULL
+               JOIN users u ON cr.made_by = u.id AND u.deleted_at IS NULL
+               WHERE cr.caregiver_id = %s
+               GROUP BY cr.senior_citizen_id, sc.full_name
+           ) g""",
+        (caregiver_id,),
+    )
+    return cur.fetchone()[0]
+
+
 async def get_caregiver_requests(request):
     logger.info("Executing get_caregiver_requests controller logic.")
     try:
@@ -175,8 +299,8 @@ async def get_caregiver_requests(request):
                         """SELECT cr.id, cr.caregiver_id, cg.full_name as caregiver_name, cr.status, cr.created_at,
                                   cr.senior_citizen_id, sc.full_name as senior_citizen_name
                            FROM care_requests cr
-                           JOIN users cg ON cr.caregiver_id = cg.id
-                           LEFT JOIN users sc ON cr.senior_citizen_id = sc.id
+                           JOIN users cg ON cr.caregiver_id = cg.id AND cg.deleted_at IS NULL
+                           LEFT JOIN users sc ON cr.senior_citizen_id = sc.id AND sc.deleted_at IS NULL
                            WHERE cr.made_by = %s""",
                         (user.id,),
                     )
@@ -203,8 +327,8 @@ async def get_caregiver_requests(request):
                         """SELECT cr.id, cr.caregiver_id, cg.full_name as caregiver_name, cr.status, cr.created_at,
                                   cr.senior_citizen_id, sc.full_name as senior_citizen_name
                            FROM care_requests cr
-                           JOIN users cg ON cr.caregiver_id = cg.id
-                           JOIN users sc ON cr.senior_citizen_id = sc.id
+                           JOIN users cg ON cr.caregiver_id = cg.id AND cg.deleted_at IS NULL
+                           JOIN users sc ON cr.senior_citizen_id = sc.id AND sc.deleted_at IS NULL
                            JOIN relations r ON cr.senior_citizen_id = r.senior_citizen_id
                            WHERE r.family_member_id = %s AND cr.made_by != %s""",
                         (user.id, user.id),
@@ -235,7 +359,7 @@ async def get_caregiver_requests(request):
                     cur.execute(
                         """SELECT cr.id, cr.caregiver_id, cg.full_name as caregiver_name, cr.status, cr.created_at
                            FROM care_requests cr
-                           JOIN users cg ON cr.caregiver_id = cg.id
+                           JOIN users cg ON cr.caregiver_id = cg.id AND cg.deleted_at IS NULL
                            WHERE cr.made_by = %s""",
                         (user.id,),
                     )
@@ -259,7 +383,7 @@ async def get_caregiver_requests(request):
                     cur.execute(
                         """SELECT cr.id, cr.caregiver_id, cg.full_name as caregiver_name, cr.status, cr.created_at
                            FROM care_requests cr
-                           JOIN users cg ON cr.caregiver_id = cg.id
+                           JOIN users cg ON cr.caregiver_id = cg.id AND cg.deleted_at IS NULL
                            WHERE cr.senior_citizen_id = %s AND cr.made_by != %s""",
                         (user.id, user.id),
                     )
@@ -331,67 +455,35 @@ async def request_caregiver(request, validated_data):
         with get_db_connection() as conn:
             with conn.cursor() as cur:
                 # Check if caregiver exists and is active
-                cur.execute(
-                    "SELECT id FROM users WHERE id = %s AND role = %s AND status = %s",
-                    (caregiver_id, UserRole.CAREGIVER, UserStatus.ACTIVE),
-                )
-                if not cur.fetchone():
+                if not _is_active_caregiver(user_cache.get(caregiver_id, cur)):
                     return format_response(
                         status_code=404, message="Caregiver not found or not available."
                     )
 
-                # Check for duplicate care request
+                # Senior citizen the duplicate rules are checked against
                 senior_citizen_id = None
                 if user.role == UserRole.FAMILY_MEMBER:
                     # For family members, we need to check against their linked senior citizens
-                    cur.execute(
-                        "SELECT senior_citizen_id FROM relations WHERE family_member_id = %s LIMIT 1",
-                        (user.id,),
+                    senior_citizen_id = relation_cache.primary_senior_citizen(
+                        cur, user.id
                     )
-                    sc_data = cur.fetchone()
-                    if sc_data:
-                        senior_citizen_id = sc_data[0]
                 else:
                     # For senior citizens, use their own ID
                     senior_citizen_id = user.id
 
-                if senior_citizen_id:
-                    is_duplicate, error_message = check_duplicate_care_request(
-                        cur, senior_citizen_id, caregiver_id, user.id
-                    )
-                    if not is_duplicate:
-                        return format_response(status_code=400, message=error_message)
-
-                # Create care request
-                if user.role == UserRole.FAMILY_MEMBER:
-                    # Family member creates request without specific senior citizen
-                    cur.execute(
-                        """INSERT INTO care_requests (senior_citizen_id, made_by, caregiver_id, status, timing_to_visit, location, created_at)
-                           VALUES (%s, %s, %s, %s, %s, %s, NOW()) RETURNING id""",
-                        (
-                            None,  # No specific senior citizen for direct caregiver requests
-                            user.id,
-                            caregiver_id,
-                            CareRequestStatus.PENDING.value,
-                            None,  # No specific timing for direct caregiver requests
-                            "Home",  # Default location
-                        ),
-                    )
-                else:  # SENIOR_CITIZEN
-                    # Senior citizen creates request for themselves
-                    cur.execute(
-                        """INSERT INTO care_requests (senior_citizen_id, made_by, caregiver_id, status, timing_to_visit, location, created_at)
-                           VALUES (%s, %s, %s, %s, %s, %s, NOW()) RETURNING id""",
-                        (
-                            user.id,  # Senior citizen ID
-                            user.id,
-                            caregiver_id,
-                            CareRequestStatus.PENDING.value,
-                            None,  # No specific timing for direct caregiver requests
-                            "Home",  # Default location
-                        ),
-                    )
-                request_id = cur.fetchone()[0]
+                # Create care request; family members create it without a
+                # specific senior citizen but are checked against their linked one
+                request_id, error_message = insert_care_request(
+                    cur,
+                    user.id if user.role == UserRole.SENIOR_CITIZEN else None,
+                    caregiver_id,
+                    user.id,
+                    None,  # No specific timing for direct caregiver requests
+                    "Home",  # Default location
+                    check_senior_citizen_id=senior_citizen_id,
+                )
+                if error_message:
+                    return format_response(status_code=400, message=error_message)
 
         return format_response(
             status_code=201,
@@ -409,6 +501,32 @@ async def request_caregiver(request, validated_data):
         return format_response(status_code=500, message="Internal server error.")
 
 
+def _set_caregiver_request_status(cur, user, request_id, status):
+    """
+    Update the request's status if the user may act on it: family members for
+    requests concerning a related senior citizen, senior citizens for their own.
+    Returns False when the request does not exist or access is denied.
+    """
+    if user.role == UserRole.FAMILY_MEMBER:
+        cur.execute(
+            """UPDATE care_requests cr SET status = %s
+               FROM relations r
+               WHERE cr.id = %s
+                 AND r.senior_citizen_id = cr.senior_citizen_id
+                 AND r.family_member_id = %s
+               RETURNING cr.id""",
+            (status.value, request_id, user.id),
+        )
+    else:  # SENIOR_CITIZEN
+        cur.execute(
+            """UPDATE care_requests SET status = %s
+               WHERE id = %s AND senior_citizen_id = %s
+               RETURNING id""",
+            (status.value, request_id, user.id),
+        )
+    return cur.fetchone() is not None
+
+
 async def accept_caregiver_request(request, validated_data):
     logger.info("Executing accept_caregiver_request controller logic.")
     try:
@@ -433,35 +551,17 @@ async def accept_caregiver_request(request, validated_data):
 
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                # Check if request exists and user has permission to accept it
-                if user.role == UserRole.FAMILY_MEMBER:
-                    # Family member can accept requests for senior citizens they are related to
-                    cur.execute(
-                        """SELECT cr.id FROM care_requests cr
-                           JOIN relations r ON cr.senior_citizen_id = r.senior_citizen_id
-                           WHERE cr.id = %s AND r.family_member_id = %s""",
-                        (request_id, user.id),
-                    )
-                else:  # SENIOR_CITIZEN
-                    # Senior citizen can accept requests made for them
-                    cur.execute(
-                        """SELECT cr.id FROM care_requests cr
-                           WHERE cr.id = %s AND cr.senior_citizen_id = %s""",
-                        (request_id, user.id),
-                    )
-
-                if not cur.fetchone():
+                # Permission check and status change in one statement; an
+                # overlapping visit is only reported (by the exclusion
+                # constraint) for requests the user may act on
+                if not _set_caregiver_request_status(
+                    cur, user, request_id, CareRequestStatus.ACCEPTED
+                ):
                     return format_response(
                         status_code=404,
                         message="Caregiver request not found or access denied.",
                     )
 
-                # Update request status to accepted
-                cur.execute(
-                    "UPDATE care_requests SET status = %s WHERE id = %s",
-                    (CareRequestStatus.ACCEPTED.value, request_id),
-                )
-
         return format_response(
             status_code=200,
             message="Caregiver request accepted successfully.",
@@ -472,6 +572,9 @@ async def accept_caregiver_request(request, validated_data):
         return format_response(
             status_code=401, message="Authentication failed. Invalid token."
         )
+    except errors.ExclusionViolation:
+        # The caregiver already has an accepted visit that overlaps this one
+        return format_response(status_code=409, message=CONFLICT_MESSAGE)
     except Exception as e:
         logger.error(f"Error accepting caregiver request: {e}")
         return format_response(status_code=500, message="Internal server error.")
@@ -501,35 +604,15 @@ async def reject_caregiver_request(request, validated_data):
 
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                # Check if request exists and user has permission to reject it
-                if user.role == UserRole.FAMILY_MEMBER:
-                    # Family member can reject requests for senior citizens they are related to
-                    cur.execute(
-                        """SELECT cr.id FROM care_requests cr
-                           JOIN relations r ON cr.senior_citizen_id = r.senior_citizen_id
-                           WHERE cr.id = %s AND r.family_member_id = %s""",
-                        (request_id, user.id),
-                    )
-                else:  # SENIOR_CITIZEN
-                    # Senior citizen can reject requests made for them
-                    cur.execute(
-                        """SELECT cr.id FROM care_requests cr
-                           WHERE cr.id = %s AND cr.senior_citizen_id = %s""",
-                        (request_id, user.id),
-                    )
-
-                if not cur.fetchone():
+                # Permission check and status change in one statement
+                if not _set_caregiver_request_status(
+                    cur, user, request_id, CareRequestStatus.REJECTED
+                ):
                     return format_response(
                         status_code=404,
                         message="Caregiver request not found or access denied.",
                     )
 
-                # Update request status to rejected
-                cur.execute(
-                    "UPDATE care_requests SET status = %s WHERE id = %s",
-                    (CareRequestStatus.REJECTED.value, request_id),
-                )
-
         return format_response(
             status_code=200,
             message="Caregiver request rejected successfully.",
@@ -572,7 +655,7 @@ async def get_current_caregiver(request):
                     cur.execute(
                         """SELECT cg.id, cg.full_name, cg.gmail_id, cg.description, cg.tags
                            FROM care_requests cr
-                           JOIN users cg ON cr.caregiver_id = cg.id
+                           JOIN users cg ON cr.caregiver_id = cg.id AND cg.deleted_at IS NULL
                            JOIN relations r ON cr.senior_citizen_id = r.senior_citizen_id
                            WHERE r.family_member_id = %s AND cr.status = %s""",
                         (user.id, CareRequestStatus.ACCEPTED.value),
@@ -582,7 +665,7 @@ async def get_current_caregiver(request):
                     cur.execute(
                         """SELECT cg.id, cg.full_name, cg.gmail_id, cg.description, cg.tags
                            FROM care_requests cr
-                           JOIN users cg ON cr.caregiver_id = cg.id
+                           JOIN users cg ON cr.caregiver_id = cg.id AND cg.deleted_at IS NULL
                            WHERE cr.senior_citizen_id = %s AND cr.status = %s""",
                         (user.id, CareRequestStatus.ACCEPTED.value),
                     )
@@ -639,9 +722,9 @@ async def get_care_request(request, requestId):
                 cur.execute(
                     """SELECT cr.id, cr.senior_citizen_id, sc.full_name as senior_citizen_name, cr.caregiver_id, cg.full_name as caregiver_name, cr.made_by, mb.full_name as made_by_name, cr.status, cr.timing_to_visit, cr.location, cr.created_at, cr.updated_at
                        FROM care_requests cr
-                       JOIN users sc ON cr.senior_citizen_id = sc.id
-                       LEFT JOIN users cg ON cr.caregiver_id = cg.id
-                       JOIN users mb ON cr.made_by = mb.id
+                       JOIN users sc ON cr.senior_citizen_id = sc.id AND sc.deleted_at IS NULL
+                       LEFT JOIN users cg ON cr.caregiver_id = cg.id AND cg.deleted_at IS NULL
+                       JOIN users mb ON cr.made_by = mb.id AND mb.deleted_at IS NULL
                        WHERE cr.id = %s""",
                     (requestId,),
                 )
@@ -666,11 +749,7 @@ async def get_care_request(request, requestId):
                     and user.id != care_request_data[5]
                 ):  # made_by
                     # A family member can view requests they made, or requests for their senior citizen
-                    cur.execute(
-                        "SELECT 1 FROM relations WHERE senior_citizen_id = %s AND family_member_id = %s",
-                        (care_request_data[1], user.id),
-                    )
-                    if not cur.fetchone():
+                    if not relation_cache.is_linked(cur, user.id, care_request_data[1]):
                         return format_response(
                             status_code=403,
                             message="Access denied. You can only view care requests for your associated senior citizen or those you created.",
@@ -742,16 +821,12 @@ async def create_care_request(request, validated_data):
         with get_db_connection() as conn:
             with conn.cursor() as cur:
                 # Get caregiver ID
-                cur.execute(
-                    "SELECT id FROM users WHERE firebase_uid = %s AND role = %s",
-                    (caregiver_firebase_uid, UserRole.CAREGIVER.value),
-                )
-                caregiver_data = cur.fetchone()
-                if not caregiver_data:
+                caregiver = user_cache.get_by_firebase_uid(caregiver_firebase_uid, cur)
+                if not caregiver or caregiver.role != UserRole.CAREGIVER:
                     return format_response(
                         status_code=404, message="Caregiver not found."
                     )
-                caregiver_id = caregiver_data[0]
+                caregiver_id = caregiver.id
 
                 senior_citizen_id = user.id  # If senior citizen creates it
                 if user.role == UserRole.FAMILY_MEMBER:
@@ -759,39 +834,29 @@ async def create_care_request(request, validated_data):
                     # For simplicity, assuming the family member is creating for themselves or their primary senior citizen
                     # A more robust solution would involve a senior_citizen_id in the request payload for family members
                     # For now, let's assume the family member is creating for a senior citizen they are related to.
-                    cur.execute(
-                        "SELECT senior_citizen_id FROM relations WHERE family_member_id = %s LIMIT 1",
-                        (user.id,),
+                    senior_citizen_id = relation_cache.primary_senior_citizen(
+                        cur, user.id
                     )
-                    sc_data = cur.fetchone()
-                    if not sc_data:
+                    if not senior_citizen_id:
                         return format_response(
                             status_code=400,
                             message="Family member not associated with any senior citizen.",
                         )
-                    senior_citizen_id = sc_data[0]
 
-                # Check for duplicate care request
-                is_duplicate, error_message = check_duplicate_care_request(
-                    cur, senior_citizen_id, caregiver_id, user.id
+                care_request_id, error_message = insert_care_request(
+                    cur,
+                    senior_citizen_id,
+                    caregiver_id,
+                    user.id,
+                    timing_to_visit,
+                    location,
+                    visit_duration_minutes=validated_data.visit_duration_minutes,
+                    latitude=validated_data.latitude,
+                    longitude=validated_data.longitude,
                 )
-                if not is_duplicate:
+                if error_message:
                     return format_response(status_code=400, message=error_message)
 
-                cur.execute(
-                    """INSERT INTO care_requests (senior_citizen_id, caregiver_id, made_by, status, timing_to_visit, location)
-                       VALUES (%s, %s, %s, %s, %s, %s) RETURNING id""",
-                    (
-                        senior_citizen_id,
-                        caregiver_id,
-                        user.id,
-                        CareRequestStatus.PENDING.value,
-                        timing_to_visit,
-                        location,
-                    ),
-                )
-                care_request_id = cur.fetchone()[0]
-
         return format_response(
             status_code=201,
             message="Care request created successfully.",
@@ -849,11 +914,9 @@ async def update_care_request(request, requestId, validated_data):
                 if user.id != senior_citizen_id and user.id != made_by_id:
                     # If family member, check if they are related to the senior citizen of the request
                     if user.role == UserRole.FAMILY_MEMBER:
-                        cur.execute(
-                            "SELECT 1 FROM relations WHERE senior_citizen_id = %s AND family_member_id = %s",
-                            (senior_citizen_id, user.id),
-                        )
-                        if not cur.fetchone():
+                        if not relation_cache.is_linked(
+                            cur, user.id, senior_citizen_id
+                        ):
                             return format_response(
                                 status_code=403,
                                 message="Access denied. You can only update care requests for your associated senior citizen or those you created.",
@@ -873,6 +936,9 @@ async def update_care_request(request, requestId, validated_data):
                 if validated_data.timing_to_visit is not None:
                     update_fields.append("timing_to_visit = %s")
                     update_values.append(validated_data.timing_to_visit)
+                if validated_data.visit_duration_minutes is not None:
+                    update_fields.append("visit_duration_minutes = %s")
+                    update_values.append(validated_data.visit_duration_minutes)
                 if validated_data.location is not None:
                     update_fields.append("location = %s")
                     update_values.append(validated_data.location)
@@ -901,6 +967,9 @@ async def update_care_request(request, requestId, validated_data):
         return format_response(
             status_code=401, message="Authentication failed. Invalid token."
         )
+    except errors.ExclusionViolation:
+        # Another overlapping visit was accepted concurrently
+        return format_response(status_code=409, message=CONFLICT_MESSAGE)
     except Exception as e:
         logger.error(f"Error updating care request: {e}")
         return format_response(status_code=500, message="Internal server error.")
@@ -930,52 +999,56 @@ async def close_care_request(request, requestId):
 
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                # Verify ownership/permission and current status
+                # Permission check, state check and cancellation in one statement
                 cur.execute(
-                    "SELECT senior_citizen_id, made_by, status FROM care_requests WHERE id = %s",
-                    (requestId,),
+                    """WITH target AS (
+                           SELECT cr.id, cr.status,
+                                  (cr.senior_citizen_id = %(user_id)s
+                                   OR cr.made_by = %(user_id)s
+                                   OR (%(is_family_member)s AND EXISTS (
+                                       SELECT 1 FROM relations r
+                                       WHERE r.senior_citizen_id = cr.senior_citizen_id
+                                         AND r.family_member_id = %(user_id)s
+                                   ))) AS allowed
+                           FROM care_requests cr
+                           WHERE cr.id = %(request_id)s
+                       ),
+                       updated AS (
+                           UPDATE care_requests cr
+                           SET status = %(cancelled)s, updated_at = CURRENT_TIMESTAMP
+                           FROM target t
+                           WHERE cr.id = t.id AND t.allowed AND cr.status <> %(cancelled)s
+                           RETURNING cr.id
+                       )
+                       SELECT t.allowed, EXISTS (SELECT 1 FROM updated) FROM target t""",
+                    {
+                        "user_id": user.id,
+                        "is_family_member": user.role == UserRole.FAMILY_MEMBER,
+                        "request_id": requestId,
+                        "cancelled": CareRequestStatus.CANCELLED.value,
+                    },
                 )
-                req_data = cur.fetchone()
-                if not req_data:
+                result = cur.fetchone()
+                if not result:
                     return format_response(
                         status_code=404, message="Care request not found."
                     )
 
-                senior_citizen_id = req_data[0]
-                made_by_id = req_data[1]
-                current_status = req_data[2]
-
-                if user.id != senior_citizen_id and user.id != made_by_id:
-                    # If family member, check if they are related to the senior citizen of the request
+                allowed, closed = result
+                if not allowed:
                     if user.role == UserRole.FAMILY_MEMBER:
-                        cur.execute(
-                            "SELECT 1 FROM relations WHERE senior_citizen_id = %s AND family_member_id = %s",
-                            (senior_citizen_id, user.id),
-                        )
-                        if not cur.fetchone():
-                            return format_response(
-                                status_code=403,
-                                message="Access denied. You can only close care requests for your associated senior citizen or those you created.",
-                            )
-                    else:
                         return format_response(
                             status_code=403,
-                            message="Access denied. You can only close your own care requests.",
+                            message="Access denied. You can only close care requests for your associated senior citizen or those you created.",
                         )
-
-                if current_status == CareRequestStatus.CANCELLED.value:
                     return format_response(
-                        status_code=400, message="Care request is already cancelled."
+                        status_code=403,
+                        message="Access denied. You can only close your own care requests.",
                     )
 
-                cur.execute(
-                    "UPDATE care_requests SET status = %s, updated_at = CURRENT_TIMESTAMP WHERE id = %s",
-                    (CareRequestStatus.CANCELLED.value, requestId),
-                )
-                if cur.rowcount == 0:
+                if not closed:
                     return format_response(
-                        status_code=404,
-                        message="Care request not found or no changes made.",
+                        status_code=400, message="Care request is already cancelled."
                     )
 
         return format_response(
@@ -1006,12 +1079,16 @@ async def get_caregivers(request):
         if not is_registered:
             return format_response(status_code=401, message="User not registered.")
 
-        with get_db_connection() as conn:
+        with get_read_connection() as conn:
             with conn.cursor() as cur:
+                etag = make_etag("caregivers", get_table_versions(cur, ["users"]))
+                if is_not_modified(request, etag):
+                    return not_modified_response(etag, CAREGIVERS_CACHE_CONTROL)
+
                 cur.execute(
                     """SELECT id, full_name, description, tags, youtube_url
                        FROM users
-                       WHERE role = %s AND status = %s""",
+                       WHERE role = %s AND status = %s AND deleted_at IS NULL""",
                     (
                         UserRole.CAREGIVER.value,
                         UserStatus.ACTIVE.value,
@@ -1030,11 +1107,12 @@ async def get_caregivers(request):
                     for cg in caregivers_data
                 ]
 
-        return format_response(
+        response = format_response(
             status_code=200,
             message="Caregivers retrieved successfully.",
             data={"caregivers": caregivers},
         )
+        return set_cache_headers(response, etag, CAREGIVERS_CACHE_CONTROL)
 
     except ValueError as e:
         logger.error(f"Authentication failed: {e}")
@@ -1046,6 +1124,101 @@ async def get_caregivers(request):
         return format_response(status_code=500, message="Internal server error.")
 
 
+async def get_caregiver_availability(request):
+    logger.info("Executing get_caregiver_availability controller logic.")
+    try:
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            return format_response(
+                status_code=401, message="Authorization header missing or invalid."
+            )
+        id_token = auth_header.split(" ")[1]
+
+        user, is_registered = auth_service.authenticate_user(id_token)
+        if not is_registered:
+            return format_response(status_code=401, message="User not registered.")
+
+        try:
+            start, end, caregiver_ids = parse_availability_query(request.query_params)
+        except ValueError:
+            return format_response(
+                status_code=400,
+                message="Pass ISO 'start' and 'end' at most 31 days apart, and at most 200 comma-separated 'caregiver_ids'.",
+            )
+
+        with get_read_connection() as conn:
+            with conn.cursor() as cur:
+                caregivers = fetch_availability(cur, start, end, caregiver_ids)
+
+        return format_response(
+            status_code=200,
+            message="Caregiver availability retrieved successfully.",
+            data={"start": start, "end": end, "caregivers": caregivers},
+        )
+
+    except ValueError as e:
+        logger.error(f"Authentication failed: {e}")
+        return format_response(
+            status_code=401, message="Authentication failed. Invalid token."
+        )
+    except Exception as e:
+        logger.error(f"Error retrieving caregiver availability: {e}")
+        return format_response(status_code=500, message="Internal server error.")
+
+
+async def get_nearby_caregivers(request):
+    logger.info("Executing get_nearby_caregivers controller logic.")
+    try:
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            return format_response(
+                status_code=401, message="Authorization header missing or invalid."
+            )
+        id_token = auth_header.split(" ")[1]
+
+        user, is_registered = auth_service.authenticate_user(id_token)
+        if not is_registered:
+            return format_response(status_code=401, message="User not registered.")
+
+        params = request.query_params
+        try:
+            lat = float(params.get("lat", ""))
+            lng = float(params.get("lng", ""))
+            radius_km = float(params.get("radius", DEFAULT_RADIUS_KM))
+            limit = int(params.get("limit", DEFAULT_LIMIT))
+            if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+                raise ValueError("Coordinates out of range")
+            if not 0 < radius_km <= MAX_RADIUS_KM or not 0 < limit <= MAX_LIMIT:
+                raise ValueError("Radius or limit out of range")
+        except ValueError:
+            return format_response(
+                status_code=400,
+                message=f"Pass numeric 'lat' and 'lng', a 'radius' in km up to {MAX_RADIUS_KM:g} and a 'limit' up to {MAX_LIMIT}.",
+            )
+        tags = [tag for tag in params.get("tags", "").split(",") if tag.strip()]
+
+        with get_read_connection() as conn:
+            with conn.cursor() as cur:
+                caregivers = find_nearby_caregivers(
+                    cur, lat, lng, radius_km, tags, limit
+                )
+
+        return format_response(
+            status_code=200,
+            message="Nearby caregivers retrieved successfully.",
+            data={"caregivers": caregivers},
+        )
+
+    except ValueError as e:
+        logger.error(f"Authentication failed: {e}")
+        return format_response(
+            status_code=401, message="Authentication failed. Invalid token."
+        )
+    except Exception as e:
+        logger.error(f"Error retrieving nearby caregivers: {e}")
+        return format_response(status_code=500, message="Internal server error.")
+
+
 async def get_caregiver_profile(request, caregiverId):
     logger.info(
         f"Executing get_caregiver_profile controller logic for caregiver ID: {caregiverId}."
@@ -1064,36 +1237,35 @@ async def get_caregiver_profile(request, caregiverId):
 
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    """SELECT id, full_name, description, tags, youtube_url
-                       FROM users
-                       WHERE id = %s AND role = %s AND status = %s""",
-                    (
-                        caregiverId,
-                        UserRole.CAREGIVER.value,
-                        UserStatus.ACTIVE.value,
-                    ),
+                etag = make_etag(
+                    "caregiver_profile",
+                    caregiverId,
+                    get_table_versions(cur, ["users"]),
                 )
-                caregiver_data = cur.fetchone()
+                if is_not_modified(request, etag):
+                    return not_modified_response(etag, CAREGIVERS_CACHE_CONTROL)
 
-                if not caregiver_data:
+                caregiver = user_cache.get(caregiverId, cur)
+
+                if not _is_active_caregiver(caregiver):
                     return format_response(
                         status_code=404, message="Caregiver not found or not active."
                     )
 
                 caregiver_profile = {
-                    "id": caregiver_data[0],
-                    "full_name": caregiver_data[1],
-                    "description": caregiver_data[2],
-                    "tags": caregiver_data[3],
-                    "youtube_url": caregiver_data[4],
+                    "id": caregiver.id,
+                    "full_name": caregiver.full_name,
+                    "description": caregiver.description,
+                    "tags": caregiver.tags,
+                    "youtube_url": caregiver.youtube_url,
                 }
 
-        return format_response(
+        response = format_response(
             status_code=200,
             message="Caregiver profile retrieved successfully.",
             data={"caregiver_profile": caregiver_profile},
         )
+        return set_cache_headers(response, etag, CAREGIVERS_CACHE_CONTROL)
 
     except ValueError as e:
         logger.error(f"Authentication failed: {e}")
@@ -1160,6 +1332,9 @@ async def apply_for_request(request, requestId, validated_data):
         return format_response(
             status_code=401, message="Authentication failed. Invalid token."
         )
+    except errors.ExclusionViolation:
+        # Another overlapping visit was accepted concurrently
+        return format_response(status_code=409, message=CONFLICT_MESSAGE)
     except Exception as e:
         logger.error(f"Error applying for care request: {e}")
         return format_response(status_code=500, message="Internal server error.")
@@ -1205,6 +1380,8 @@ async def accept_engagement(request, requestId, validated_data):
                     return format_response(
                         status_code=400, message="Care request is not pending."
                     )
+                if find_conflicting_visit(cur, requestId):
+                    return format_response(status_code=409, message=CONFLICT_MESSAGE)
 
                 # Update care request status to accepted
                 cur.execute(
@@ -1226,6 +1403,9 @@ async def accept_engagement(request, requestId, validated_data):
         return format_response(
             status_code=401, message="Authentication failed. Invalid token."
         )
+    except errors.ExclusionViolation:
+        # Another overlapping visit was accepted concurrently
+        return format_response(status_code=409, message=CONFLICT_MESSAGE)
     except Exception as e:
         logger.error(f"Error accepting engagement: {e}")
         return format_response(status_code=500, message="Internal server error.")
@@ -1321,14 +1501,7 @@ async def get_caregivers_for_senior_citizen(request, senior_citizen_id):
         with get_db_connection() as conn:
             with conn.cursor() as cur:
                 # Verify that the family member is linked to this senior citizen
-                cur.execute(
-                    """SELECT id FROM relations
-                       WHERE family_member_id = %s AND senior_citizen_id = %s""",
-                    (user.id, senior_citizen_id),
-                )
-                relation = cur.fetchone()
-
-                if not relation:
+                if not relation_cache.is_linked(cur, user.id, senior_citizen_id):
                     return format_response(
                         status_code=403,
                         message="Access denied. You can only view caregivers for senior citizens you are linked to.",
@@ -1338,7 +1511,7 @@ async def get_caregivers_for_senior_citizen(request, senior_citizen_id):
                 cur.execute(
                     """SELECT id, full_name, gmail_id, description, tags, youtube_url, date_of_birth
                        FROM users
-                       WHERE role = %s AND status = %s
+                       WHERE role = %s AND status = %s AND deleted_at IS NULL
                        ORDER BY full_name""",
                     (UserRole.CAREGIVER.value, UserStatus.ACTIVE.value),
                 )
@@ -1396,14 +1569,7 @@ async def get_current_caregiver_for_senior_citizen(request, senior_citizen_id):
         with get_db_connection() as conn:
             with conn.cursor() as cur:
                 # Verify that the family member is linked to this senior citizen
-                cur.execute(
-                    """SELECT id FROM relations
-                       WHERE family_member_id = %s AND senior_citizen_id = %s""",
-                    (user.id, senior_citizen_id),
-                )
-                relation = cur.fetchone()
-
-                if not relation:
+                if not relation_cache.is_linked(cur, user.id, senior_citizen_id):
                     return format_response(
                         status_code=403,
                         message="Access denied. You can only view current caregiver for senior citizens you are linked to.",
@@ -1413,7 +1579,7 @@ async def get_current_caregiver_for_senior_citizen(request, senior_citizen_id):
                 cur.execute(
                     """SELECT cg.id, cg.full_name, cg.gmail_id, cg.description, cg.tags
                        FROM care_requests cr
-                       JOIN users cg ON cr.caregiver_id = cg.id
+                       JOIN users cg ON cr.caregiver_id = cg.id AND cg.deleted_at IS NULL
                        WHERE cr.senior_citizen_id = %s AND cr.status = %s""",
                     (senior_citizen_id, CareRequestStatus.ACCEPTED.value),
                 )
@@ -1472,14 +1638,7 @@ async def get_caregiver_requests_for_senior_citizen(request, senior_citizen_id):
         with get_db_connection() as conn:
             with conn.cursor() as cur:
                 # Verify that the family member is linked to this senior citizen
-                cur.execute(
-                    """SELECT id FROM relations
-                       WHERE family_member_id = %s AND senior_citizen_id = %s""",
-                    (user.id, senior_citizen_id),
-                )
-                relation = cur.fetchone()
-
-                if not relation:
+                if not relation_cache.is_linked(cur, user.id, senior_citizen_id):
                     return format_response(
                         status_code=403,
                         message="Access denied. You can only view caregiver requests for senior citizens you are linked to.",
@@ -1490,7 +1649,7 @@ async def get_caregiver_requests_for_senior_citizen(request, senior_citizen_id):
                     """SELECT cr.id, cr.caregiver_id, cg.full_name as caregiver_name,
                               cr.status, cr.timing_to_visit, cr.location, cr.created_at, cr.updated_at
                        FROM care_requests cr
-                       JOIN users cg ON cr.caregiver_id = cg.id
+                       JOIN users cg ON cr.caregiver_id = cg.id AND cg.deleted_at IS NULL
                        WHERE cr.senior_citizen_id = %s
                        ORDER BY cr.created_at DESC""",
                     (senior_citizen_id,),
@@ -1555,50 +1714,29 @@ async def request_caregiver_for_senior_citizen(
         with get_db_connection() as conn:
             with conn.cursor() as cur:
                 # Verify that the family member is linked to this senior citizen
-                cur.execute(
-                    """SELECT id FROM relations
-                       WHERE family_member_id = %s AND senior_citizen_id = %s""",
-                    (user.id, senior_citizen_id),
-                )
-                relation = cur.fetchone()
-
-                if not relation:
+                if not relation_cache.is_linked(cur, user.id, senior_citizen_id):
                     return format_response(
                         status_code=403,
                         message="Access denied. You can only request caregivers for senior citizens you are linked to.",
                     )
 
                 # Check if caregiver exists and is active
-                cur.execute(
-                    "SELECT id FROM users WHERE id = %s AND role = %s AND status = %s",
-                    (caregiver_id, UserRole.CAREGIVER, UserStatus.ACTIVE),
-                )
-                if not cur.fetchone():
+                if not _is_active_caregiver(user_cache.get(caregiver_id, cur)):
                     return format_response(
                         status_code=404, message="Caregiver not found or not available."
                     )
 
-                # Check for duplicate care request
-                is_duplicate, error_message = check_duplicate_care_request(
-                    cur, senior_citizen_id, caregiver_id, user.id
-                )
-                if not is_duplicate:
-                    return format_response(status_code=400, message=error_message)
-
                 # Create care request for the specific senior citizen
-                cur.execute(
-                    """INSERT INTO care_requests (senior_citizen_id, made_by, caregiver_id, status, timing_to_visit, location, created_at)
-                       VALUES (%s, %s, %s, %s, %s, %s, NOW()) RETURNING id""",
-                    (
-                        senior_citizen_id,  # Specific senior citizen
-                        user.id,  # Family member making the request
-                        caregiver_id,  # Requested caregiver
-                        CareRequestStatus.PENDING.value,
-                        None,  # No specific timing for direct caregiver requests
-                        "Home",  # Default location
-                    ),
+                request_id, error_message = insert_care_request(
+                    cur,
+                    senior_citizen_id,  # Specific senior citizen
+                    caregiver_id,  # Requested caregiver
+                    user.id,  # Family member making the request
+                    None,  # No specific timing for direct caregiver requests
+                    "Home",  # Default location
                 )
-                request_id = cur.fetchone()[0]
+                if error_message:
+                    return format_response(status_code=400, message=error_message)
 
         return format_response(
             status_code=201,
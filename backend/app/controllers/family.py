@@ -1,6 +1,8 @@
 from app.database.db import get_db_connection
 from app.logger import logger
 from app.modules.auth.auth_service import auth_service
+from app.modules.cache.invalidation_bus import invalidation_bus
+from app.modules.cache.relation_cache import relation_cache
 from app.payloads import UserRole
 from app.utils.response_formatter import format_response
 
@@ -28,7 +30,7 @@ async def get_family_members(request):
                     """SELECT u.id, u.full_name, u.gmail_id, u.firebase_uid, r.family_member_relation
                        FROM relations r
                        JOIN users u ON r.family_member_id = u.id
-                       WHERE r.senior_citizen_id = %s""",
+                       WHERE r.senior_citizen_id = %s AND u.deleted_at IS NULL""",
                     (user.id,),
                 )
                 family_members_data = cur.fetchall()
@@ -85,7 +87,7 @@ async def add_family_member(request, validated_data):
             with conn.cursor() as cur:
                 # Get family member's user ID
                 cur.execute(
-                    "SELECT id FROM users WHERE gmail_id = %s",
+                    "SELECT id FROM users WHERE gmail_id = %s AND deleted_at IS NULL",
                     (family_member_firebase_uid,),
                 )
                 family_member_data = cur.fetchone()
@@ -96,11 +98,9 @@ async def add_family_member(request, validated_data):
                 family_member_id = family_member_data[0]
 
                 # Check if relation already exists
-                cur.execute(
-                    "SELECT id FROM relations WHERE senior_citizen_id = %s AND family_member_id = %s",
-                    (senior_citizen_user.id, family_member_id),
-                )
-                if cur.fetchone():
+                if relation_cache.is_linked(
+                    cur, family_member_id, senior_citizen_user.id
+                ):
                     return format_response(
                         status_code=409, message="Relation already exists."
                     )
@@ -117,6 +117,11 @@ async def add_family_member(request, validated_data):
                     ),
                 )
                 relation_id = cur.fetchone()[0]
+                invalidation_bus.publish(
+                    cur, "relations", senior_citizen_user.id, family_member_id
+                )
+
+        relation_cache.invalidate(senior_citizen_user.id, family_member_id)
 
         return format_response(
             status_code=201,
@@ -157,7 +162,7 @@ async def remove_family_member(request, memberId, validated_data):
             with conn.cursor() as cur:
                 # Get family member's user ID
                 cur.execute(
-                    "SELECT id FROM users WHERE firebase_uid = %s",
+                    "SELECT id FROM users WHERE firebase_uid = %s AND deleted_at IS NULL",
                     (family_member_firebase_uid,),
                 )
                 family_member_data = cur.fetchone()
@@ -176,6 +181,11 @@ async def remove_family_member(request, memberId, validated_data):
                     return format_response(
                         status_code=404, message="Relation not found."
                     )
+                invalidation_bus.publish(
+                    cur, "relations", senior_citizen_user.id, family_member_id
+                )
+
+        relation_cache.invalidate(senior_citizen_user.id, family_member_id)
 
         return format_response(
             status_code=200, message="Family member removed successfully."
@@ -214,7 +224,7 @@ async def get_linked_senior_citizens(request):
                     """SELECT u.id, u.full_name, u.gmail_id, r.family_member_relation, u.status
                        FROM relations r
                        JOIN users u ON r.senior_citizen_id = u.id
-                       WHERE r.family_member_id = %s""",
+                       WHERE r.family_member_id = %s AND u.deleted_at IS NULL""",
                     (family_member_user.id,),
                 )
                 senior_citizens_data = cur.fetchall()
@@ -270,7 +280,7 @@ async def link_senior_citizen(request, validated_data):
             with conn.cursor() as cur:
                 # Get senior citizen's user ID by email
                 cur.execute(
-                    "SELECT id FROM users WHERE gmail_id = %s AND role = %s",
+                    "SELECT id FROM users WHERE gmail_id = %s AND role = %s AND deleted_at IS NULL",
                     (senior_citizen_email, UserRole.SENIOR_CITIZEN),
                 )
                 senior_citizen_data = cur.fetchone()
@@ -281,11 +291,9 @@ async def link_senior_citizen(request, validated_data):
                 senior_citizen_id = senior_citizen_data[0]
 
                 # Check if relation already exists
-                cur.execute(
-                    "SELECT id FROM relations WHERE family_member_id = %s AND senior_citizen_id = %s",
-                    (family_member_user.id, senior_citizen_id),
-                )
-                if cur.fetchone():
+                if relation_cache.is_linked(
+                    cur, family_member_user.id, senior_citizen_id
+                ):
                     return format_response(
                         status_code=409, message="Relation already exists."
                     )
@@ -302,6 +310,11 @@ async def link_senior_citizen(request, validated_data):
                     ),
                 )
                 relation_id = cur.fetchone()[0]
+                invalidation_bus.publish(
+                    cur, "relations", family_member_user.id, senior_citizen_id
+                )
+
+        relation_cache.invalidate(family_member_user.id, senior_citizen_id)
 
         return format_response(
             status_code=201,
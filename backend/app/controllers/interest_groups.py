@@ -1,8 +1,27 @@
-from app.database.db import get_db_connection
+from app.database.db import get_db_connection, get_read_connection
 from app.logger import logger
 from app.modules.auth.auth_service import auth_service
+from app.modules.cache.invalidation_bus import invalidation_bus
+from app.modules.cache.response_cache import CachedResponse, response_cache
 from app.payloads import UserRole
-from app.utils.response_formatter import format_response
+from app.utils.http_cache import (
+    get_table_versions,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    set_cache_headers,
+)
+from app.utils.response_formatter import format_response, serialize_response
+
+PUBLIC_GROUPS_CACHE_KEY = "public_interest_groups"
+PUBLIC_GROUPS_CACHE_CONTROL = "public, max-age=60"
+GROUP_CACHE_CONTROL = "private, max-age=60"
+MY_GROUPS_CACHE_CONTROL = "private, no-cache"
+
+# Group writes in other workers evict this worker's cached public listing
+invalidation_bus.subscribe(
+    "interest_groups", lambda *ids: response_cache.invalidate(PUBLIC_GROUPS_CACHE_KEY)
+)
 
 
 async def get_interest_groups(request):
@@ -24,19 +43,22 @@ async def get_interest_groups(request):
                 # If user is admin, show all groups; if IGA, show only their groups
                 if user.role == UserRole.ADMIN:
                     cur.execute(
-                        """SELECT id, title, description, whatsapp_link, category, status, timing, created_by, created_at, updated_at, member_count
+                        """SELECT id, title, description, whatsapp_link, category, status, timing, created_by, created_at, updated_at,
+                              current_member_count(id, member_count)
                            FROM interest_groups ORDER BY created_at DESC"""
                     )
                 elif user.role == UserRole.INTEREST_GROUP_ADMIN:
                     cur.execute(
-                        """SELECT id, title, description, whatsapp_link, category, status, timing, created_by, created_at, updated_at, member_count
+                        """SELECT id, title, description, whatsapp_link, category, status, timing, created_by, created_at, updated_at,
+                              current_member_count(id, member_count)
                            FROM interest_groups WHERE created_by = %s ORDER BY created_at DESC""",
                         (user.id,),
                     )
                 else:
                     # Public view - only active groups
                     cur.execute(
-                        """SELECT id, title, description, whatsapp_link, category, status, timing, created_by, created_at, updated_at, member_count
+                        """SELECT id, title, description, whatsapp_link, category, status, timing, created_by, created_at, updated_at,
+                              current_member_count(id, member_count)
                            FROM interest_groups WHERE status = 'active' ORDER BY created_at DESC"""
                     )
 
@@ -114,7 +136,7 @@ async def create_interest_group(request, validated_data):
                 print(user.id)
                 cur.execute(
                     """INSERT INTO interest_groups (title, description, whatsapp_link, category, timing, created_by, member_count)
-                       VALUES (%s, %s, %s, %s, %s, %s, 1) RETURNING id""",
+                       VALUES (%s, %s, %s, %s, %s, %s, 0) RETURNING id""",
                     (
                         title,
                         description,
@@ -131,6 +153,9 @@ async def create_interest_group(request, validated_data):
                     """INSERT INTO group_members (group_id, user_id) VALUES (%s, %s)""",
                     (group_id, user.id),
                 )
+                invalidation_bus.publish(cur, "interest_groups")
+
+        response_cache.invalidate(PUBLIC_GROUPS_CACHE_KEY)
 
         return format_response(
             status_code=201,
@@ -166,8 +191,17 @@ async def get_interest_group(request, groupId):
 
         with get_db_connection() as conn:
             with conn.cursor() as cur:
+                etag = make_etag(
+                    "interest_group",
+                    groupId,
+                    get_table_versions(cur, ["interest_groups", "group_members"]),
+                )
+                if is_not_modified(request, etag):
+                    return not_modified_response(etag, GROUP_CACHE_CONTROL)
+
                 cur.execute(
-                    """SELECT id, title, description, whatsapp_link, category, status, timing, created_by, created_at, updated_at, member_count
+                    """SELECT id, title, description, whatsapp_link, category, status, timing, created_by, created_at, updated_at,
+                              current_member_count(id, member_count)
                        FROM interest_groups
                        WHERE id = %s""",
                     (groupId,),
@@ -193,11 +227,12 @@ async def get_interest_group(request, groupId):
                     "member_count": interest_group_data[10],
                 }
 
-        return format_response(
+        response = format_response(
             status_code=200,
             message="Interest group retrieved successfully.",
             data={"interest_group": interest_group},
         )
+        return set_cache_headers(response, etag, GROUP_CACHE_CONTROL)
 
     except ValueError as e:
         logger.error(f"Authentication failed: {e}")
@@ -302,6 +337,9 @@ async def update_interest_group(request, groupId, validated_data):
                         status_code=404,
                         message="Interest group not found or no changes made.",
                     )
+                invalidation_bus.publish(cur, "interest_groups")
+
+        response_cache.invalidate(PUBLIC_GROUPS_CACHE_KEY)
 
         return format_response(
             status_code=200, message="Interest group updated successfully."
@@ -373,6 +411,9 @@ async def delete_interest_group(request, groupId):
                     return format_response(
                         status_code=404, message="Interest group not found."
                     )
+                invalidation_bus.publish(cur, "interest_groups")
+
+        response_cache.invalidate(PUBLIC_GROUPS_CACHE_KEY)
 
         return format_response(
             status_code=200,
@@ -393,41 +434,54 @@ async def get_public_interest_groups(request):
     """Public endpoint to get active interest groups for senior citizens to browse"""
     logger.info("Executing get_public_interest_groups controller logic.")
     try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """SELECT id, title, description, whatsapp_link, category, timing, created_at, member_count
-                       FROM interest_groups
-                       WHERE status = 'active'
-                       ORDER BY created_at DESC"""
-                )
-                interest_groups_data = cur.fetchall()
-
-                interest_groups = [
-                    {
-                        "id": ig[0],
-                        "title": ig[1],
-                        "description": ig[2],
-                        "whatsapp_link": ig[3],
-                        "category": ig[4],
-                        "timing": ig[5],
-                        "created_at": ig[6],
-                        "member_count": ig[7],
-                    }
-                    for ig in interest_groups_data
-                ]
-
-        return format_response(
-            status_code=200,
-            message="Public interest groups retrieved successfully.",
-            data={"interest_groups": interest_groups},
+        cached = await response_cache.get_or_load(
+            PUBLIC_GROUPS_CACHE_KEY, _load_public_interest_groups
         )
+        return cached.to_response(request, PUBLIC_GROUPS_CACHE_CONTROL)
 
     except Exception as e:
         logger.error(f"Error retrieving public interest groups: {e}")
         return format_response(status_code=500, message="Internal server error.")
 
 
+def _load_public_interest_groups():
+    """Query and render the public listing; runs in a worker thread on cache miss."""
+    with get_read_connection() as conn:
+        with conn.cursor() as cur:
+            etag = make_etag(
+                "public_interest_groups",
+                get_table_versions(cur, ["interest_groups", "group_members"]),
+            )
+            cur.execute(
+                """SELECT id, title, description, whatsapp_link, category, timing, created_at,
+                          current_member_count(id, member_count)
+                   FROM interest_groups
+                   WHERE status = 'active'
+                   ORDER BY created_at DESC"""
+            )
+            interest_groups_data = cur.fetchall()
+
+            interest_groups = [
+                {
+                    "id": ig[0],
+                    "title": ig[1],
+                    "description": ig[2],
+                    "whatsapp_link": ig[3],
+                    "category": ig[4],
+                    "timing": ig[5],
+                    "created_at": ig[6],
+                    "member_count": ig[7],
+                }
+                for ig in interest_groups_data
+            ]
+
+    body = serialize_response(
+        message="Public interest groups retrieved successfully.",
+        data={"interest_groups": interest_groups},
+    )
+    return CachedResponse(status_code=200, body=body, etag=etag)
+
+
 async def join_group(request, groupId):
     """Allow users to join an interest group"""
     logger.info(f"Executing join_group controller logic for group ID: {groupId}.")
@@ -445,10 +499,28 @@ async def join_group(request, groupId):
 
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                # Check if group exists and is active
+                # Membership insert is atomic; the member count is tracked by a
+                # sharded trigger counter, so the group row is only touched to
+                # bump updated_at when the membership actually changed
                 cur.execute(
-                    """SELECT id, title, status, member_count FROM interest_groups WHERE id = %s""",
-                    (groupId,),
+                    """WITH grp AS (
+                           SELECT id, title, status, current_member_count(id, member_count) AS members
+                           FROM interest_groups WHERE id = %(group_id)s
+                       ),
+                       joined AS (
+                           INSERT INTO group_members (group_id, user_id)
+                           SELECT id, %(user_id)s FROM grp WHERE status = 'active'
+                           ON CONFLICT (group_id, user_id) DO NOTHING
+                           RETURNING group_id
+                       ),
+                       touched AS (
+                           UPDATE interest_groups SET updated_at = CURRENT_TIMESTAMP
+                           WHERE id = %(group_id)s AND EXISTS (SELECT 1 FROM joined)
+                       )
+                       SELECT grp.title, grp.status,
+                              CASE WHEN EXISTS (SELECT 1 FROM joined) THEN grp.members + 1 END
+                       FROM grp""",
+                    {"group_id": groupId, "user_id": user.id},
                 )
                 group_data = cur.fetchone()
 
@@ -457,40 +529,24 @@ async def join_group(request, groupId):
                         status_code=404, message="Interest group not found."
                     )
 
-                if group_data[2] != "active":
+                if group_data[1] != "active":
                     return format_response(
                         status_code=400, message="Cannot join inactive interest group."
                     )
 
-                # Check if user is already a member
-                cur.execute(
-                    """SELECT id FROM group_members WHERE group_id = %s AND user_id = %s""",
-                    (groupId, user.id),
-                )
-                existing_member = cur.fetchone()
-
-                if existing_member:
+                if group_data[2] is None:
                     return format_response(
                         status_code=400,
                         message="You are already a member of this group.",
                     )
+                invalidation_bus.publish(cur, "interest_groups")
 
-                # Add user to group
-                cur.execute(
-                    """INSERT INTO group_members (group_id, user_id) VALUES (%s, %s)""",
-                    (groupId, user.id),
-                )
-
-                # Update member count
-                cur.execute(
-                    """UPDATE interest_groups SET member_count = member_count + 1, updated_at = CURRENT_TIMESTAMP WHERE id = %s""",
-                    (groupId,),
-                )
+        response_cache.invalidate(PUBLIC_GROUPS_CACHE_KEY)
 
         return format_response(
             status_code=200,
-            message=f"Successfully joined {group_data[1]} group.",
-            data={"group_id": groupId, "member_count": group_data[3] + 1},
+            message=f"Successfully joined {group_data[0]} group.",
+            data={"group_id": groupId, "member_count": group_data[2]},
         )
 
     except ValueError as e:
@@ -520,10 +576,27 @@ async def leave_group(request, groupId):
 
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                # Check if group exists
+                # Membership delete is atomic; the member count is tracked by a
+                # sharded trigger counter, so the group row is only touched to
+                # bump updated_at when the membership actually changed
                 cur.execute(
-                    """SELECT id, title, member_count FROM interest_groups WHERE id = %s""",
-                    (groupId,),
+                    """WITH grp AS (
+                           SELECT id, title, current_member_count(id, member_count) AS members
+                           FROM interest_groups WHERE id = %(group_id)s
+                       ),
+                       left_group AS (
+                           DELETE FROM group_members
+                           WHERE group_id IN (SELECT id FROM grp) AND user_id = %(user_id)s
+                           RETURNING group_id
+                       ),
+                       touched AS (
+                           UPDATE interest_groups SET updated_at = CURRENT_TIMESTAMP
+                           WHERE id = %(group_id)s AND EXISTS (SELECT 1 FROM left_group)
+                       )
+                       SELECT grp.title,
+                              CASE WHEN EXISTS (SELECT 1 FROM left_group) THEN grp.members - 1 END
+                       FROM grp""",
+                    {"group_id": groupId, "user_id": user.id},
                 )
                 group_data = cur.fetchone()
 
@@ -532,34 +605,18 @@ async def leave_group(request, groupId):
                         status_code=404, message="Interest group not found."
                     )
 
-                # Check if user is a member
-                cur.execute(
-                    """SELECT id FROM group_members WHERE group_id = %s AND user_id = %s""",
-                    (groupId, user.id),
-                )
-                existing_member = cur.fetchone()
-
-                if not existing_member:
+                if group_data[1] is None:
                     return format_response(
                         status_code=400, message="You are not a member of this group."
                     )
+                invalidation_bus.publish(cur, "interest_groups")
 
-                # Remove user from group
-                cur.execute(
-                    """DELETE FROM group_members WHERE group_id = %s AND user_id = %s""",
-                    (groupId, user.id),
-                )
-
-                # Update member count
-                cur.execute(
-                    """UPDATE interest_groups SET member_count = member_count - 1, updated_at = CURRENT_TIMESTAMP WHERE id = %s""",
-                    (groupId,),
-                )
+        response_cache.invalidate(PUBLIC_GROUPS_CACHE_KEY)
 
         return format_response(
             status_code=200,
-            message=f"Successfully left {group_data[1]} group.",
-            data={"group_id": groupId, "member_count": group_data[2] - 1},
+            message=f"Successfully left {group_data[0]} group.",
+            data={"group_id": groupId, "member_count": group_data[1]},
         )
 
     except ValueError as e:
@@ -589,10 +646,18 @@ async def get_my_groups(request):
 
         with get_db_connection() as conn:
             with conn.cursor() as cur:
+                etag = make_etag(
+                    "my_groups",
+                    user.id,
+                    get_table_versions(cur, ["interest_groups", "group_members"]),
+                )
+                if is_not_modified(request, etag):
+                    return not_modified_response(etag, MY_GROUPS_CACHE_CONTROL)
+
                 cur.execute(
                     """SELECT ig.id, ig.title, ig.description, ig.whatsapp_link, ig.category,
                               ig.status, ig.timing, ig.created_by, ig.created_at, ig.updated_at,
-                              ig.member_count, gm.joined_at
+                              current_member_count(ig.id, ig.member_count), gm.joined_at
                        FROM interest_groups ig
                        INNER JOIN group_members gm ON ig.id = gm.group_id
                        WHERE gm.user_id = %s
@@ -619,11 +684,12 @@ async def get_my_groups(request):
                     for group in groups_data
                 ]
 
-        return format_response(
+        response = format_response(
             status_code=200,
             message="Your groups retrieved successfully.",
             data={"groups": groups},
         )
+        return set_cache_headers(response, etag, MY_GROUPS_CACHE_CONTROL)
 
     except ValueError as e:
         logger.error(f"Authentication failed: {e}")
@@ -685,7 +751,7 @@ async def get_group_members(request, groupId):
                     """SELECT u.id, u.full_name, u.role, u.status, gm.joined_at
                        FROM group_members gm
                        INNER JOIN users u ON gm.user_id = u.id
-                       WHERE gm.group_id = %s
+                       WHERE gm.group_id = %s AND u.deleted_at IS NULL
                        ORDER BY gm.joined_at ASC""",
                     (groupId,),
                 )
@@ -743,7 +809,8 @@ async def get_my_created_groups(request):
             with conn.cursor() as cur:
                 cur.execute(
                     """SELECT id, title, description, whatsapp_link, category, status, timing,
-                              created_by, created_at, updated_at, member_count
+                              created_by, created_at, updated_at,
+                              current_member_count(id, member_count)
                        FROM interest_groups
                        WHERE created_by = %s
                        ORDER BY created_at DESC""",
@@ -1,13 +1,51 @@
 import json
+from datetime import datetime
 
 from app.database.db import get_db_connection
 from app.logger import logger
 from app.modules.auth.auth_service import auth_service
+from app.modules.cache.invalidation_bus import invalidation_bus
+from app.modules.cache.relation_cache import relation_cache
+from app.modules.cache.user_cache import user_cache
+from app.modules.tasks.recurrence import (
+    RecurrenceRule,
+    fetch_task_window,
+    fetch_upcoming_occurrences,
+    parse_window,
+)
+from app.modules.tasks.task_feed import (
+    LIVE_CREATOR,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    fetch_task_feed,
+)
 from app.modules.youtube.youtube_processor import youtube_processor
 from app.payloads import TaskStatus, UserRole
 from app.utils.response_formatter import format_response
 
 
+def _task_row(task):
+    return {
+        "id": task[0],
+        "title": task[1],
+        "description": task[2],
+        "time_of_completion": task[3],
+        "status": task[4],
+        "created_by": task[5],
+        "assigned_to": task[6],
+        "created_at": task[7],
+        "updated_at": task[8],
+        "priority": task[9],
+        "category": task[10],
+        "estimated_duration": task[11],
+        "ai_generated": task[9] is not None
+        and task[10] is not None,  # Determine if AI generated
+        # Set for occurrences of a recurring task; those not yet completed
+        # have no id
+        "recurrence_id": task[12],
+    }
+
+
 async def get_tasks(request):
     logger.info("Executing get_tasks controller logic.")
     try:
@@ -22,170 +60,87 @@ async def get_tasks(request):
         if not is_registered:
             return format_response(status_code=401, message="User not registered.")
 
-        # Get query parameters for filtering
-        priority_filter = request.query_params.get("priority")
-        category_filter = request.query_params.get("category")
-        status_filter = request.query_params.get("status")
-        ai_generated_filter = request.query_params.get(
-            "ai_generated"
-        )  # true/false string
-        estimated_duration_min = request.query_params.get("estimated_duration_min")
-        estimated_duration_max = request.query_params.get("estimated_duration_max")
-
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                # Build dynamic query with filters
-                base_query = """SELECT id, title, description, time_of_completion, status,
-                                      created_by, assigned_to, created_at, updated_at,
-                                      priority, category, estimated_duration
-                               FROM tasks
-                               WHERE (created_by = %s OR assigned_to = %s)"""
-
-                query_params = [user.id, user.id]
-
-                # Add filters
-                if priority_filter:
-                    base_query += " AND priority = %s"
-                    query_params.append(priority_filter)
-
-                if category_filter:
-                    base_query += " AND category = %s"
-                    query_params.append(category_filter)
-
-                if status_filter:
-                    base_query += " AND status = %s"
-                    query_params.append(status_filter)
-
-                if ai_generated_filter is not None:
-                    if ai_generated_filter.lower() == "true":
-                        base_query += (
-                            " AND priority IS NOT NULL AND category IS NOT NULL"
-                        )
-                    elif ai_generated_filter.lower() == "false":
-                        base_query += " AND (priority IS NULL OR category IS NULL)"
-
-                if estimated_duration_min:
-                    try:
-                        base_query += " AND estimated_duration >= %s"
-                        query_params.append(int(estimated_duration_min))
-                    except ValueError:
-                        pass  # Ignore invalid duration filter
+        # Optional keyset paging; without a limit the full feed is returned
+        limit = request.query_params.get("limit")
+        cursor = request.query_params.get("cursor")
+        try:
+            if limit is not None:
+                limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+            if cursor:
+                decode_cursor(cursor)
+        except ValueError:
+            return format_response(
+                status_code=400, message="Invalid limit or cursor parameter."
+            )
 
-                if estimated_duration_max:
-                    try:
-                        base_query += " AND estimated_duration <= %s"
-                        query_params.append(int(estimated_duration_max))
-                    except ValueError:
-                        pass  # Ignore invalid duration filter
+        # Recurring occurrences are only listed on request: within a from/to
+        # range, or for the next days alongside the first page of the feed
+        include_occurrences = (
+            request.query_params.get("include_occurrences", "").lower() == "true"
+            and not cursor
+        )
 
-                # Add ordering
-                base_query += " ORDER BY created_at DESC"
+        # A from/to range returns every task due in it, recurring ones included,
+        # ordered by time_of_completion instead of paged
+        try:
+            window = parse_window(request.query_params)
+        except ValueError:
+            return format_response(
+                status_code=400,
+                message="Invalid date range. Pass ISO 'from' and 'to' at most a year apart.",
+            )
 
-                cur.execute(base_query, tuple(query_params))
-                own_tasks = cur.fetchall()
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                feed_user_id = user.id
 
                 # If user is a family member and senior_citizen_id is provided, get tasks for that specific senior citizen
-                linked_senior_tasks = []
                 senior_citizen_id = None
                 if user.role == UserRole.FAMILY_MEMBER:
-                    # Check if senior_citizen_id query parameter is provided
                     senior_citizen_id = request.query_params.get("senior_citizen_id")
                     if senior_citizen_id:
                         try:
                             senior_citizen_id = int(senior_citizen_id)
-                            # Verify the family member has a relationship with this senior citizen
-                            cur.execute(
-                                "SELECT 1 FROM relations WHERE family_member_id = %s AND senior_citizen_id = %s",
-                                (user.id, senior_citizen_id),
-                            )
-                            if cur.fetchone():
-                                # Build query for senior citizen tasks with same filters
-                                senior_query = """SELECT t.id, t.title, t.description, t.time_of_completion, t.status,
-                                                      t.created_by, t.assigned_to, t.created_at, t.updated_at,
-                                                      t.priority, t.category, t.estimated_duration
-                                               FROM tasks t
-                                               WHERE (t.created_by = %s OR t.assigned_to = %s)"""
-
-                                senior_params = [senior_citizen_id, senior_citizen_id]
-
-                                # Add same filters for senior citizen tasks
-                                if priority_filter:
-                                    senior_query += " AND t.priority = %s"
-                                    senior_params.append(priority_filter)
-
-                                if category_filter:
-                                    senior_query += " AND t.category = %s"
-                                    senior_params.append(category_filter)
-
-                                if status_filter:
-                                    senior_query += " AND t.status = %s"
-                                    senior_params.append(status_filter)
-
-                                if ai_generated_filter is not None:
-                                    if ai_generated_filter.lower() == "true":
-                                        senior_query += " AND t.priority IS NOT NULL AND t.category IS NOT NULL"
-                                    elif ai_generated_filter.lower() == "false":
-                                        senior_query += " AND (t.priority IS NULL OR t.category IS NULL)"
-
-                                if estimated_duration_min:
-                                    try:
-                                        senior_query += (
-                                            " AND t.estimated_duration >= %s"
-                                        )
-                                        senior_params.append(
-                                            int(estimated_duration_min)
-                                        )
-                                    except ValueError:
-                                        pass
-
-                                if estimated_duration_max:
-                                    try:
-                                        senior_query += (
-                                            " AND t.estimated_duration <= %s"
-                                        )
-                                        senior_params.append(
-                                            int(estimated_duration_max)
-                                        )
-                                    except ValueError:
-                                        pass
-
-                                senior_query += " ORDER BY t.created_at DESC"
-
-                                cur.execute(senior_query, tuple(senior_params))
-                                linked_senior_tasks = cur.fetchall()
                         except ValueError:
                             # Invalid senior_citizen_id parameter, ignore it
                             senior_citizen_id = None
 
-                # Combine and format all tasks
-                all_tasks = own_tasks
                 if senior_citizen_id:
-                    all_tasks = linked_senior_tasks
-
-                tasks = [
-                    {
-                        "id": task[0],
-                        "title": task[1],
-                        "description": task[2],
-                        "time_of_completion": task[3],
-                        "status": task[4],
-                        "created_by": task[5],
-                        "assigned_to": task[6],
-                        "created_at": task[7],
-                        "updated_at": task[8],
-                        "priority": task[9],
-                        "category": task[10],
-                        "estimated_duration": task[11],
-                        "ai_generated": task[9] is not None
-                        and task[10] is not None,  # Determine if AI generated
-                    }
-                    for task in all_tasks
-                ]
+                    # Verify the family member has a relationship with this senior citizen
+                    feed_user_id = (
+                        senior_citizen_id
+                        if relation_cache.is_linked(cur, user.id, senior_citizen_id)
+                        else None
+                    )
+
+                all_tasks, next_cursor, occurrences = [], None, []
+                if feed_user_id is not None and window is not None:
+                    all_tasks = fetch_task_window(
+                        cur, feed_user_id, request.query_params, *window
+                    )
+                elif feed_user_id is not None:
+                    all_tasks, next_cursor = fetch_task_feed(
+                        cur, feed_user_id, request.query_params, limit, cursor
+                    )
+                    if include_occurrences:
+                        # Kept apart from the paged feed: occurrences have no
+                        # id and no created_at to page by
+                        occurrences = fetch_upcoming_occurrences(
+                            cur, feed_user_id, request.query_params
+                        )
+
+                tasks = [_task_row(task) for task in all_tasks]
+
+        data = {"tasks": tasks}
+        if limit is not None and window is None:
+            data["next_cursor"] = next_cursor
+        if include_occurrences and window is None:
+            data["occurrences"] = [_task_row(task) for task in occurrences]
 
         return format_response(
             status_code=200,
             message="Tasks retrieved successfully.",
-            data={"tasks": tasks},
+            data=data,
         )
 
     except ValueError as e:
@@ -372,51 +327,95 @@ async def create_task(request, validated_data):
         if assigned_to_firebase_uid:
             with get_db_connection() as conn:
                 with conn.cursor() as cur:
-                    cur.execute(
-                        "SELECT id FROM users WHERE firebase_uid = %s",
-                        (assigned_to_firebase_uid,),
+                    assigned_to = user_cache.get_by_firebase_uid(
+                        assigned_to_firebase_uid, cur
                     )
-                    assigned_to_data = cur.fetchone()
-                    if not assigned_to_data:
+                    if not assigned_to:
                         return format_response(
                             status_code=404, message="Assigned user not found."
                         )
-                    assigned_to_id = assigned_to_data[0]
+                    assigned_to_id = assigned_to.id
 
                     # If user is a family member, verify they can assign tasks to the senior citizen
                     if user.role == UserRole.FAMILY_MEMBER and assigned_to_id:
-                        cur.execute(
-                            """SELECT 1 FROM relations
-                               WHERE family_member_id = %s AND senior_citizen_id = %s""",
-                            (user.id, assigned_to_id),
-                        )
-                        if not cur.fetchone():
+                        if not relation_cache.is_linked(cur, user.id, assigned_to_id):
                             return format_response(
                                 status_code=403,
                                 message="You can only assign tasks to senior citizens linked to you.",
                             )
 
+        recurrence = validated_data.recurrence
+        if recurrence is not None and not time_of_completion:
+            return format_response(
+                status_code=400,
+                message="Recurring tasks need a time_of_completion for their first occurrence.",
+            )
+        if recurrence is not None and recurrence.until is not None:
+            try:
+                starts_at = (
+                    time_of_completion
+                    if isinstance(time_of_completion, datetime)
+                    else datetime.fromisoformat(time_of_completion)
+                )
+            except ValueError:
+                return format_response(
+                    status_code=400, message="Invalid time_of_completion."
+                )
+            # Task times are stored without a time zone
+            if recurrence.until.replace(tzinfo=None) <= starts_at.replace(tzinfo=None):
+                return format_response(
+                    status_code=400,
+                    message="A recurring task must end after its first occurrence.",
+                )
+
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                # Insert task with additional metadata
-                cur.execute(
-                    """INSERT INTO tasks (title, description, time_of_completion, created_by, assigned_to, priority, category, estimated_duration)
-                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s) RETURNING id""",
-                    (
-                        title,
-                        description,
-                        time_of_completion,
-                        user.id,
-                        assigned_to_id,
-                        priority,
-                        category,
-                        estimated_duration,
-                    ),
-                )
-                task_id = cur.fetchone()[0]
+                if recurrence is not None:
+                    # Stored once as a rule; occurrences are expanded on read
+                    cur.execute(
+                        """INSERT INTO task_recurrences (title, description, frequency, repeat_interval, by_weekday, starts_at, until,
+                                                         created_by, assigned_to, priority, category, estimated_duration)
+                           VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id""",
+                        (
+                            title,
+                            description,
+                            recurrence.frequency.value,
+                            recurrence.interval,
+                            recurrence.by_weekday,
+                            time_of_completion,
+                            recurrence.until,
+                            user.id,
+                            assigned_to_id,
+                            priority,
+                            category,
+                            estimated_duration,
+                        ),
+                    )
+                    recurrence_id = cur.fetchone()[0]
+                    # Lets the deadline scheduler expand the new rule
+                    invalidation_bus.publish(cur, "task_recurrences", recurrence_id)
+                    response_data = {"recurrence_id": recurrence_id}
+                else:
+                    cur.execute(
+                        """INSERT INTO tasks (title, description, time_of_completion, created_by, assigned_to, priority, category, estimated_duration)
+                           VALUES (%s, %s, %s, %s, %s, %s, %s, %s) RETURNING id""",
+                        (
+                            title,
+                            description,
+                            time_of_completion,
+                            user.id,
+                            assigned_to_id,
+                            priority,
+                            category,
+                            estimated_duration,
+                        ),
+                    )
+                    task_id = cur.fetchone()[0]
+                    # Lets the deadline scheduler pick the new deadline up
+                    invalidation_bus.publish(cur, "tasks", task_id)
+                    response_data = {"task_id": task_id}
 
         # Prepare response data
-        response_data = {"task_id": task_id}
         if ai_mode:
             response_data.update(
                 {
@@ -460,10 +459,10 @@ async def get_task(request, taskId):
         with get_db_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
-                    """SELECT id, title, description, time_of_completion, status, created_by, assigned_to, created_at, updated_at,
+                    f"""SELECT id, title, description, time_of_completion, status, created_by, assigned_to, created_at, updated_at,
                               priority, category, estimated_duration
                        FROM tasks
-                       WHERE id = %s""",
+                       WHERE id = %s AND {LIVE_CREATOR}""",
                     (taskId,),
                 )
                 task_data = cur.fetchone()
@@ -484,12 +483,9 @@ async def get_task(request, taskId):
                         created_by_id if created_by_id else assigned_to_id
                     )
                     if senior_citizen_id:
-                        cur.execute(
-                            """SELECT 1 FROM relations
-                               WHERE family_member_id = %s AND senior_citizen_id = %s""",
-                            (user.id, senior_citizen_id),
+                        has_access = relation_cache.is_linked(
+                            cur, user.id, senior_citizen_id
                         )
-                        has_access = cur.fetchone() is not None
 
                 if not has_access:
                     return format_response(
@@ -567,12 +563,9 @@ async def update_task(request, taskId, validated_data):
                         created_by_id if created_by_id else assigned_to_id
                     )
                     if senior_citizen_id:
-                        cur.execute(
-                            """SELECT 1 FROM relations
-                               WHERE family_member_id = %s AND senior_citizen_id = %s""",
-                            (user.id, senior_citizen_id),
+                        has_access = relation_cache.is_linked(
+                            cur, user.id, senior_citizen_id
                         )
-                        has_access = cur.fetchone() is not None
 
                 if not has_access:
                     return format_response(
@@ -590,37 +583,36 @@ async def update_task(request, taskId, validated_data):
                     update_fields.append("description = %s")
                     update_values.append(validated_data.description)
                 if validated_data.time_of_completion is not None:
-                    update_fields.append("time_of_completion = %s")
+                    # A moved deadline gets a fresh reminder and overdue notice
+                    update_fields.append(
+                        "time_of_completion = %s, reminder_sent_at = NULL, "
+                        "overdue_notified_at = NULL"
+                    )
                     update_values.append(validated_data.time_of_completion)
                 if validated_data.status is not None:
                     update_fields.append("status = %s")
                     update_values.append(validated_data.status.value)
                 if validated_data.assigned_to_firebase_uid is not None:
-                    cur.execute(
-                        "SELECT id FROM users WHERE firebase_uid = %s",
-                        (validated_data.assigned_to_firebase_uid,),
+                    new_assigned_to = user_cache.get_by_firebase_uid(
+                        validated_data.assigned_to_firebase_uid, cur
                     )
-                    new_assigned_to_data = cur.fetchone()
-                    if not new_assigned_to_data:
+                    if not new_assigned_to:
                         return format_response(
                             status_code=404, message="New assigned user not found."
                         )
 
                     # If user is a family member, verify they can assign tasks to the senior citizen
                     if user.role == UserRole.FAMILY_MEMBER:
-                        cur.execute(
-                            """SELECT 1 FROM relations
-                               WHERE family_member_id = %s AND senior_citizen_id = %s""",
-                            (user.id, new_assigned_to_data[0]),
-                        )
-                        if not cur.fetchone():
+                        if not relation_cache.is_linked(
+                            cur, user.id, new_assigned_to.id
+                        ):
                             return format_response(
                                 status_code=403,
                                 message="You can only assign tasks to senior citizens linked to you.",
                             )
 
                     update_fields.append("assigned_to = %s")
-                    update_values.append(new_assigned_to_data[0])
+                    update_values.append(new_assigned_to.id)
 
                 if not update_fields:
                     return format_response(
@@ -635,6 +627,7 @@ async def update_task(request, taskId, validated_data):
                     return format_response(
                         status_code=404, message="Task not found or no changes made."
                     )
+                invalidation_bus.publish(cur, "tasks", taskId)
 
         return format_response(status_code=200, message="Task updated successfully.")
 
@@ -687,12 +680,9 @@ async def mark_task_done(request, taskId, validated_data):
                         created_by_id if created_by_id else assigned_to_id
                     )
                     if senior_citizen_id:
-                        cur.execute(
-                            """SELECT 1 FROM relations
-                               WHERE family_member_id = %s AND senior_citizen_id = %s""",
-                            (user.id, senior_citizen_id),
+                        has_access = relation_cache.is_linked(
+                            cur, user.id, senior_citizen_id
                         )
-                        has_access = cur.fetchone() is not None
 
                 if not has_access:
                     return format_response(
@@ -713,6 +703,7 @@ async def mark_task_done(request, taskId, validated_data):
                     return format_response(
                         status_code=404, message="Task not found or no changes made."
                     )
+                invalidation_bus.publish(cur, "tasks", taskId)
 
         return format_response(
             status_code=200, message="Task marked as done successfully."
@@ -765,12 +756,9 @@ async def delete_task(request, taskId, validated_data):
                         created_by_id if created_by_id else assigned_to_id
                     )
                     if senior_citizen_id:
-                        cur.execute(
-                            """SELECT 1 FROM relations
-                               WHERE family_member_id = %s AND senior_citizen_id = %s""",
-                            (user.id, senior_citizen_id),
+                        has_access = relation_cache.is_linked(
+                            cur, user.id, senior_citizen_id
                         )
-                        has_access = cur.fetchone() is not None
 
                 if not has_access:
                     return format_response(
@@ -783,6 +771,7 @@ async def delete_task(request, taskId, validated_data):
                     return format_response(
                         status_code=404, message="Task not found or no changes made."
                     )
+                invalidation_bus.publish(cur, "tasks", taskId)
 
         return format_response(status_code=200, message="Task deleted successfully.")
 
@@ -794,3 +783,330 @@ async def delete_task(request, taskId, validated_data):
     except Exception as e:
         logger.error(f"Error deleting task: {e}")
         return format_response(status_code=500, message="Internal server error.")
+
+
+def _can_manage_recurrence(cur, user, created_by_id, assigned_to_id):
+    """Same access rule as for single tasks."""
+    if user.id == created_by_id or user.id == assigned_to_id:
+        return True
+    if user.role == UserRole.FAMILY_MEMBER:
+        senior_citizen_id = created_by_id if created_by_id else assigned_to_id
+        if senior_citizen_id:
+            return relation_cache.is_linked(cur, user.id, senior_citizen_id)
+    return False
+
+
+async def get_recurrence(request, recurrenceId):
+    logger.info(
+        f"Executing get_recurrence controller logic for recurrence ID: {recurrenceId}."
+    )
+    try:
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            return format_response(
+                status_code=401, message="Authorization header missing or invalid."
+            )
+        id_token = auth_header.split(" ")[1]
+
+        user, is_registered = auth_service.authenticate_user(id_token)
+        if not is_registered:
+            return format_response(status_code=401, message="User not registered.")
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"""SELECT id, title, description, frequency, repeat_interval, by_weekday, starts_at, until,
+                              created_by, assigned_to, created_at, updated_at, priority, category, estimated_duration
+                       FROM task_recurrences
+                       WHERE id = %s AND {LIVE_CREATOR}""",
+                    (recurrenceId,),
+                )
+                rule = cur.fetchone()
+                if not rule:
+                    return format_response(
+                        status_code=404, message="Recurring task not found."
+                    )
+
+                if not _can_manage_recurrence(cur, user, rule[8], rule[9]):
+                    return format_response(
+                        status_code=403,
+                        message="Access denied. You can only view tasks you created, are assigned to, or are linked to as a family member.",
+                    )
+
+                recurrence = {
+                    "id": rule[0],
+                    "title": rule[1],
+                    "description": rule[2],
+                    "frequency": rule[3],
+                    "interval": rule[4],
+                    "by_weekday": rule[5],
+                    "starts_at": rule[6],
+                    "until": rule[7],
+                    "created_by": rule[8],
+                    "assigned_to": rule[9],
+                    "created_at": rule[10],
+                    "updated_at": rule[11],
+                    "priority": rule[12],
+                    "category": rule[13],
+                    "estimated_duration": rule[14],
+                }
+
+        return format_response(
+            status_code=200,
+            message="Recurring task retrieved successfully.",
+            data={"recurrence": recurrence},
+        )
+
+    except ValueError as e:
+        logger.error(f"Authentication failed: {e}")
+        return format_response(
+            status_code=401, message="Authentication failed. Invalid token."
+        )
+    except Exception as e:
+        logger.error(f"Error retrieving recurring task: {e}")
+        return format_response(status_code=500, message="Internal server error.")
+
+
+async def update_recurrence(request, recurrenceId, validated_data):
+    logger.info(
+        f"Executing update_recurrence controller logic for recurrence ID: {recurrenceId}."
+    )
+    try:
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            return format_response(
+                status_code=401, message="Authorization header missing or invalid."
+            )
+        id_token = auth_header.split(" ")[1]
+
+        user, is_registered = auth_service.authenticate_user(id_token)
+        if not is_registered:
+            return format_response(status_code=401, message="User not registered.")
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"SELECT created_by, assigned_to, starts_at FROM task_recurrences WHERE id = %s AND {LIVE_CREATOR}",
+                    (recurrenceId,),
+                )
+                rule = cur.fetchone()
+                if not rule:
+                    return format_response(
+                        status_code=404, message="Recurring task not found."
+                    )
+
+                if not _can_manage_recurrence(cur, user, rule[0], rule[1]):
+                    return format_response(
+                        status_code=403,
+                        message="Access denied. You can only update tasks you created, are assigned to, or are linked to as a family member.",
+                    )
+
+                # The schedule itself is not editable: past occurrences and
+                # completed tasks would no longer line up with it
+                update_fields = []
+                update_values = []
+
+                if validated_data.title is not None:
+                    update_fields.append("title = %s")
+                    update_values.append(validated_data.title)
+                if validated_data.description is not None:
+                    update_fields.append("description = %s")
+                    update_values.append(validated_data.description)
+                if validated_data.until is not None:
+                    until = validated_data.until.replace(tzinfo=None)
+                    if until <= rule[2]:
+                        return format_response(
+                            status_code=400,
+                            message="A recurring task must end after its first occurrence.",
+                        )
+                    update_fields.append("until = %s")
+                    update_values.append(until)
+                if validated_data.assigned_to_firebase_uid is not None:
+                    new_assigned_to = user_cache.get_by_firebase_uid(
+                        validated_data.assigned_to_firebase_uid, cur
+                    )
+                    if not new_assigned_to:
+                        return format_response(
+                            status_code=404, message="New assigned user not found."
+                        )
+
+                    if user.role == UserRole.FAMILY_MEMBER:
+                        if not relation_cache.is_linked(
+                            cur, user.id, new_assigned_to.id
+                        ):
+                            return format_response(
+                                status_code=403,
+                                message="You can only assign tasks to senior citizens linked to you.",
+                            )
+
+                    update_fields.append("assigned_to = %s")
+                    update_values.append(new_assigned_to.id)
+
+                if not update_fields:
+                    return format_response(
+                        status_code=400, message="No fields to update."
+                    )
+
+                update_values.append(recurrenceId)
+                cur.execute(
+                    f"UPDATE task_recurrences SET {', '.join(update_fields)}, updated_at = CURRENT_TIMESTAMP WHERE id = %s",
+                    tuple(update_values),
+                )
+                if cur.rowcount == 0:
+                    return format_response(
+                        status_code=404, message="Recurring task not found."
+                    )
+                invalidation_bus.publish(cur, "task_recurrences", recurrenceId)
+
+        return format_response(
+            status_code=200, message="Recurring task updated successfully."
+        )
+
+    except ValueError as e:
+        logger.error(f"Authentication failed: {e}")
+        return format_response(
+            status_code=401, message="Authentication failed. Invalid token."
+        )
+    except Exception as e:
+        logger.error(f"Error updating recurring task: {e}")
+        return format_response(status_code=500, message="Internal server error.")
+
+
+async def complete_occurrence(request, recurrenceId, validated_data):
+    logger.info(
+        f"Executing complete_occurrence controller logic for recurrence ID: {recurrenceId}."
+    )
+    try:
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            return format_response(
+                status_code=401, message="Authorization header missing or invalid."
+            )
+        id_token = auth_header.split(" ")[1]
+
+        user, is_registered = auth_service.authenticate_user(id_token)
+        if not is_registered:
+            return format_response(status_code=401, message="User not registered.")
+
+        occurrence_at = validated_data.occurrence_at.replace(tzinfo=None)
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"""SELECT created_by, assigned_to, frequency, repeat_interval, by_weekday, starts_at, until
+                       FROM task_recurrences
+                       WHERE id = %s AND {LIVE_CREATOR}""",
+                    (recurrenceId,),
+                )
+                rule = cur.fetchone()
+                if not rule:
+                    return format_response(
+                        status_code=404, message="Recurring task not found."
+                    )
+
+                if not _can_manage_recurrence(cur, user, rule[0], rule[1]):
+                    return format_response(
+                        status_code=403,
+                        message="Access denied. You can only complete tasks you created, are assigned to, or are linked to as a family member.",
+                    )
+
+                if not RecurrenceRule(*rule[2:]).occurrences(
+                    occurrence_at, occurrence_at
+                ):
+                    return format_response(
+                        status_code=400,
+                        message="No occurrence of this recurring task at that time.",
+                    )
+
+                # Only the completed occurrence becomes a tasks row
+                cur.execute(
+                    """INSERT INTO tasks (title, description, time_of_completion, status, created_by, assigned_to,
+                                          priority, category, estimated_duration, recurrence_id)
+                       SELECT title, description, %s, %s, created_by, assigned_to,
+                              priority, category, estimated_duration, id
+                       FROM task_recurrences
+                       WHERE id = %s
+                       ON CONFLICT (recurrence_id, time_of_completion) DO UPDATE
+                       SET status = EXCLUDED.status, updated_at = CURRENT_TIMESTAMP
+                       WHERE tasks.status <> EXCLUDED.status
+                       RETURNING id""",
+                    (occurrence_at, TaskStatus.COMPLETED.value, recurrenceId),
+                )
+                row = cur.fetchone()
+                if not row:
+                    return format_response(
+                        status_code=400, message="Task is already completed."
+                    )
+                invalidation_bus.publish(cur, "tasks", row[0])
+
+        return format_response(
+            status_code=200,
+            message="Task marked as done successfully.",
+            data={"task_id": row[0]},
+        )
+
+    except ValueError as e:
+        logger.error(f"Authentication failed: {e}")
+        return format_response(
+            status_code=401, message="Authentication failed. Invalid token."
+        )
+    except Exception as e:
+        logger.error(f"Error completing recurring task occurrence: {e}")
+        return format_response(status_code=500, message="Internal server error.")
+
+
+async def end_recurrence(request, recurrenceId, validated_data):
+    logger.info(
+        f"Executing end_recurrence controller logic for recurrence ID: {recurrenceId}."
+    )
+    try:
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            return format_response(
+                status_code=401, message="Authorization header missing or invalid."
+            )
+        id_token = auth_header.split(" ")[1]
+
+        user, is_registered = auth_service.authenticate_user(id_token)
+        if not is_registered:
+            return format_response(status_code=401, message="User not registered.")
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"SELECT created_by, assigned_to FROM task_recurrences WHERE id = %s AND {LIVE_CREATOR}",
+                    (recurrenceId,),
+                )
+                rule = cur.fetchone()
+                if not rule:
+                    return format_response(
+                        status_code=404, message="Recurring task not found."
+                    )
+
+                if not _can_manage_recurrence(cur, user, rule[0], rule[1]):
+                    return format_response(
+                        status_code=403,
+                        message="Access denied. You can only delete tasks you created, are assigned to, or are linked to as a family member.",
+                    )
+
+                # Ending the series keeps past occurrences and completed tasks
+                cur.execute(
+                    """UPDATE task_recurrences
+                       SET until = LOCALTIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                       WHERE id = %s AND (until IS NULL OR until > LOCALTIMESTAMP)""",
+                    (recurrenceId,),
+                )
+                invalidation_bus.publish(cur, "task_recurrences", recurrenceId)
+
+        return format_response(
+            status_code=200, message="Recurring task ended successfully."
+        )
+
+    except ValueError as e:
+        logger.error(f"Authentication failed: {e}")
+        return format_response(
+            status_code=401, message="Authentication failed. Invalid token."
+        )
+    except Exception as e:
+        logger.error(f"Error ending recurring task: {e}")
+        return format_response(status_code=500, message="Internal server error.")
@@ -1,8 +1,13 @@
-from app.database.db import get_db_connection
+from app.config import settings
+from app.database.db import get_db_connection, get_read_connection
+from app.database.json_render import fetch_json_document
+from app.database.prepared import execute_prepared
 from app.logger import logger
 from app.modules.auth.auth_service import auth_service
+from app.modules.tickets.assignment import least_loaded, support_workloads
+from app.modules.tickets.duplicates import find_duplicate_tickets
 from app.payloads import TicketStatus, UserRole
-from app.utils.response_formatter import format_response
+from app.utils.response_formatter import format_response, json_data_response
 
 
 async def get_tickets(request):
@@ -24,7 +29,7 @@ async def get_tickets(request):
         priority_filter = request.query_params.get("priority")
         assigned_to_filter = request.query_params.get("assigned_to")
 
-        with get_db_connection() as conn:
+        with get_read_connection() as conn:
             with conn.cursor() as cur:
                 # Base query with user details
                 query = """
@@ -33,8 +38,8 @@ async def get_tickets(request):
                         t.priority, t.category, t.status, t.created_at, t.updated_at, t.resolved_at,
                         u1.full_name as created_by_name, u2.full_name as assigned_to_name
                     FROM tickets t
-                    LEFT JOIN users u1 ON t.user_id = u1.id
-                    LEFT JOIN users u2 ON t.assigned_to = u2.id
+                    LEFT JOIN users u1 ON t.user_id = u1.id AND u1.deleted_at IS NULL
+                    LEFT JOIN users u2 ON t.assigned_to = u2.id AND u2.deleted_at IS NULL
                     WHERE 1=1
                 """
                 params = []
@@ -64,9 +69,23 @@ async def get_tickets(request):
                     query += " AND t.assigned_to = %s"
                     params.append(int(assigned_to_filter))
 
-                query += " ORDER BY t.created_at DESC"
+                query += " ORDER BY t.created_at DESC, t.id DESC"
+
+                if settings.RENDER_JSON_IN_DB:
+                    data_json = fetch_json_document(
+                        cur,
+                        query,
+                        params,
+                        "tickets",
+                        order_by="q.created_at DESC, q.id DESC",
+                    )
+                    return json_data_response(
+                        status_code=200,
+                        message="Tickets retrieved successfully.",
+                        data_json=data_json,
+                    )
 
-                cur.execute(query, params)
+                execute_prepared(cur, query, params)
                 tickets_data = cur.fetchall()
 
                 tickets = [
@@ -118,34 +137,78 @@ async def create_ticket(request, validated_data):
         if not is_registered:
             return format_response(status_code=401, message="User not registered.")
 
+        category = getattr(validated_data, "category", None)
+
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                # Auto-assign ticket to a support user with balanced workload
-                assigned_to_id = _get_balanced_assignment(cur)
+                duplicates = find_duplicate_tickets(
+                    cur,
+                    user.id,
+                    validated_data.subject,
+                    validated_data.description,
+                    category,
+                )
+                # A near-identical open ticket of the same user takes the new
+                # one along, with the same assignee
+                linked = next(
+                    (
+                        duplicate
+                        for duplicate in duplicates
+                        if duplicate.user_id == user.id
+                        and duplicate.is_open
+                        and duplicate.similarity
+                        >= settings.TICKET_DUPLICATE_AUTO_LINK_SIMILARITY
+                    ),
+                    None,
+                )
 
+                assigned_to_id = linked.assigned_to if linked else None
+                if assigned_to_id is None:
+                    # Auto-assign ticket to a support user with balanced workload
+                    assigned_to_id = _get_balanced_assignment(cur)
+
+                if linked:
+                    logger.info(f"Linked new ticket as a duplicate of {linked.id}")
                 if assigned_to_id:
                     logger.info(
-                        f"Auto-assigned ticket to support user ID: {assigned_to_id} (balanced workload)"
+                        f"Auto-assigned ticket to support user ID: {assigned_to_id}"
                     )
                 else:
                     logger.warning("No active support users found for auto-assignment")
 
                 cur.execute(
-                    """INSERT INTO tickets (user_id, subject, description, priority, category, assigned_to)
-                       VALUES (%s, %s, %s, %s, %s, %s) RETURNING id""",
+                    """INSERT INTO tickets (user_id, subject, description, priority, category, assigned_to, duplicate_of)
+                       VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING id""",
                     (
                         user.id,
                         validated_data.subject,
                         validated_data.description,
                         getattr(validated_data, "priority", "medium"),
-                        getattr(validated_data, "category", None),
+                        category,
                         assigned_to_id,
+                        linked.id if linked else None,
                     ),
                 )
                 ticket_id = cur.fetchone()[0]
 
         # Prepare response data
         response_data = {"ticket_id": ticket_id}
+        if linked:
+            response_data["duplicate_of"] = linked.id
+        # Other users' tickets are only counted, not shown
+        response_data["possible_duplicates"] = [
+            {
+                "id": duplicate.id,
+                "subject": duplicate.subject,
+                "status": duplicate.status,
+                "similarity": round(duplicate.similarity, 2),
+            }
+            for duplicate in duplicates
+            if duplicate.user_id == user.id
+        ]
+        response_data["similar_tickets_in_category"] = sum(
+            1 for duplicate in duplicates if duplicate.user_id != user.id
+        )
         if assigned_to_id:
             response_data["auto_assigned_to"] = assigned_to_id
             response_data["message"] = (
@@ -193,10 +256,11 @@ async def get_ticket(request, ticketId):
                     """SELECT
                         t.id, t.user_id, t.assigned_to, t.subject, t.description,
                         t.priority, t.category, t.status, t.created_at, t.updated_at, t.resolved_at,
-                        u1.full_name as created_by_name, u2.full_name as assigned_to_name
+                        u1.full_name as created_by_name, u2.full_name as assigned_to_name,
+                        t.duplicate_of
                     FROM tickets t
-                    LEFT JOIN users u1 ON t.user_id = u1.id
-                    LEFT JOIN users u2 ON t.assigned_to = u2.id
+                    LEFT JOIN users u1 ON t.user_id = u1.id AND u1.deleted_at IS NULL
+                    LEFT JOIN users u2 ON t.assigned_to = u2.id AND u2.deleted_at IS NULL
                     WHERE t.id = %s""",
                     (ticketId,),
                 )
@@ -227,6 +291,7 @@ async def get_ticket(request, ticketId):
                     "resolved_at": ticket_data[10],
                     "created_by_name": ticket_data[11],
                     "assigned_to_name": ticket_data[12],
+                    "duplicate_of": ticket_data[13],
                 }
 
         return format_response(
@@ -261,40 +326,36 @@ async def update_ticket(request, ticketId, validated_data):
 
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                # Verify ticket exists and check permissions
-                cur.execute(
-                    "SELECT user_id, status FROM tickets WHERE id = %s", (ticketId,)
-                )
-                ticket_data = cur.fetchone()
-                if not ticket_data:
-                    return format_response(status_code=404, message="Ticket not found.")
-
-                # Permission check - admin/support can update any, others only their own
-                if user.role not in [UserRole.ADMIN.value, UserRole.SUPPORT_USER.value]:
-                    if ticket_data[0] != user.id:
-                        return format_response(
-                            status_code=403,
-                            message="Access denied. You can only update your own tickets.",
-                        )
-
                 update_fields = []
-                update_values = []
+                params = {
+                    "ticket_id": ticketId,
+                    "user_id": user.id,
+                    "is_privileged": user.role
+                    in [UserRole.ADMIN.value, UserRole.SUPPORT_USER.value],
+                    "assigned_to": None,
+                    "assignable_roles": [
+                        UserRole.ADMIN.value,
+                        UserRole.SUPPORT_USER.value,
+                    ],
+                }
+                # Reported only after the existence and permission checks below
+                validation_error = None
 
                 # Handle subject update
                 if (
                     hasattr(validated_data, "subject")
                     and validated_data.subject is not None
                 ):
-                    update_fields.append("subject = %s")
-                    update_values.append(validated_data.subject)
+                    update_fields.append("subject = %(subject)s")
+                    params["subject"] = validated_data.subject
 
                 # Handle description update
                 if (
                     hasattr(validated_data, "description")
                     and validated_data.description is not None
                 ):
-                    update_fields.append("description = %s")
-                    update_values.append(validated_data.description)
+                    update_fields.append("description = %(description)s")
+                    params["description"] = validated_data.description
 
                 # Handle priority update with validation
                 if (
@@ -304,20 +365,17 @@ async def update_ticket(request, ticketId, validated_data):
                     # Validate priority value
                     valid_priorities = ["low", "medium", "high"]
                     if validated_data.priority not in valid_priorities:
-                        return format_response(
-                            status_code=400,
-                            message=f"Invalid priority. Must be one of: {', '.join(valid_priorities)}",
-                        )
-                    update_fields.append("priority = %s")
-                    update_values.append(validated_data.priority)
+                        validation_error = f"Invalid priority. Must be one of: {', '.join(valid_priorities)}"
+                    update_fields.append("priority = %(priority)s")
+                    params["priority"] = validated_data.priority
 
                 # Handle category update
                 if (
                     hasattr(validated_data, "category")
                     and validated_data.category is not None
                 ):
-                    update_fields.append("category = %s")
-                    update_values.append(validated_data.category)
+                    update_fields.append("category = %(category)s")
+                    params["category"] = validated_data.category
 
                 # Handle status update with validation - FIXED
                 if (
@@ -333,14 +391,11 @@ async def update_ticket(request, ticketId, validated_data):
                         status_value = status_value.value
 
                     # Validate the status value
-                    if status_value not in valid_statuses:
-                        return format_response(
-                            status_code=400,
-                            message=f"Invalid status. Must be one of: {', '.join(valid_statuses)}",
-                        )
+                    if status_value not in valid_statuses and not validation_error:
+                        validation_error = f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
 
-                    update_fields.append("status = %s")
-                    update_values.append(status_value)
+                    update_fields.append("status = %(status)s")
+                    params["status"] = status_value
 
                     # Set resolved_at timestamp when closing ticket
                     if status_value == "closed":
@@ -351,43 +406,75 @@ async def update_ticket(request, ticketId, validated_data):
                     hasattr(validated_data, "assigned_to")
                     and validated_data.assigned_to is not None
                 ):
-                    # Verify assigned user exists and is support/admin
-                    cur.execute(
-                        "SELECT role FROM users WHERE id = %s",
-                        (validated_data.assigned_to,),
+                    update_fields.append("assigned_to = %(assigned_to)s")
+                    params["assigned_to"] = validated_data.assigned_to
+
+                params["can_update"] = bool(update_fields) and not validation_error
+                set_clause = ", ".join(
+                    update_fields + ["updated_at = CURRENT_TIMESTAMP"]
+                )
+
+                # Existence, permission and assignee checks plus the update in one statement
+                cur.execute(
+                    f"""WITH target AS (
+                            SELECT id, user_id FROM tickets WHERE id = %(ticket_id)s
+                        ),
+                        assignee AS (
+                            SELECT role::text AS role FROM users
+                            WHERE id = %(assigned_to)s AND deleted_at IS NULL
+                        ),
+                        updated AS (
+                            UPDATE tickets tk SET {set_clause}
+                            FROM target t
+                            WHERE tk.id = t.id
+                              AND %(can_update)s
+                              AND (%(is_privileged)s OR tk.user_id = %(user_id)s)
+                              AND (%(assigned_to)s IS NULL OR EXISTS (
+                                  SELECT 1 FROM assignee
+                                  WHERE role = ANY(%(assignable_roles)s)
+                              ))
+                            RETURNING tk.id
+                        )
+                        SELECT t.user_id,
+                               (SELECT role FROM assignee),
+                               EXISTS (SELECT 1 FROM updated)
+                        FROM target t""",
+                    params,
+                )
+                ticket_data = cur.fetchone()
+                if not ticket_data:
+                    return format_response(status_code=404, message="Ticket not found.")
+
+                ticket_owner_id, assignee_role, updated = ticket_data
+
+                # Permission check - admin/support can update any, others only their own
+                if not params["is_privileged"] and ticket_owner_id != user.id:
+                    return format_response(
+                        status_code=403,
+                        message="Access denied. You can only update your own tickets.",
                     )
-                    assigned_user = cur.fetchone()
-                    if not assigned_user:
+
+                if validation_error:
+                    return format_response(status_code=400, message=validation_error)
+
+                # Verify assigned user exists and is support/admin
+                if params["assigned_to"] is not None:
+                    if not assignee_role:
                         return format_response(
                             status_code=404, message="Assigned user not found."
                         )
-                    if assigned_user[0] not in [
-                        UserRole.ADMIN.value,
-                        UserRole.SUPPORT_USER.value,
-                    ]:
+                    if assignee_role not in params["assignable_roles"]:
                         return format_response(
                             status_code=400,
                             message="Tickets can only be assigned to admin or support users.",
                         )
-                    update_fields.append("assigned_to = %s")
-                    update_values.append(validated_data.assigned_to)
 
                 # Check if there are any fields to update
-                if not update_fields:
+                if not updated:
                     return format_response(
                         status_code=400, message="No fields to update."
                     )
 
-                # Build and execute update query
-                update_values.append(ticketId)
-                update_query = f"UPDATE tickets SET {', '.join(update_fields)}, updated_at = CURRENT_TIMESTAMP WHERE id = %s"
-
-                cur.execute(update_query, tuple(update_values))
-                if cur.rowcount == 0:
-                    return format_response(
-                        status_code=404, message="Ticket not found or no changes made."
-                    )
-
         return format_response(status_code=200, message="Ticket updated successfully.")
 
     except ValueError as e:
@@ -423,6 +510,7 @@ async def get_assignable_users(request):
                     FROM users
                     WHERE role IN ('admin', 'support_user')
                     AND status = 'active'
+                    AND deleted_at IS NULL
                     ORDER BY full_name
                 """
                 )
@@ -466,7 +554,7 @@ async def get_support_workload_stats(request):
                 message="Access denied. Only admins can view support workload statistics.",
             )
 
-        with get_db_connection() as conn:
+        with get_read_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
@@ -485,6 +573,7 @@ async def get_support_workload_stats(request):
                     LEFT JOIN tickets t ON u.id = t.assigned_to
                     WHERE u.role IN ('support_user')
                     AND u.status = 'active'
+                    AND u.deleted_at IS NULL
                     GROUP BY u.id, u.full_name, u.role
                     ORDER BY open_tickets DESC, total_tickets ASC
                 """
@@ -522,20 +611,7 @@ def _get_balanced_assignment(cursor):
     Returns the user ID of the support user with the least open tickets.
     """
     try:
-        cursor.execute(
-            """
-            SELECT u.id, COUNT(t.id) as open_tickets
-            FROM users u
-            LEFT JOIN tickets t ON u.id = t.assigned_to AND t.status IN ('open', 'in_progress')
-            WHERE u.role IN ('support_user')
-            AND u.status = 'active'
-            GROUP BY u.id
-            ORDER BY open_tickets ASC, RANDOM()
-            LIMIT 1
-        """
-        )
-        result = cursor.fetchone()
-        return result[0] if result else None
+        return least_loaded(support_workloads(cursor))
     except Exception as e:
         logger.error(f"Error in balanced assignment: {e}")
         return None
@@ -1,24 +1,326 @@
+import asyncio
+import itertools
+import threading
+import time
 from contextlib import contextmanager
+from contextvars import ContextVar
 
 import psycopg2
 from app.config import settings
+from app.database.prepared import PreparingConnection, get_statement_cache_stats
 from app.logger import logger
+from app.modules.cache.invalidation_bus import invalidation_bus
+from psycopg2 import pool
+
+# Zero when the replica has replayed everything it received (or is not a standby)
+REPLICA_LAG_QUERY = """SELECT CASE
+                              WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                              ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                          END"""
+
+_pool = None
+_replicas = []
+_replica_counter = itertools.count()
+_pool_lock = threading.Lock()
+_export_slots = None
+
+# Read-your-writes: when each user last wrote, as announced by any worker over
+# the invalidation bus ("recent_writes" events)
+RECENT_WRITES = "recent_writes"
+_request_user = ContextVar("request_user", default=None)
+_recent_writes = {}
+# Set when events may have been missed; pins every user to the primary
+_all_written_at = None
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+class BlockingConnectionPool(pool.ThreadedConnectionPool):
+    """
+    ThreadedConnectionPool whose getconn, called from a worker thread (the
+    threadpool, background jobs), waits up to DB_POOL_TIMEOUT for a connection
+    to be returned instead of raising PoolError as soon as all maxconn
+    connections are checked out. On the event loop thread, where async
+    controllers run, it still fails fast: waiting there would freeze the
+    worker, including the requests that would give connections back.
+    """
+
+    def __init__(self, minconn, maxconn, *args, **kwargs):
+        self._slots = threading.BoundedSemaphore(maxconn)
+        super().__init__(minconn, maxconn, *args, **kwargs)
+
+    def getconn(self, key=None):
+        if _on_event_loop():
+            acquired = self._slots.acquire(blocking=False)
+        else:
+            acquired = self._slots.acquire(timeout=settings.DB_POOL_TIMEOUT)
+        if not acquired:
+            raise pool.PoolError("No database connection free")
+        try:
+            return super().getconn(key)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self._slots.release()
+
+
+class _Replica:
+    def __init__(self, index, url):
+        self.index = index
+        self.url = url
+        # minconn=0 so an unreachable replica does not prevent startup
+        self.pool = BlockingConnectionPool(
+            0, get_pool_size(), url, connection_factory=PreparingConnection
+        )
+        self.checked_at = 0.0
+        self.healthy = True
+
+    def is_healthy(self):
+        now = time.monotonic()
+        if now - self.checked_at >= settings.DB_REPLICA_LAG_CHECK_INTERVAL:
+            self.checked_at = now
+            self.healthy = self._check_lag()
+        return self.healthy
+
+    def _check_lag(self):
+        conn = None
+        try:
+            conn = self.pool.getconn()
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(REPLICA_LAG_QUERY)
+                lag = float(cur.fetchone()[0])
+            if lag > settings.DB_REPLICA_MAX_LAG_SECONDS:
+                logger.warning(f"Replica {self.index} is lagging by {lag:.1f}s")
+                return False
+            return True
+        except Exception as e:
+            logger.warning(f"Replica {self.index} health check failed: {e}")
+            return False
+        finally:
+            if conn:
+                if not conn.closed:
+                    conn.autocommit = False
+                self.pool.putconn(conn, close=bool(conn.closed))
+
+
+def get_pool_size():
+    """Connections this worker may hold: the global budget split across workers."""
+    workers = max(1, settings.WEB_CONCURRENCY)
+    share = settings.DB_CONNECTION_BUDGET // workers
+    if settings.CACHE_INVALIDATION_BUS:
+        share -= 1  # Dedicated cache invalidation listener
+    if settings.TASK_SCHEDULER_ENABLED:
+        share -= 1  # Task deadline scheduler's leader election connection
+    share -= settings.EXPORT_MAX_CONCURRENT  # Streaming admin exports
+    return max(settings.DB_POOL_MIN_SIZE, share)
+
+
+def init_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            max_size = get_pool_size()
+            logger.info(f"Creating database connection pool (max {max_size})...")
+            _pool = BlockingConnectionPool(
+                settings.DB_POOL_MIN_SIZE,
+                max_size,
+                settings.DATABASE_URL,
+                connection_factory=PreparingConnection,
+            )
+            replica_urls = [
+                url.strip()
+                for url in settings.DATABASE_REPLICA_URLS.split(",")
+                if url.strip()
+            ]
+            _replicas[:] = [
+                _Replica(index, url) for index, url in enumerate(replica_urls)
+            ]
+            if _replicas:
+                logger.info(f"Routing read-only queries to {len(_replicas)} replica(s)")
+    return _pool
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+            for replica in _replicas:
+                replica.pool.closeall()
+            _replicas.clear()
+            logger.info("Database connection pool closed.")
+            logger.info(
+                f"Prepared statement cache stats: {get_statement_cache_stats()}"
+            )
+
+
+def track_request_user():
+    """Start collecting the id of the user authenticated during this request."""
+    request_user = {}
+    _request_user.set(request_user)
+    return request_user
+
+
+def set_request_user(user_id):
+    request_user = _request_user.get()
+    if request_user is not None:
+        request_user["user_id"] = user_id
+
+
+def mark_recent_write(*user_ids):
+    """
+    Pin the users' reads to the primary until replicas have caught up. Without
+    ids (the bus reconnected and may have missed events) every user is pinned.
+    """
+    global _all_written_at
+    now = time.monotonic()
+    if not user_ids:
+        _all_written_at = now
+        return
+    if len(_recent_writes) > 10000:
+        for stale_id, written_at in list(_recent_writes.items()):
+            if now - written_at > settings.DB_READ_YOUR_WRITES_SECONDS:
+                _recent_writes.pop(stale_id, None)
+    for user_id in user_ids:
+        _recent_writes[user_id] = now
+
+
+invalidation_bus.subscribe(RECENT_WRITES, mark_recent_write)
+
+
+def _request_user_id():
+    request_user = _request_user.get()
+    return request_user.get("user_id") if request_user else None
+
+
+def _announce_write(conn):
+    """
+    Before commit: if this request's transaction wrote, tell every worker, so
+    the user's next reads avoid the replicas whichever worker serves them. The
+    event is delivered on commit, before the response reaches the client.
+    """
+    user_id = _request_user_id()
+    if user_id is None:
+        return
+    with conn.cursor() as cur:
+        if invalidation_bus.publish_if_written(cur, RECENT_WRITES, user_id):
+            mark_recent_write(user_id)
+
+
+def _wrote_recently():
+    now = time.monotonic()
+    window = settings.DB_READ_YOUR_WRITES_SECONDS
+    if _all_written_at is not None and now - _all_written_at < window:
+        return True
+    user_id = _request_user_id()
+    written_at = _recent_writes.get(user_id) if user_id is not None else None
+    return written_at is not None and now - written_at < window
+
+
+def _pick_replica():
+    if not _replicas or _wrote_recently():
+        return None
+    start = next(_replica_counter)
+    for offset in range(len(_replicas)):
+        replica = _replicas[(start + offset) % len(_replicas)]
+        if replica.is_healthy():
+            return replica
+    return None
+
+
+def _pick_replica_pool():
+    replica = _pick_replica()
+    return replica.pool if replica else None
 
 
 @contextmanager
 def get_db_connection():
     conn = None
+    db_pool = init_pool()
     try:
-        logger.info("Connecting to the database...")
-        conn = psycopg2.connect(settings.DATABASE_URL)
+        conn = db_pool.getconn()
         yield conn
+        if _replicas:
+            _announce_write(conn)
         conn.commit()
     except Exception as e:
         logger.error(f"Database connection error: {e}")
-        if conn:
+        if conn and not conn.closed:
             conn.rollback()
         raise
+    finally:
+        if conn:
+            # Broken connections are discarded instead of being handed out again
+            db_pool.putconn(conn, close=bool(conn.closed))
+
+
+@contextmanager
+def get_read_connection():
+    """
+    Connection for read-only handlers. Uses a healthy replica when configured,
+    otherwise the primary, and runs in autocommit so there is no COMMIT round trip.
+    """
+    conn = None
+    primary_pool = init_pool()
+    db_pool = _pick_replica_pool() or primary_pool
+    try:
+        conn = db_pool.getconn()
+        conn.autocommit = True
+        yield conn
+    except Exception as e:
+        logger.error(f"Database connection error: {e}")
+        raise
+    finally:
+        if conn:
+            if not conn.closed:
+                conn.autocommit = False
+            db_pool.putconn(conn, close=bool(conn.closed))
+
+
+@contextmanager
+def get_export_connection():
+    """
+    Dedicated read-only connection for long-running reads such as streaming
+    exports, so a slow download does not hold a pooled connection. Uses a
+    healthy replica when configured. At most EXPORT_MAX_CONCURRENT are open at
+    once; waits up to DB_POOL_TIMEOUT for one to be closed.
+    """
+    global _export_slots
+    init_pool()
+    with _pool_lock:
+        if _export_slots is None:
+            _export_slots = threading.BoundedSemaphore(
+                max(1, settings.EXPORT_MAX_CONCURRENT)
+            )
+    if not _export_slots.acquire(timeout=settings.DB_POOL_TIMEOUT):
+        raise pool.PoolError(
+            f"No export connection free after {settings.DB_POOL_TIMEOUT}s"
+        )
+    conn = None
+    try:
+        replica = _pick_replica()
+        conn = psycopg2.connect(replica.url if replica else settings.DATABASE_URL)
+        # Named (server-side) cursors need a transaction; keep it read-only
+        conn.set_session(readonly=True)
+        yield conn
+        conn.rollback()
+    except Exception as e:
+        logger.error(f"Database connection error: {e}")
+        raise
     finally:
         if conn:
             conn.close()
-            logger.info("Database connection closed.")
+        _export_slots.release()
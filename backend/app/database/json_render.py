@@ -0,0 +1,16 @@
+from app.database.prepared import execute_prepared
+
+
+def fetch_json_document(cur, query, params, key, order_by=None):
+    """
+    Run `query` wrapped so Postgres returns {"<key>": [row, ...]} as JSON text,
+    one object per row keyed by the query's column names.
+    """
+    order = f" ORDER BY {order_by}" if order_by else ""
+    execute_prepared(
+        cur,
+        f"""SELECT json_build_object(%s::text, COALESCE(json_agg(q{order}), '[]'::json))::text
+            FROM ({query}) q""",
+        (key, *params),
+    )
+    return cur.fetchone()[0]
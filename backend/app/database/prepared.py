@@ -0,0 +1,150 @@
+import hashlib
+import itertools
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import psycopg2
+from app.config import settings
+from psycopg2 import errors
+from psycopg2.extensions import connection as _PgConnection
+
+_stats = {"prepared": 0, "executed": 0, "evicted": 0, "saved_seconds": 0.0}
+_stats_lock = threading.Lock()
+
+# Quoted text first, so placeholders are only recognized outside of it
+_TOKENS = re.compile(r"""'(?:[^']|'')*'|"(?:[^"]|"")*"|--[^\n]*|%%|%s|%""")
+_LITERAL_PERCENT = re.compile(r"%%|%s|%")
+
+# Statements PREPARE rejected (e.g. parameter types Postgres cannot infer);
+# these always run as plain queries
+_unpreparable = set()
+
+
+class PreparingConnection(_PgConnection):
+    """psycopg2 connection that remembers the statements prepared on it."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # statement name -> seconds the PREPARE took, least recently used first
+        self.prepared_statements = OrderedDict()
+
+
+def _record(**deltas):
+    with _stats_lock:
+        for key, delta in deltas.items():
+            _stats[key] += delta
+
+
+def get_statement_cache_stats():
+    """
+    Counters for this worker. saved_seconds is an estimate: the time each
+    PREPARE took, credited again every time the statement is re-executed.
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _statement_name(query):
+    normalized = " ".join(query.split())
+    return "stmt_" + hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def _to_positional(query):
+    """
+    Rewrite %s placeholders as $1, $2, ... and %% as %, like psycopg2's own
+    interpolation does. Raises psycopg2.ProgrammingError for placeholders PREPARE
+    cannot take: %(name)s, a lone %, or %s inside a string literal. Not
+    ValueError, which the controllers report as an invalid token.
+    """
+    counter = itertools.count(1)
+
+    def unsupported(sequence):
+        raise psycopg2.ProgrammingError(
+            f"Unsupported {sequence!r} in prepared query: {query!r}"
+        )
+
+    def literal_percent(match):
+        return "%" if match.group() == "%%" else unsupported(match.group())
+
+    def replace(match):
+        token = match.group()
+        if token == "%s":
+            return f"${next(counter)}"
+        if token == "%%":
+            return "%"
+        if token == "%":
+            unsupported(query[match.start() : match.start() + 2])
+        if token.startswith("'"):
+            return _LITERAL_PERCENT.sub(literal_percent, token)
+        return token
+
+    return _TOKENS.sub(replace, query)
+
+
+def _prepare(cur, name, query) -> bool:
+    """
+    PREPARE the statement, under a savepoint inside transactions so a failure
+    leaves the caller's transaction usable. False if Postgres rejected it.
+    """
+    positional = _to_positional(query)
+    in_transaction = not cur.connection.autocommit
+    if in_transaction:
+        cur.execute("SAVEPOINT prepare_statement")
+    try:
+        cur.execute(f"PREPARE {name} AS {positional}")
+    except errors.DuplicatePreparedStatement:
+        # Prepared earlier on this session but dropped from the registry
+        if in_transaction:
+            cur.execute("ROLLBACK TO SAVEPOINT prepare_statement")
+        return True
+    except psycopg2.Error:
+        if in_transaction:
+            cur.execute("ROLLBACK TO SAVEPOINT prepare_statement")
+        return False
+    if in_transaction:
+        cur.execute("RELEASE SAVEPOINT prepare_statement")
+    return True
+
+
+def execute_prepared(cur, query, params=()):
+    """
+    Execute `query` as a named server-side prepared statement on the cursor's
+    connection, preparing it on first use. Queries may only use %s placeholders
+    (and %% for a literal %). Falls back to a plain execute on connections
+    without a registry and for statements Postgres will not prepare.
+    """
+    statements = getattr(cur.connection, "prepared_statements", None)
+    max_size = settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+    name = _statement_name(query)
+    if statements is None or max_size <= 0 or name in _unpreparable:
+        cur.execute(query, params)
+        return
+
+    if name in statements:
+        statements.move_to_end(name)
+        _record(executed=1, saved_seconds=statements[name])
+    else:
+        while len(statements) >= max_size:
+            evicted, _ = statements.popitem(last=False)
+            cur.execute(f"DEALLOCATE {evicted}")
+            _record(evicted=1)
+        started = time.perf_counter()
+        if not _prepare(cur, name, query):
+            _unpreparable.add(name)
+            cur.execute(query, params)
+            return
+        statements[name] = time.perf_counter() - started
+        _record(prepared=1)
+
+    try:
+        if params:
+            placeholders = ", ".join(["%s"] * len(params))
+            cur.execute(f"EXECUTE {name} ({placeholders})", params)
+        else:
+            cur.execute(f"EXECUTE {name}")
+    except errors.InvalidSqlStatementName:
+        # The session lost the statement (e.g. DISCARD ALL); prepare it again next time
+        statements.pop(name, None)
+        raise
@@ -1,10 +1,19 @@
 -- Drop tables in reverse dependency order to avoid foreign key conflicts
+DROP TABLE IF EXISTS idempotency_keys CASCADE;
+DROP TABLE IF EXISTS user_deletions CASCADE;
+DROP TABLE IF EXISTS video_analysis_jobs CASCADE;
+DROP TABLE IF EXISTS table_versions CASCADE;
+DROP TABLE IF EXISTS care_request_rejections CASCADE;
+DROP TABLE IF EXISTS group_member_counts CASCADE;
 DROP TABLE IF EXISTS notifications CASCADE;
 DROP TABLE IF EXISTS tickets CASCADE;
+DROP TABLE IF EXISTS ticket_sla_policies CASCADE;
 DROP TABLE IF EXISTS group_members CASCADE;
 DROP TABLE IF EXISTS interest_groups CASCADE;
 DROP TABLE IF EXISTS care_requests CASCADE;
 DROP TABLE IF EXISTS tasks CASCADE;
+DROP TABLE IF EXISTS task_occurrence_notices CASCADE;
+DROP TABLE IF EXISTS task_recurrences CASCADE;
 DROP TABLE IF EXISTS relations CASCADE;
 DROP TABLE IF EXISTS users CASCADE;
 
@@ -22,6 +31,11 @@ DROP TABLE IF EXISTS users CASCADE;
 -- ID 11: Test Support User One (support_user) - Support specialist
 -- ID 12: Test Support User Two (support_user) - Customer service representative
 
+-- Lets GiST exclusion constraints combine equality on plain columns with ranges
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+-- Trigram similarity for duplicate ticket detection
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Create ENUM type for user roles
 DROP TYPE IF EXISTS user_role CASCADE;
 CREATE TYPE user_role AS ENUM ('admin', 'caregiver', 'family_member', 'senior_citizen', 'interest_group_admin', 'support_user');
@@ -34,6 +48,10 @@ CREATE TYPE user_status AS ENUM ('pending_approval', 'active', 'blocked');
 DROP TYPE IF EXISTS task_status CASCADE;
 CREATE TYPE task_status AS ENUM ('pending', 'in_progress', 'completed', 'cancelled');
 
+-- Create ENUM type for recurring task frequency
+DROP TYPE IF EXISTS recurrence_frequency CASCADE;
+CREATE TYPE recurrence_frequency AS ENUM ('daily', 'weekly', 'monthly');
+
 -- Create ENUM type for care request status
 DROP TYPE IF EXISTS care_request_status CASCADE;
 CREATE TYPE care_request_status AS ENUM ('pending', 'accepted', 'rejected', 'cancelled');
@@ -61,8 +79,13 @@ CREATE TABLE users (
     date_of_birth DATE,
     description TEXT,
     tags VARCHAR(255),
+    -- Optional location (WGS84 degrees), used by the nearby caregiver search
+    latitude DOUBLE PRECISION CHECK (latitude BETWEEN -90 AND 90),
+    longitude DOUBLE PRECISION CHECK (longitude BETWEEN -180 AND 180),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    deleted_at TIMESTAMP,  -- Set by admin deletion; the row is purged in the background
+    CHECK ((latitude IS NULL) = (longitude IS NULL))
 );
 
 -- Insert default admin accounts
@@ -125,6 +148,36 @@ CREATE TABLE relations (
     UNIQUE (senior_citizen_id, family_member_id)
 );
 
+-- Recurring tasks are stored once as a rule; get_tasks expands occurrences for
+-- the requested window and only completed occurrences become tasks rows
+CREATE TABLE task_recurrences (
+    id SERIAL PRIMARY KEY,
+    title VARCHAR(255) NOT NULL,
+    description TEXT,
+    frequency recurrence_frequency NOT NULL,
+    repeat_interval INTEGER NOT NULL DEFAULT 1 CHECK (repeat_interval > 0),
+    by_weekday SMALLINT[], -- weekly only; 0 = Monday ... 6 = Sunday
+    starts_at TIMESTAMP NOT NULL, -- first occurrence; sets the time of day
+    until TIMESTAMP, -- last possible occurrence; NULL repeats forever
+    priority VARCHAR(20) DEFAULT 'medium',
+    category VARCHAR(100) DEFAULT 'other',
+    estimated_duration INTEGER, -- in minutes
+    created_by INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    assigned_to INTEGER REFERENCES users(id) ON DELETE SET NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Reminder/overdue markers of recurring occurrences, which have no tasks row
+-- until completed; rows older than the scheduler's lookback are pruned
+CREATE TABLE task_occurrence_notices (
+    recurrence_id INTEGER NOT NULL REFERENCES task_recurrences(id) ON DELETE CASCADE,
+    occurrence_at TIMESTAMP NOT NULL,
+    reminder_sent_at TIMESTAMP,
+    overdue_notified_at TIMESTAMP,
+    PRIMARY KEY (recurrence_id, occurrence_at)
+);
+
 CREATE TABLE tasks (
     id SERIAL PRIMARY KEY,
     title VARCHAR(255) NOT NULL,
@@ -136,8 +189,14 @@ CREATE TABLE tasks (
     estimated_duration INTEGER, -- in minutes
     created_by INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     assigned_to INTEGER REFERENCES users(id) ON DELETE SET NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    -- Set by the deadline scheduler; cleared when time_of_completion changes
+    reminder_sent_at TIMESTAMP,
+    overdue_notified_at TIMESTAMP,
+    -- Materialized occurrence of a recurring task
+    recurrence_id INTEGER REFERENCES task_recurrences(id) ON DELETE SET NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (recurrence_id, time_of_completion)
 );
 
 CREATE TABLE care_requests (
@@ -147,9 +206,24 @@ CREATE TABLE care_requests (
     made_by INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     status care_request_status NOT NULL DEFAULT 'pending',
     timing_to_visit TIMESTAMP,
+    visit_duration_minutes INTEGER NOT NULL DEFAULT 60 CHECK (visit_duration_minutes > 0),
+    -- NULL for requests without a visit time, which never conflict
+    visit_period TSRANGE GENERATED ALWAYS AS (
+        CASE WHEN timing_to_visit IS NOT NULL THEN
+            tsrange(timing_to_visit, timing_to_visit + visit_duration_minutes * INTERVAL '1 minute')
+        END
+    ) STORED,
     location VARCHAR(255),
+    latitude DOUBLE PRECISION CHECK (latitude BETWEEN -90 AND 90),
+    longitude DOUBLE PRECISION CHECK (longitude BETWEEN -180 AND 180),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CHECK ((latitude IS NULL) = (longitude IS NULL)),
+    -- A caregiver can't be booked for two overlapping accepted visits. The
+    -- constraint's GiST index also serves conflict checks and availability queries
+    CONSTRAINT excl_care_requests_caregiver_visit EXCLUDE USING gist (
+        caregiver_id WITH =, visit_period WITH &&
+    ) WHERE (status = 'accepted')
 );
 
 CREATE TABLE interest_groups (
@@ -160,7 +234,7 @@ CREATE TABLE interest_groups (
     category VARCHAR(100),
     status VARCHAR(50) DEFAULT 'active',
     timing TIMESTAMP,
-    member_count INTEGER DEFAULT 0,
+    member_count INTEGER DEFAULT 0, -- folded base; see current_member_count()
     created_by INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
@@ -185,18 +259,45 @@ CREATE TABLE tickets (
     status ticket_status NOT NULL DEFAULT 'open',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,  -- Added
-    resolved_at TIMESTAMP
+    resolved_at TIMESTAMP,
+    -- Text compared by the duplicate check at creation
+    search_text TEXT GENERATED ALWAYS AS (subject || ' ' || COALESCE(description, '')) STORED,
+    -- Set when the ticket was auto-linked to a near-identical one
+    duplicate_of INTEGER REFERENCES tickets(id) ON DELETE SET NULL,
+    -- SLA breaches so far; each one reassigns the ticket and bumps updated_at
+    escalation_level SMALLINT NOT NULL DEFAULT 0,
+    escalated_at TIMESTAMP
 );
 
+-- How long an open ticket of each priority may go without activity (updated_at)
+-- before the escalation engine reassigns it
+CREATE TABLE ticket_sla_policies (
+    priority notification_priority PRIMARY KEY,
+    breach_after_minutes INTEGER NOT NULL CHECK (breach_after_minutes > 0),
+    -- From this escalation level on, admins are notified as well
+    notify_admins_from_level SMALLINT NOT NULL DEFAULT 2,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO ticket_sla_policies (priority, breach_after_minutes) VALUES
+('high', 240),
+('medium', 1440),
+('low', 4320);
+
+-- Partitioned by month; see ensure_notification_partitions() below
 CREATE TABLE notifications (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     type notification_type NOT NULL,
     priority notification_priority NOT NULL DEFAULT 'medium',
     body TEXT NOT NULL,
     is_read BOOLEAN DEFAULT FALSE,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- Catches rows for months whose partition doesn't exist yet
+CREATE TABLE notifications_default PARTITION OF notifications DEFAULT;
 
 -- Create indexes for better query performance and referential integrity
 CREATE INDEX idx_users_gmail_id ON users(gmail_id);
@@ -207,16 +308,33 @@ CREATE INDEX idx_users_status ON users(status);
 CREATE INDEX idx_relations_senior_citizen_id ON relations(senior_citizen_id);
 CREATE INDEX idx_relations_family_member_id ON relations(family_member_id);
 
-CREATE INDEX idx_tasks_created_by ON tasks(created_by);
-CREATE INDEX idx_tasks_assigned_to ON tasks(assigned_to);
-CREATE INDEX idx_tasks_status ON tasks(status);
+-- Task feed: one ordered index walk per UNION ALL branch in get_tasks
+CREATE INDEX idx_tasks_created_by_created_at ON tasks(created_by, created_at DESC, id DESC);
+CREATE INDEX idx_tasks_assigned_to_created_at ON tasks(assigned_to, created_at DESC, id DESC);
+-- Also serves the deadline scheduler's range scans over open tasks
+CREATE INDEX idx_tasks_status_time_of_completion ON tasks(status, time_of_completion);
 CREATE INDEX idx_tasks_priority ON tasks(priority);
+-- Date-range reads in get_tasks: one index range scan per owner branch
+CREATE INDEX idx_tasks_created_by_time_of_completion ON tasks(created_by, time_of_completion);
+CREATE INDEX idx_tasks_assigned_to_time_of_completion ON tasks(assigned_to, time_of_completion);
+CREATE INDEX idx_task_recurrences_created_by ON task_recurrences(created_by, starts_at);
+CREATE INDEX idx_task_recurrences_assigned_to ON task_recurrences(assigned_to, starts_at);
 CREATE INDEX idx_tasks_category ON tasks(category);
 
+-- Nearby caregiver search: bounding-box scans over active caregivers' locations
+CREATE INDEX idx_users_caregiver_location ON users USING gist (point(longitude, latitude))
+    WHERE role = 'caregiver' AND status = 'active' AND deleted_at IS NULL AND latitude IS NOT NULL;
+-- Users pending deletion; user-facing reads exclude them until they are purged
+CREATE INDEX idx_users_pending_deletion ON users(id) WHERE deleted_at IS NOT NULL;
+
 CREATE INDEX idx_care_requests_senior_citizen_id ON care_requests(senior_citizen_id);
 CREATE INDEX idx_care_requests_caregiver_id ON care_requests(caregiver_id);
 CREATE INDEX idx_care_requests_made_by ON care_requests(made_by);
 CREATE INDEX idx_care_requests_status ON care_requests(status);
+-- At most one pending/accepted request per (senior citizen, caregiver, requester).
+-- NULLS NOT DISTINCT so direct requests without a senior citizen are covered too
+CREATE UNIQUE INDEX uq_care_requests_active ON care_requests(senior_citizen_id, caregiver_id, made_by)
+    NULLS NOT DISTINCT WHERE status IN ('pending', 'accepted');
 
 CREATE INDEX idx_interest_groups_created_by ON interest_groups(created_by);
 CREATE INDEX idx_interest_groups_status ON interest_groups(status);
@@ -226,15 +344,277 @@ CREATE INDEX idx_group_members_user_id ON group_members(user_id);
 
 CREATE INDEX idx_tickets_user_id ON tickets(user_id);
 CREATE INDEX idx_tickets_assigned_to ON tickets(assigned_to);
-CREATE INDEX idx_tickets_status ON tickets(status);
+-- Escalation scans: one ordered range per (status, priority), oldest activity first
+CREATE INDEX idx_tickets_status_priority_updated_at ON tickets(status, priority, updated_at);
 
 CREATE INDEX idx_tickets_priority ON tickets(priority);
-CREATE INDEX idx_tickets_category ON tickets(category);
+-- Recent tickets of a category, for the duplicate check
+CREATE INDEX idx_tickets_category_created_at ON tickets(category, created_at);
+CREATE INDEX idx_tickets_search_text_trgm ON tickets USING gin (search_text gin_trgm_ops);
+-- Open workload per support user, for balanced assignment
+CREATE INDEX idx_tickets_open_assigned_to ON tickets(assigned_to)
+    WHERE status IN ('open', 'in_progress');
 CREATE INDEX idx_tickets_updated_at ON tickets(updated_at);
 
-CREATE INDEX idx_notifications_user_id ON notifications(user_id);
+-- Created on every partition: a user's notifications newest first
+CREATE INDEX idx_notifications_user_id_created_at ON notifications(user_id, created_at DESC);
 CREATE INDEX idx_notifications_type ON notifications(type);
-CREATE INDEX idx_notifications_is_read ON notifications(is_read);
+
+-- Change counters used to build HTTP ETags for rarely-changing listings.
+-- Each table's version is the SUM over a few shard rows so concurrent writers
+-- don't all queue on a single counter row.
+CREATE TABLE table_versions (
+    table_name VARCHAR(63) NOT NULL,
+    shard SMALLINT NOT NULL,
+    version BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (table_name, shard)
+);
+
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO table_versions (table_name, shard, version)
+    VALUES (TG_TABLE_NAME, pg_backend_pid() % 8, 1)
+    ON CONFLICT (table_name, shard) DO UPDATE SET version = table_versions.version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_users_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON users
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+CREATE TRIGGER trg_interest_groups_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON interest_groups
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+CREATE TRIGGER trg_group_members_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON group_members
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+-- Rejected care requests per (senior citizen, caregiver, requester), kept in step
+-- with care_requests so the three-rejections rule is a single row lookup.
+CREATE TABLE care_request_rejections (
+    senior_citizen_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    caregiver_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    made_by INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    rejected_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (senior_citizen_id, caregiver_id, made_by)
+);
+
+CREATE OR REPLACE FUNCTION track_care_request_rejections() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        IF OLD.status = 'rejected' AND OLD.senior_citizen_id IS NOT NULL THEN
+            UPDATE care_request_rejections SET rejected_count = rejected_count - 1
+            WHERE senior_citizen_id = OLD.senior_citizen_id
+              AND caregiver_id = OLD.caregiver_id
+              AND made_by = OLD.made_by;
+        END IF;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        IF NEW.status = 'rejected' AND NEW.senior_citizen_id IS NOT NULL THEN
+            INSERT INTO care_request_rejections (senior_citizen_id, caregiver_id, made_by, rejected_count)
+            VALUES (NEW.senior_citizen_id, NEW.caregiver_id, NEW.made_by, 1)
+            ON CONFLICT (senior_citizen_id, caregiver_id, made_by)
+            DO UPDATE SET rejected_count = care_request_rejections.rejected_count + 1;
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_care_request_rejections
+AFTER INSERT OR UPDATE OF status, senior_citizen_id, caregiver_id, made_by OR DELETE ON care_requests
+FOR EACH ROW EXECUTE FUNCTION track_care_request_rejections();
+
+-- Membership changes are counted as +1/-1 deltas in a few shard rows per group
+-- instead of updating the interest_groups row, so bursts of joins on a popular
+-- group don't serialize on one row lock. fold_group_member_counts() periodically
+-- moves the deltas into interest_groups.member_count.
+CREATE TABLE group_member_counts (
+    group_id INTEGER NOT NULL REFERENCES interest_groups(id) ON DELETE CASCADE,
+    shard SMALLINT NOT NULL,
+    delta INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (group_id, shard)
+);
+
+CREATE OR REPLACE FUNCTION track_group_member_count() RETURNS TRIGGER AS $$
+DECLARE
+    changed_group_id INTEGER;
+    change INTEGER;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changed_group_id := NEW.group_id;
+        change := 1;
+    ELSE
+        changed_group_id := OLD.group_id;
+        change := -1;
+    END IF;
+    -- Skip when the whole group is being deleted
+    IF EXISTS (SELECT 1 FROM interest_groups WHERE id = changed_group_id) THEN
+        INSERT INTO group_member_counts (group_id, shard, delta)
+        VALUES (changed_group_id, pg_backend_pid() % 8, change)
+        ON CONFLICT (group_id, shard) DO UPDATE SET delta = group_member_counts.delta + change;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_group_member_count
+AFTER INSERT OR DELETE ON group_members
+FOR EACH ROW EXECUTE FUNCTION track_group_member_count();
+
+-- Accurate member count: folded base plus pending shard deltas
+CREATE OR REPLACE FUNCTION current_member_count(p_group_id INTEGER, p_base INTEGER)
+RETURNS INTEGER AS $$
+    SELECT COALESCE(p_base, 0) + COALESCE(SUM(delta), 0)::INTEGER
+    FROM group_member_counts WHERE group_id = p_group_id
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION fold_group_member_counts() RETURNS INTEGER AS $$
+DECLARE
+    folded_groups INTEGER;
+BEGIN
+    WITH folded AS (
+        DELETE FROM group_member_counts RETURNING group_id, delta
+    ),
+    totals AS (
+        SELECT group_id, SUM(delta)::INTEGER AS total FROM folded GROUP BY group_id
+    )
+    UPDATE interest_groups ig
+    SET member_count = COALESCE(ig.member_count, 0) + totals.total
+    FROM totals
+    WHERE ig.id = totals.group_id AND totals.total <> 0;
+    GET DIAGNOSTICS folded_groups = ROW_COUNT;
+    RETURN folded_groups;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Monthly notification partitions (notifications_YYYY_MM). Partitions are created
+-- ahead of time by the maintenance job; a row that arrives before its month's
+-- partition exists lands in notifications_default and is moved when the
+-- partition is created. Retention detaches whole months instead of deleting rows.
+CREATE OR REPLACE FUNCTION ensure_notification_partitions(p_months_ahead INTEGER)
+RETURNS INTEGER AS $$
+DECLARE
+    month_start DATE;
+    month_end DATE;
+    partition_name TEXT;
+    created_count INTEGER := 0;
+BEGIN
+    FOR i IN 0..p_months_ahead LOOP
+        month_start := (date_trunc('month', CURRENT_DATE) + make_interval(months => i))::DATE;
+        month_end := (month_start + INTERVAL '1 month')::DATE;
+        partition_name := 'notifications_' || to_char(month_start, 'YYYY_MM');
+        CONTINUE WHEN to_regclass(partition_name) IS NOT NULL;
+
+        EXECUTE format(
+            'CREATE TABLE %I (LIKE notifications INCLUDING DEFAULTS)', partition_name
+        );
+        EXECUTE format(
+            'WITH moved AS (
+                 DELETE FROM notifications_default
+                 WHERE created_at >= %L AND created_at < %L
+                 RETURNING *
+             )
+             INSERT INTO %I SELECT * FROM moved',
+            month_start, month_end, partition_name
+        );
+        EXECUTE format(
+            'ALTER TABLE notifications ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+            partition_name, month_start, month_end
+        );
+        created_count := created_count + 1;
+    END LOOP;
+    RETURN created_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Removes monthly partitions that ended more than p_read_months ago once every
+-- notification in them is read, and those past p_unread_months regardless.
+-- With p_archive the partition is detached and renamed archived_<name> instead
+-- of dropped.
+CREATE OR REPLACE FUNCTION expire_notification_partitions(
+    p_read_months INTEGER, p_unread_months INTEGER, p_archive BOOLEAN
+) RETURNS INTEGER AS $$
+DECLARE
+    part RECORD;
+    current_month TIMESTAMP := date_trunc('month', CURRENT_DATE);
+    has_unread BOOLEAN;
+    expired_count INTEGER := 0;
+BEGIN
+    FOR part IN
+        SELECT c.relname, to_date(right(c.relname, 7), 'YYYY_MM') AS month_start
+        FROM pg_inherits inh
+        JOIN pg_class c ON c.oid = inh.inhrelid
+        WHERE inh.inhparent = 'notifications'::regclass
+          AND c.relname ~ '^notifications_\d{4}_\d{2}$'
+        ORDER BY c.relname
+    LOOP
+        CONTINUE WHEN part.month_start + make_interval(months => p_read_months + 1) > current_month;
+        IF part.month_start + make_interval(months => p_unread_months + 1) > current_month THEN
+            EXECUTE format(
+                'SELECT EXISTS (SELECT 1 FROM %I WHERE is_read IS NOT TRUE)', part.relname
+            ) INTO has_unread;
+            CONTINUE WHEN has_unread;
+        END IF;
+
+        EXECUTE format('ALTER TABLE notifications DETACH PARTITION %I', part.relname);
+        IF p_archive THEN
+            EXECUTE format('ALTER TABLE %I RENAME TO %I', part.relname, 'archived_' || part.relname);
+        ELSE
+            EXECUTE format('DROP TABLE %I', part.relname);
+        END IF;
+        expired_count := expired_count + 1;
+    END LOOP;
+    RETURN expired_count;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_notification_partitions(3);
+
+-- Video analysis queued by admin bulk imports, worked off by VideoAnalysisWorker
+CREATE TABLE video_analysis_jobs (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    youtube_url VARCHAR(500) NOT NULL,
+    attempts SMALLINT NOT NULL DEFAULT 0,
+    claimed_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Admin user deletions. The user is hidden as soon as users.deleted_at is set;
+-- UserPurger then removes their data in batches and records progress here.
+-- No foreign key on user_id: the row outlives the user.
+CREATE TABLE user_deletions (
+    user_id INTEGER PRIMARY KEY,
+    requested_by INTEGER REFERENCES users(id) ON DELETE SET NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',  -- pending, purging, completed
+    current_step VARCHAR(50),
+    rows_processed INTEGER NOT NULL DEFAULT 0,
+    tickets_reassigned INTEGER NOT NULL DEFAULT 0,
+    requested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP
+);
+CREATE INDEX idx_user_deletions_status ON user_deletions(status, requested_at);
+
+-- Responses to POST requests sent with an Idempotency-Key, replayed to retries.
+-- key_hash covers the key, caller's Firebase uid, method and path; request_hash
+-- the body.
+CREATE TABLE idempotency_keys (
+    key_hash CHAR(64) PRIMARY KEY,
+    request_hash CHAR(64) NOT NULL,
+    -- Request that holds the key; stale claims are taken over
+    owner VARCHAR(32) NOT NULL,
+    -- NULL while the first request is still running
+    status_code SMALLINT,
+    response_headers JSONB,
+    response_body BYTEA,
+    -- Renewed while the first request runs
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_idempotency_keys_created_at ON idempotency_keys(created_at);
 
 -- Insert story-based family relations
 INSERT INTO relations (senior_citizen_id, family_member_id, senior_citizen_relation, family_member_relation) VALUES
@@ -250,13 +630,13 @@ INSERT INTO tasks (title, description, time_of_completion, status, created_by, a
 
 -- Insert story-based interest groups (created by Mr. Verma)
 INSERT INTO interest_groups (title, description, whatsapp_link, category, status, timing, created_by, member_count) VALUES
-('Sunrise Walkers Club', 'Morning walking group for seniors in the neighborhood. Start your day with gentle exercise and friendly conversation.', 'https://chat.whatsapp.com/BQJVvF9M8B50Qj4xDf2a1z', 'Health', 'active', '2025-01-20 07:00:00', 6, 1),
+('Sunrise Walkers Club', 'Morning walking group for seniors in the neighborhood. Start your day with gentle exercise and friendly conversation.', 'https://chat.whatsapp.com/BQJVvF9M8B50Qj4xDf2a1z', 'Health', 'active', '2025-01-20 07:00:00', 6, 0),
 ('Laughter Yoga Club', 'Weekly laughter yoga sessions to boost mood and health. No experience needed, just bring your smile!', 'https://chat.whatsapp.com/CRKWwG0N9C61Rk5yEg3b2A', 'Health', 'active', '2025-01-22 16:00:00', 6, 0),
-('Garden Lovers Community', 'Share gardening tips, plant care advice, and seasonal growing guides. Perfect for those with green thumbs or aspiring gardeners.', 'https://chat.whatsapp.com/DSLXxH1O0D72Sl6zFh4c3B', 'Hobby', 'active', '2025-01-25 10:00:00', 6, 1),
+('Garden Lovers Community', 'Share gardening tips, plant care advice, and seasonal growing guides. Perfect for those with green thumbs or aspiring gardeners.', 'https://chat.whatsapp.com/DSLXxH1O0D72Sl6zFh4c3B', 'Hobby', 'active', '2025-01-25 10:00:00', 6, 0),
 ('Digital Learning Circle', 'Learn to use smartphones, tablets, and the internet safely. Weekly sessions covering WhatsApp, video calls, and online banking.', 'https://chat.whatsapp.com/ETMYyI2P1E83Tm7aGi5d4C', 'Technology', 'active', '2025-01-27 15:00:00', 6, 0),
 ('Book Club Enthusiasts', 'Monthly book discussions featuring classic literature and contemporary works. Share insights and make new friends through reading.', 'https://chat.whatsapp.com/FUNZzJ3Q2F94Un8bHj6e5D', 'Education', 'active', '2025-01-30 16:00:00', 6, 0);
 
--- Insert initial group members
+-- Insert initial group members (member_count is derived from these rows)
 INSERT INTO group_members (group_id, user_id) VALUES
 (1, 3), -- Asha joins Sunrise Walkers Club
 (3, 3); -- Asha joins Garden Lovers Community
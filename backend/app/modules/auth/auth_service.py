@@ -2,8 +2,10 @@ from typing import Optional, Tuple, Union
 
 import firebase_admin
 from app.config import settings
-from app.database.db import get_db_connection
+from app.database.db import get_db_connection, set_request_user
 from app.logger import logger
+from app.modules.cache.invalidation_bus import invalidation_bus
+from app.modules.cache.user_cache import user_cache
 from app.modules.youtube.youtube_processor import youtube_processor
 from app.payloads import (
     RegistrationRequest,
@@ -15,6 +17,13 @@ from app.payloads import (
 from firebase_admin import auth, credentials
 
 
+def initial_status(role: UserRole) -> UserStatus:
+    """Caregivers and interest group admins wait for admin approval."""
+    if role in [UserRole.CAREGIVER, UserRole.INTEREST_GROUP_ADMIN]:
+        return UserStatus.PENDING_APPROVAL
+    return UserStatus.ACTIVE
+
+
 class AuthService:
     def __init__(self):
         """Initialize Firebase Admin SDK (if not in test mode)."""
@@ -70,31 +79,8 @@ class AuthService:
             return test_auth_service.get_user_by_firebase_uid(firebase_uid)
 
         try:
-            with get_db_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute(
-                        """SELECT id, gmail_id, firebase_uid, full_name, role, status, youtube_url, date_of_birth, description, tags, created_at, updated_at
-                           FROM users WHERE firebase_uid = %s""",
-                        (firebase_uid,),
-                    )
-                    user_data = cur.fetchone()
-
-                    if user_data:
-                        return User(
-                            id=user_data[0],
-                            gmail_id=user_data[1],
-                            firebase_uid=user_data[2],
-                            full_name=user_data[3],
-                            role=user_data[4],
-                            status=user_data[5],
-                            youtube_url=user_data[6],
-                            date_of_birth=user_data[7],
-                            description=user_data[8],
-                            tags=user_data[9],
-                            created_at=user_data[10],
-                            updated_at=user_data[11],
-                        )
-                    return None
+            cached_user = user_cache.get_by_firebase_uid(firebase_uid)
+            return cached_user.to_user() if cached_user else None
         except Exception as e:
             logger.error(f"Error retrieving user: {e}")
             raise
@@ -115,7 +101,10 @@ class AuthService:
         if settings.TEST_MODE:
             from .test_auth_service import test_auth_service
 
-            return test_auth_service.authenticate_user(id_token)
+            user, is_registered = test_auth_service.authenticate_user(id_token)
+            if is_registered:
+                set_request_user(user.id)
+            return user, is_registered
 
         # Verify the token
         decoded_token = self.verify_id_token(id_token)
@@ -132,6 +121,7 @@ class AuthService:
 
         if existing_user:
             logger.info(f"Existing user found: {existing_user.gmail_id}")
+            set_request_user(existing_user.id)
             return existing_user, True
         else:
             # Return unregistered user info without creating in database
@@ -173,14 +163,7 @@ class AuthService:
         if existing_user:
             raise ValueError("User already registered")
 
-        # Determine status based on role
-        if registration_data.role in [
-            UserRole.CAREGIVER,
-            UserRole.INTEREST_GROUP_ADMIN,
-        ]:
-            user_status = UserStatus.PENDING_APPROVAL
-        else:
-            user_status = UserStatus.ACTIVE
+        user_status = initial_status(registration_data.role)
 
         # Process YouTube video for caregivers and interest group admins
         processed_tags = registration_data.tags
@@ -250,8 +233,9 @@ class AuthService:
             with get_db_connection() as conn:
                 with conn.cursor() as cur:
                     cur.execute(
-                        """INSERT INTO users (gmail_id, firebase_uid, full_name, role, status, youtube_url, date_of_birth, description, tags)
-                           VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                        """INSERT INTO users (gmail_id, firebase_uid, full_name, role, status, youtube_url, date_of_birth, description, tags,
+                                              latitude, longitude)
+                           VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                            RETURNING id, gmail_id, firebase_uid, full_name, role, status, youtube_url, date_of_birth, description, tags, created_at, updated_at""",
                         (
                             email,
@@ -263,29 +247,34 @@ class AuthService:
                             registration_data.date_of_birth,
                             processed_description,  # Use AI-processed description
                             processed_tags,  # Use AI-processed tags
+                            registration_data.latitude,
+                            registration_data.longitude,
                         ),
                     )
                     created_user = cur.fetchone()
-
-                    if created_user:
-                        logger.info(
-                            f"User registered with ID: {created_user[0]} with status: {user_status}"
-                        )
-                        return User(
-                            id=created_user[0],
-                            gmail_id=created_user[1],
-                            firebase_uid=created_user[2],
-                            full_name=created_user[3],
-                            role=created_user[4],
-                            status=created_user[5],
-                            youtube_url=created_user[6],
-                            date_of_birth=created_user[7],
-                            description=created_user[8],
-                            tags=created_user[9],
-                            created_at=created_user[10],
-                            updated_at=created_user[11],
-                        )
-                    raise Exception("Failed to register user")
+                    if not created_user:
+                        raise Exception("Failed to register user")
+                    # Clears any lookup another worker cached before the insert
+                    invalidation_bus.publish(cur, "users", created_user[0])
+
+            user_cache.invalidate(created_user[0])
+            logger.info(
+                f"User registered with ID: {created_user[0]} with status: {user_status}"
+            )
+            return User(
+                id=created_user[0],
+                gmail_id=created_user[1],
+                firebase_uid=created_user[2],
+                full_name=created_user[3],
+                role=created_user[4],
+                status=created_user[5],
+                youtube_url=created_user[6],
+                date_of_birth=created_user[7],
+                description=created_user[8],
+                tags=created_user[9],
+                created_at=created_user[10],
+                updated_at=created_user[11],
+            )
         except Exception as e:
             logger.error(f"Error registering user: {e}")
             raise
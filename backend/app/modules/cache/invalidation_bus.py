@@ -0,0 +1,128 @@
+import json
+import select
+import threading
+from collections import defaultdict
+
+import psycopg2
+from app.config import settings
+from app.logger import logger
+
+CHANNEL = "cache_invalidation"
+KEEPALIVE_SECONDS = 30.0
+
+
+class InvalidationBus:
+    """
+    Cross-worker cache invalidation over Postgres LISTEN/NOTIFY.
+
+    Writers call publish() with their open cursor, so the event is delivered
+    only if (and when) their transaction commits. Each worker keeps one
+    dedicated listening connection in a background thread and dispatches
+    events to the callbacks subscribed for the entity. Callbacks receive the
+    affected ids; no ids means "drop everything for this entity", which is also
+    what every callback gets after (re)connecting, since events may have been
+    missed while disconnected.
+    """
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self._callbacks = defaultdict(list)
+        self._thread = None
+        self._stop = threading.Event()
+
+    def subscribe(self, entity, callback):
+        self._callbacks[entity].append(callback)
+
+    def publish(self, cur, entity, *ids):
+        payload = json.dumps({"entity": entity, "ids": list(ids)})
+        cur.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+
+    def publish_if_written(self, cur, entity, *ids) -> bool:
+        """publish(), but only if the current transaction has written anything."""
+        payload = json.dumps({"entity": entity, "ids": list(ids)})
+        cur.execute(
+            """SELECT pg_notify(%s, %s)
+               WHERE txid_current_if_assigned() IS NOT NULL""",
+            (self.channel, payload),
+        )
+        return cur.rowcount > 0
+
+    def start(self):
+        if not settings.CACHE_INVALIDATION_BUS or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._listen_forever, name="cache-invalidation", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _listen_forever(self):
+        backoff = 1.0
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(settings.DATABASE_URL)
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {self.channel}")
+                logger.info("Cache invalidation listener connected")
+                backoff = 1.0
+                self._flush_all()
+                self._poll(conn)
+            except Exception as e:
+                logger.warning(
+                    f"Cache invalidation listener disconnected: {e}; "
+                    f"reconnecting in {backoff:.0f}s"
+                )
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if conn is not None and not conn.closed:
+                    conn.close()
+
+    def _poll(self, conn):
+        idle = 0.0
+        while not self._stop.is_set():
+            if select.select([conn], [], [], 1.0) == ([], [], []):
+                idle += 1.0
+                if idle >= KEEPALIVE_SECONDS:
+                    # Surfaces half-open connections that would never deliver again
+                    with conn.cursor() as cur:
+                        cur.execute("SELECT 1")
+                    idle = 0.0
+                continue
+            idle = 0.0
+            conn.poll()
+            while conn.notifies:
+                self._dispatch(conn.notifies.pop(0).payload)
+
+    def _dispatch(self, payload):
+        try:
+            event = json.loads(payload)
+            entity, ids = event["entity"], event.get("ids") or []
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed invalidation event: {payload!r}")
+            return
+        for callback in self._callbacks.get(entity, []):
+            try:
+                callback(*ids)
+            except Exception as e:
+                logger.error(f"Invalidation callback for {entity} failed: {e}")
+
+    def _flush_all(self):
+        for entity, callbacks in list(self._callbacks.items()):
+            for callback in callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"Invalidation flush for {entity} failed: {e}")
+
+
+# Singleton instance
+invalidation_bus = InvalidationBus(channel=CHANNEL)
@@ -0,0 +1,100 @@
+import threading
+import time
+from contextvars import ContextVar
+from typing import NamedTuple, Optional
+
+from app.config import settings
+from app.database.prepared import execute_prepared
+from app.logger import logger
+from app.modules.cache.invalidation_bus import invalidation_bus
+
+# Per-request {"hits": n, "loads": n}, set up by the relation_cache_stats middleware
+_request_stats = ContextVar("relation_cache_request_stats", default=None)
+
+
+class UserLinks(NamedTuple):
+    senior_citizen_ids: frozenset  # Seniors this user is a family member of
+    family_member_ids: frozenset  # Family members linked to this senior
+    primary_senior_citizen_id: Optional[int]  # Senior from the oldest relation
+    loaded_at: float
+
+
+class RelationCache:
+    """
+    In-process cache of the family/senior relationship graph, keyed by user id.
+    Each entry is loaded with one relations query and never mutated; writes
+    invalidate the affected users here and, through the invalidation bus
+    ("relations" events), in other workers. Entries also expire after a TTL.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_links(self, cur, user_id) -> UserLinks:
+        entry = self._entries.get(user_id)
+        if entry is not None and time.monotonic() - entry.loaded_at < self.ttl:
+            _count("hits")
+            return entry
+
+        generation = self._generation
+        execute_prepared(
+            cur,
+            """SELECT senior_citizen_id, family_member_id FROM relations
+               WHERE family_member_id = %s OR senior_citizen_id = %s
+               ORDER BY id""",
+            (user_id, user_id),
+        )
+        rows = cur.fetchall()
+        _count("loads")
+
+        seniors = [sc for sc, fm in rows if fm == user_id]
+        entry = UserLinks(
+            senior_citizen_ids=frozenset(seniors),
+            family_member_ids=frozenset(fm for sc, fm in rows if sc == user_id),
+            primary_senior_citizen_id=seniors[0] if seniors else None,
+            loaded_at=time.monotonic(),
+        )
+        with self._lock:
+            # Don't store a result that was loaded before an invalidation
+            if generation == self._generation:
+                self._entries[user_id] = entry
+        return entry
+
+    def is_linked(self, cur, family_member_id, senior_citizen_id) -> bool:
+        """Whether family_member_id is linked to senior_citizen_id."""
+        links = self.get_links(cur, family_member_id)
+        return senior_citizen_id in links.senior_citizen_ids
+
+    def primary_senior_citizen(self, cur, family_member_id) -> Optional[int]:
+        return self.get_links(cur, family_member_id).primary_senior_citizen_id
+
+    def invalidate(self, *user_ids):
+        """Drop the given users' entries, or every entry when none are given."""
+        with self._lock:
+            self._generation += 1
+            if not user_ids:
+                self._entries.clear()
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+        logger.info(f"Relation cache invalidated: {list(user_ids) or 'all'}")
+
+
+def _count(key):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats[key] += 1
+
+
+def track_relation_lookups():
+    """Start counting relation cache hits and loads for this request."""
+    stats = {"hits": 0, "loads": 0}
+    _request_stats.set(stats)
+    return stats
+
+
+# Singleton instance
+relation_cache = RelationCache(ttl=settings.RELATION_CACHE_TTL_SECONDS)
+invalidation_bus.subscribe("relations", relation_cache.invalidate)
@@ -0,0 +1,118 @@
+import asyncio
+import time
+
+from app.config import settings
+from app.logger import logger
+from app.utils.compression import choose_encoding, compress, supported_encodings
+from app.utils.http_cache import is_not_modified, not_modified_response
+from fastapi.responses import Response
+
+
+class CachedResponse:
+    """
+    A fully rendered response body, stored plain and (when large enough)
+    pre-compressed in every supported encoding so hits never recompress.
+    """
+
+    __slots__ = ("status_code", "body", "encoded_bodies", "etag", "created_at")
+
+    def __init__(self, status_code: int, body: bytes, etag: str):
+        self.status_code = status_code
+        self.body = body
+        self.encoded_bodies = {}
+        if len(body) >= settings.COMPRESSION_MIN_SIZE:
+            self.encoded_bodies = {
+                encoding: compress(body, encoding) for encoding in supported_encodings()
+            }
+        self.etag = etag
+        self.created_at = time.monotonic()
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.monotonic() - self.created_at < ttl
+
+    def to_response(self, request, cache_control: str) -> Response:
+        if is_not_modified(request, self.etag):
+            return not_modified_response(self.etag, cache_control)
+
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        body = self.body
+        encoding = choose_encoding(request.headers.get("Accept-Encoding", ""))
+        if encoding in self.encoded_bodies:
+            headers["Content-Encoding"] = encoding
+            body = self.encoded_bodies[encoding]
+        return Response(
+            content=body,
+            status_code=self.status_code,
+            media_type="application/json",
+            headers=headers,
+        )
+
+
+class ResponseCache:
+    """
+    In-process cache of rendered responses with a TTL and explicit invalidation.
+    Concurrent misses for the same key share a single load (single-flight).
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries = {}
+        self._inflight = {}
+        self._generation = 0
+
+    async def get_or_load(self, key, loader) -> CachedResponse:
+        """
+        Return the cached entry for key, or run loader (a blocking function
+        returning a CachedResponse) in a worker thread to build it.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry.is_fresh(self.ttl):
+            return entry
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+            # The leading request was cancelled before its load finished
+            return await self.get_or_load(key, loader)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            entry = await asyncio.to_thread(loader)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark as retrieved when nobody else is waiting
+            raise
+        else:
+            # Don't store a result that was loaded before an invalidation
+            if generation == self._generation:
+                self._entries[key] = entry
+            future.set_result(entry)
+            return entry
+        finally:
+            self._inflight.pop(key, None)
+            if not future.done():
+                # Cancelled (e.g. client disconnect): release the waiters
+                future.cancel()
+
+    def invalidate(self, key=None):
+        """Drop one key, or every entry when key is None."""
+        self._generation += 1
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+        logger.info(f"Response cache invalidated: {key or 'all'}")
+
+
+# Singleton instance
+response_cache = ResponseCache(ttl=settings.RESPONSE_CACHE_TTL_SECONDS)
@@ -0,0 +1,160 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+from app.config import settings
+from app.database.db import get_db_connection
+from app.database.prepared import execute_prepared
+from app.logger import logger
+from app.modules.cache.invalidation_bus import invalidation_bus
+from app.payloads import User, UserRole, UserStatus
+
+USER_COLUMNS = (
+    "id",
+    "gmail_id",
+    "firebase_uid",
+    "full_name",
+    "role",
+    "status",
+    "youtube_url",
+    "date_of_birth",
+    "description",
+    "tags",
+    "created_at",
+    "updated_at",
+)
+# Users pending deletion no longer resolve, so they can't authenticate
+_SELECT_USERS = f"SELECT {', '.join(USER_COLUMNS)} FROM users WHERE deleted_at IS NULL"
+
+
+class CachedUser:
+    """Compact, read-only copy of a users row."""
+
+    __slots__ = USER_COLUMNS + ("loaded_at",)
+
+    def __init__(self, row):
+        for name, value in zip(USER_COLUMNS, row):
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, "role", UserRole(self.role))
+        object.__setattr__(self, "status", UserStatus(self.status))
+        object.__setattr__(self, "loaded_at", time.monotonic())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CachedUser is read-only")
+
+    def to_user(self) -> User:
+        # Fields were validated when the row was cached
+        return User.model_construct(
+            **{name: getattr(self, name) for name in USER_COLUMNS}
+        )
+
+
+class UserIdentityMap:
+    """
+    Bounded in-process identity map of users, keyed by id and by firebase_uid.
+    Entries are evicted least-recently-used and expire after a TTL; registration,
+    status changes and deletions invalidate them here and, through the
+    invalidation bus ("users" events), in other workers.
+
+    Lookups take an open cursor when the caller already holds a connection;
+    otherwise a connection is only checked out on a miss.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._by_id = OrderedDict()
+        self._id_by_uid = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, user_id, cur=None) -> Optional[CachedUser]:
+        return self.get_many([user_id], cur).get(user_id)
+
+    def get_many(self, user_ids: Iterable[int], cur=None) -> Dict[int, CachedUser]:
+        """Resolve ids to users, loading every miss with a single query."""
+        found = {}
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            entry = self._lookup(user_id)
+            if entry is None:
+                missing.append(user_id)
+            else:
+                found[user_id] = entry
+        if missing:
+            rows = self._load(cur, f"{_SELECT_USERS} AND id = ANY(%s)", (missing,))
+            found.update((entry.id, entry) for entry in rows)
+        return found
+
+    def get_by_firebase_uid(self, firebase_uid, cur=None) -> Optional[CachedUser]:
+        user_id = self._id_by_uid.get(firebase_uid)
+        if user_id is not None:
+            entry = self._lookup(user_id)
+            if entry is not None:
+                return entry
+        rows = self._load(
+            cur, f"{_SELECT_USERS} AND firebase_uid = %s", (firebase_uid,)
+        )
+        return rows[0] if rows else None
+
+    def invalidate(self, *user_ids):
+        """Drop the given users' entries, or every entry when none are given."""
+        with self._lock:
+            self._generation += 1
+            if not user_ids:
+                self._by_id.clear()
+                self._id_by_uid.clear()
+            for user_id in user_ids:
+                self._discard(user_id)
+        logger.info(f"User cache invalidated: {list(user_ids) or 'all'}")
+
+    def _lookup(self, user_id) -> Optional[CachedUser]:
+        entry = self._by_id.get(user_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.loaded_at >= self.ttl:
+            with self._lock:
+                if self._by_id.get(user_id) is entry:
+                    self._discard(user_id)
+            return None
+        with self._lock:
+            if user_id in self._by_id:
+                self._by_id.move_to_end(user_id)
+        return entry
+
+    def _load(self, cur, query, params):
+        if cur is None:
+            with get_db_connection() as conn:
+                with conn.cursor() as own_cur:
+                    return self._load(own_cur, query, params)
+
+        generation = self._generation
+        execute_prepared(cur, query, params)
+        entries = [CachedUser(row) for row in cur.fetchall()]
+        with self._lock:
+            # Don't store results that were loaded before an invalidation
+            if generation == self._generation:
+                for entry in entries:
+                    self._store(entry)
+        return entries
+
+    def _store(self, entry):
+        self._discard(entry.id)
+        self._by_id[entry.id] = entry
+        self._id_by_uid[entry.firebase_uid] = entry.id
+        while len(self._by_id) > self.max_size:
+            _, evicted = self._by_id.popitem(last=False)
+            self._id_by_uid.pop(evicted.firebase_uid, None)
+
+    def _discard(self, user_id):
+        entry = self._by_id.pop(user_id, None)
+        if entry is not None:
+            self._id_by_uid.pop(entry.firebase_uid, None)
+
+
+# Singleton instance
+user_cache = UserIdentityMap(
+    ttl=settings.USER_CACHE_TTL_SECONDS, max_size=settings.USER_CACHE_MAX_SIZE
+)
+invalidation_bus.subscribe("users", user_cache.invalidate)
@@ -0,0 +1,99 @@
+import math
+from typing import List, Optional
+
+from app.payloads import UserRole, UserStatus
+
+KM_PER_DEGREE = 111.32
+EARTH_RADIUS_KM = 6371.0
+DEFAULT_RADIUS_KM = 10.0
+MAX_RADIUS_KM = 200.0
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# Must match idx_users_caregiver_location's expression and predicate
+NEARBY_CAREGIVERS = """
+    SELECT id, full_name, description, tags, youtube_url, distance_km
+    FROM (
+        SELECT u.id, u.full_name, u.description, u.tags, u.youtube_url,
+               2 * %(earth_radius)s * asin(sqrt(
+                   power(sin(radians(u.latitude - %(lat)s) / 2), 2)
+                   + cos(radians(%(lat)s)) * cos(radians(u.latitude))
+                     * power(sin(radians(u.longitude - %(lng)s) / 2), 2)
+               )) AS distance_km
+        FROM users u
+        WHERE u.role = %(role)s AND u.status = %(status)s
+          AND u.deleted_at IS NULL AND u.latitude IS NOT NULL
+          AND point(u.longitude, u.latitude)
+              <@ box(point(%(min_lng)s, %(min_lat)s), point(%(max_lng)s, %(max_lat)s))
+          {tags_filter}
+    ) candidates
+    WHERE distance_km <= %(radius_km)s
+    ORDER BY distance_km, id
+    LIMIT %(limit)s
+"""
+
+TAGS_FILTER = """AND EXISTS (
+              SELECT 1 FROM unnest(string_to_array(lower(u.tags), ',')) AS tag
+              WHERE trim(tag) = ANY(%(tags)s))"""
+
+
+def bounding_box(lat: float, lng: float, radius_km: float):
+    """(min_lat, min_lng, max_lat, max_lng) enclosing the search circle."""
+    lat_delta = radius_km / KM_PER_DEGREE
+    # Longitude degrees shrink towards the poles; clamp so the box stays finite
+    lng_delta = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+    # Searches across the antimeridian are cut off at +/-180
+    return (
+        max(lat - lat_delta, -90.0),
+        max(lng - lng_delta, -180.0),
+        min(lat + lat_delta, 90.0),
+        min(lng + lng_delta, 180.0),
+    )
+
+
+def find_nearby_caregivers(
+    cur,
+    lat: float,
+    lng: float,
+    radius_km: float = DEFAULT_RADIUS_KM,
+    tags: Optional[List[str]] = None,
+    limit: int = DEFAULT_LIMIT,
+):
+    """
+    The `limit` active caregivers closest to (lat, lng) within radius_km,
+    nearest first, optionally only those with one of the given tags.
+
+    The GiST index narrows the search to the circle's bounding box; exact
+    great-circle distances are only computed for caregivers inside it.
+    """
+    min_lat, min_lng, max_lat, max_lng = bounding_box(lat, lng, radius_km)
+    params = {
+        "earth_radius": EARTH_RADIUS_KM,
+        "lat": lat,
+        "lng": lng,
+        "role": UserRole.CAREGIVER.value,
+        "status": UserStatus.ACTIVE.value,
+        "min_lat": min_lat,
+        "min_lng": min_lng,
+        "max_lat": max_lat,
+        "max_lng": max_lng,
+        "radius_km": radius_km,
+        "limit": limit,
+    }
+    tags_filter = ""
+    if tags:
+        tags_filter = TAGS_FILTER
+        params["tags"] = [tag.strip().lower() for tag in tags]
+
+    cur.execute(NEARBY_CAREGIVERS.format(tags_filter=tags_filter), params)
+    return [
+        {
+            "id": row[0],
+            "full_name": row[1],
+            "description": row[2],
+            "tags": row[3],
+            "youtube_url": row[4],
+            "distance_km": round(row[5], 2),
+        }
+        for row in cur.fetchall()
+    ]
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from app.payloads import UserRole, UserStatus
+
+# Bounds of one availability query
+MAX_AVAILABILITY_WINDOW = timedelta(days=31)
+MAX_AVAILABILITY_CAREGIVERS = 200
+
+CONFLICT_MESSAGE = "The caregiver already has an accepted visit overlapping this time."
+
+
+def find_conflicting_visit(cur, request_id) -> Optional[Tuple[datetime, datetime]]:
+    """
+    (start, end) of an accepted visit of the same caregiver that overlaps the
+    given request's visit, if any. A probe of the exclusion constraint's GiST
+    index; the constraint itself still catches concurrent acceptances.
+    """
+    cur.execute(
+        """SELECT lower(other.visit_period), upper(other.visit_period)
+           FROM care_requests cr
+           JOIN care_requests other
+               ON other.caregiver_id = cr.caregiver_id
+               AND other.status = 'accepted'
+               AND other.visit_period && cr.visit_period
+               AND other.id <> cr.id
+           WHERE cr.id = %s
+           LIMIT 1""",
+        (request_id,),
+    )
+    return cur.fetchone()
+
+
+def parse_availability_query(query_params) -> Tuple[datetime, datetime, List[int]]:
+    """Raises ValueError for a missing, inverted or overlong range or bad ids."""
+    start = datetime.fromisoformat(query_params.get("start", "")).replace(tzinfo=None)
+    end = datetime.fromisoformat(query_params.get("end", "")).replace(tzinfo=None)
+    if start >= end or end - start > MAX_AVAILABILITY_WINDOW:
+        raise ValueError("Invalid time range")
+    caregiver_ids = [
+        int(value)
+        for value in query_params.get("caregiver_ids", "").split(",")
+        if value.strip()
+    ]
+    if len(caregiver_ids) > MAX_AVAILABILITY_CAREGIVERS:
+        raise ValueError("Too many caregivers")
+    return start, end, caregiver_ids
+
+
+def fetch_availability(cur, start: datetime, end: datetime, caregiver_ids=None):
+    """
+    Free/busy of active caregivers (all of them, or the given ids) between
+    start and end: one GiST range scan per caregiver over accepted visits,
+    aggregated in the database.
+    """
+    caregiver_filter = ""
+    params = [start, end, UserRole.CAREGIVER.value, UserStatus.ACTIVE.value]
+    if caregiver_ids:
+        caregiver_filter = " AND u.id = ANY(%s)"
+        params.append(caregiver_ids)
+
+    cur.execute(
+        f"""SELECT u.id, u.full_name,
+                   COALESCE(
+                       json_agg(
+                           json_build_object(
+                               'start', lower(cr.visit_period),
+                               'end', upper(cr.visit_period)
+                           ) ORDER BY lower(cr.visit_period)
+                       ) FILTER (WHERE cr.id IS NOT NULL),
+                       '[]'
+                   )
+            FROM users u
+            LEFT JOIN care_requests cr
+                ON cr.caregiver_id = u.id
+                AND cr.status = 'accepted'
+                AND cr.visit_period && tsrange(%s, %s)
+            WHERE u.role = %s AND u.status = %s AND u.deleted_at IS NULL{caregiver_filter}
+            GROUP BY u.id, u.full_name
+            ORDER BY u.id""",
+        tuple(params),
+    )
+    return [
+        {
+            "caregiver_id": caregiver_id,
+            "full_name": full_name,
+            "free": not busy,
+            "busy": busy,
+        }
+        for caregiver_id, full_name, busy in cur.fetchall()
+    ]
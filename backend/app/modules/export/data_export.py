@@ -0,0 +1,177 @@
+import csv
+import io
+import json
+from contextlib import ExitStack
+from datetime import date, datetime
+from typing import Iterator, List, NamedTuple, Tuple
+
+from app.config import settings
+from app.database.db import get_export_connection
+
+
+class ExportSpec(NamedTuple):
+    query: str
+    columns: Tuple[str, ...]
+    # query parameter -> (SQL expression, parser)
+    filters: dict
+
+
+# Names of soft-deleted users are left empty; their rows remain until purged
+EXPORTS = {
+    "users": ExportSpec(
+        query="""SELECT id, gmail_id, full_name, role, status, created_at
+                 FROM users WHERE deleted_at IS NULL""",
+        columns=("id", "gmail_id", "full_name", "role", "status", "created_at"),
+        filters={
+            "role": ("role::text", str),
+            "status": ("status::text", str),
+        },
+    ),
+    "tickets": ExportSpec(
+        query="""SELECT
+                     t.id, t.user_id, t.assigned_to, t.subject, t.description,
+                     t.priority, t.category, t.status, t.created_at, t.updated_at,
+                     t.resolved_at, u1.full_name, u2.full_name
+                 FROM tickets t
+                 LEFT JOIN users u1 ON t.user_id = u1.id AND u1.deleted_at IS NULL
+                 LEFT JOIN users u2 ON t.assigned_to = u2.id AND u2.deleted_at IS NULL
+                 WHERE 1=1""",
+        columns=(
+            "id",
+            "user_id",
+            "assigned_to",
+            "subject",
+            "description",
+            "priority",
+            "category",
+            "status",
+            "created_at",
+            "updated_at",
+            "resolved_at",
+            "created_by_name",
+            "assigned_to_name",
+        ),
+        filters={
+            "status": ("t.status::text", str),
+            "priority": ("t.priority::text", str),
+            "assigned_to": ("t.assigned_to", int),
+        },
+    ),
+    "care-requests": ExportSpec(
+        query="""SELECT
+                     cr.id, cr.senior_citizen_id, sc.full_name, cr.caregiver_id,
+                     cg.full_name, cr.made_by, u.full_name, cr.status,
+                     cr.timing_to_visit, cr.location, cr.created_at, cr.updated_at
+                 FROM care_requests cr
+                 LEFT JOIN users sc ON cr.senior_citizen_id = sc.id AND sc.deleted_at IS NULL
+                 LEFT JOIN users cg ON cr.caregiver_id = cg.id AND cg.deleted_at IS NULL
+                 LEFT JOIN users u ON cr.made_by = u.id AND u.deleted_at IS NULL
+                 WHERE 1=1""",
+        columns=(
+            "id",
+            "senior_citizen_id",
+            "senior_citizen_name",
+            "caregiver_id",
+            "caregiver_name",
+            "made_by",
+            "requester_name",
+            "status",
+            "timing_to_visit",
+            "location",
+            "created_at",
+            "updated_at",
+        ),
+        filters={
+            "status": ("cr.status::text", str),
+            "caregiver_id": ("cr.caregiver_id", int),
+            "senior_citizen_id": ("cr.senior_citizen_id", int),
+            "made_by": ("cr.made_by", int),
+        },
+    ),
+}
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def build_export_query(entity: str, query_params) -> Tuple[str, List]:
+    """Raises KeyError for unknown entities and ValueError for bad filters."""
+    spec = EXPORTS[entity]
+    query = spec.query
+    params = []
+    for name, (expression, parse) in spec.filters.items():
+        value = query_params.get(name)
+        if value:
+            query += f" AND {expression} = %s"
+            params.append(parse(value))
+    # Primary key order keeps the scan cheap and the output stable
+    query += " ORDER BY 1"
+    return query, params
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _encode_csv(columns, rows, header) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    writer.writerows([_plain(v) for v in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+def _encode_ndjson(columns, rows, header) -> bytes:
+    lines = (
+        json.dumps({c: _plain(v) for c, v in zip(columns, row)}, default=str)
+        for row in rows
+    )
+    return "".join(line + "\n" for line in lines).encode()
+
+
+class ExportStream:
+    """
+    The export in chunks of EXPORT_ITERSIZE rows, each fetched from a
+    server-side (named) cursor, so memory use does not grow with the table.
+    It reads on a dedicated connection rather than a pooled one, since the
+    download runs at the client's pace.
+
+    The connection is opened and the first chunk fetched on construction, so
+    a missing export slot (pool.PoolError) or a failing query raises before
+    any response is sent. Iterating is sync; StreamingResponse runs it in the
+    threadpool. close() releases the connection and is safe to call twice.
+    """
+
+    def __init__(self, entity: str, query: str, params, fmt: str):
+        self.columns = EXPORTS[entity].columns
+        self.encode = _encode_csv if fmt == "csv" else _encode_ndjson
+        self._stack = ExitStack()
+        try:
+            conn = self._stack.enter_context(get_export_connection())
+            self._cur = self._stack.enter_context(
+                conn.cursor(name=f"export_{entity.replace('-', '_')}")
+            )
+            self._cur.execute(query, params)
+            self._first = self._cur.fetchmany(settings.EXPORT_ITERSIZE)
+        except BaseException:
+            self._stack.close()
+            raise
+
+    def __iter__(self) -> Iterator[bytes]:
+        try:
+            rows = self._first
+            yield self.encode(self.columns, rows, True)
+            while rows:
+                rows = self._cur.fetchmany(settings.EXPORT_ITERSIZE)
+                if rows:
+                    yield self.encode(self.columns, rows, False)
+        finally:
+            self.close()
+
+    def close(self):
+        self._stack.close()
@@ -0,0 +1,151 @@
+import json
+from typing import NamedTuple, Optional
+
+from app.config import settings
+from app.database.db import get_db_connection
+from app.logger import logger
+from app.utils.periodic import PeriodicWorker
+
+PURGE_INTERVAL = 3600.0
+PURGE_BATCH_SIZE = 1000
+
+# Takes the key unless someone holds it. An expired entry, or an unfinished one
+# whose claim was not renewed for IDEMPOTENCY_LOCK_TIMEOUT (the worker died),
+# is taken over.
+CLAIM = """
+    INSERT INTO idempotency_keys (key_hash, request_hash, owner)
+    VALUES (%(key_hash)s, %(request_hash)s, %(owner)s)
+    ON CONFLICT (key_hash) DO UPDATE
+    SET request_hash = EXCLUDED.request_hash,
+        owner = EXCLUDED.owner,
+        status_code = NULL,
+        response_headers = NULL,
+        response_body = NULL,
+        created_at = CURRENT_TIMESTAMP
+    WHERE idempotency_keys.created_at < LOCALTIMESTAMP - %(ttl)s::interval
+       OR (idempotency_keys.status_code IS NULL
+           AND idempotency_keys.created_at < LOCALTIMESTAMP - %(lock_timeout)s::interval)
+    RETURNING owner
+"""
+
+
+class StoredResponse(NamedTuple):
+    request_hash: str
+    # None while the first request is still running
+    status_code: Optional[int]
+    headers: Optional[list]
+    body: Optional[bytes]
+
+
+def _params(**params):
+    return {
+        "ttl": f"{settings.IDEMPOTENCY_KEY_TTL_HOURS} hours",
+        "lock_timeout": f"{settings.IDEMPOTENCY_LOCK_TIMEOUT} seconds",
+        **params,
+    }
+
+
+def claim_key(key_hash: str, request_hash: str, owner: str) -> bool:
+    """Register a request under key_hash; False if another one already holds it."""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                CLAIM,
+                _params(key_hash=key_hash, request_hash=request_hash, owner=owner),
+            )
+            return cur.fetchone() is not None
+
+
+def renew_claim(key_hash: str, owner: str) -> bool:
+    """Mark an unfinished claim as alive; False once it is no longer ours."""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """UPDATE idempotency_keys SET created_at = CURRENT_TIMESTAMP
+                   WHERE key_hash = %s AND owner = %s AND status_code IS NULL""",
+                (key_hash, owner),
+            )
+            return cur.rowcount > 0
+
+
+def get_stored_response(key_hash: str) -> Optional[StoredResponse]:
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """SELECT request_hash, status_code, response_headers, response_body
+                   FROM idempotency_keys
+                   WHERE key_hash = %(key_hash)s
+                     AND created_at >= LOCALTIMESTAMP - %(ttl)s::interval""",
+                _params(key_hash=key_hash),
+            )
+            row = cur.fetchone()
+    if row is None:
+        return None
+    request_hash, status_code, headers, body = row
+    return StoredResponse(
+        request_hash, status_code, headers, bytes(body) if body is not None else None
+    )
+
+
+def store_response(key_hash: str, owner: str, status_code: int, headers, body):
+    """Save the response for replays, unless the key was taken over meanwhile."""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """UPDATE idempotency_keys
+                   SET status_code = %s, response_headers = %s, response_body = %s
+                   WHERE key_hash = %s AND owner = %s""",
+                (status_code, json.dumps(headers), body, key_hash, owner),
+            )
+
+
+def release_key(key_hash: str, owner: str):
+    """Drop an unfinished claim so the next retry runs the request again."""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """DELETE FROM idempotency_keys
+                   WHERE key_hash = %s AND owner = %s AND status_code IS NULL""",
+                (key_hash, owner),
+            )
+
+
+class IdempotencyKeyPurger(PeriodicWorker):
+    """Deletes expired idempotency keys in small batches, hourly."""
+
+    job = "purging idempotency keys"
+
+    def __init__(self, interval: float, batch_size: int):
+        super().__init__(interval)
+        self.batch_size = batch_size
+
+    def purge_batch(self) -> int:
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """DELETE FROM idempotency_keys WHERE key_hash IN (
+                           SELECT key_hash FROM idempotency_keys
+                           WHERE created_at < LOCALTIMESTAMP - %(ttl)s::interval
+                           LIMIT %(batch)s)""",
+                    _params(batch=self.batch_size),
+                )
+                return cur.rowcount
+
+    def purge(self) -> int:
+        purged = 0
+        while True:
+            count = self.purge_batch()
+            purged += count
+            if count < self.batch_size:
+                return purged
+
+    def run_once(self):
+        purged = self.purge()
+        if purged:
+            logger.info(f"Purged {purged} expired idempotency key(s)")
+
+
+# Singleton instance
+idempotency_key_purger = IdempotencyKeyPurger(
+    interval=PURGE_INTERVAL, batch_size=PURGE_BATCH_SIZE
+)
@@ -0,0 +1,32 @@
+from app.config import settings
+from app.database.db import get_db_connection
+from app.logger import logger
+from app.utils.periodic import PeriodicWorker
+
+
+class MemberCountFolder(PeriodicWorker):
+    """
+    Periodically folds the sharded group_member_counts deltas into
+    interest_groups.member_count so the shard rows stay few and reads stay cheap.
+    Reads are accurate at all times via current_member_count(); folding only
+    compacts. Safe to run in every worker: each delta row is deleted once.
+    """
+
+    job = "folding group member counts"
+
+    def fold(self) -> int:
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT fold_group_member_counts()")
+                return cur.fetchone()[0]
+
+    def run_once(self):
+        folded = self.fold()
+        if folded:
+            logger.info(f"Folded member count deltas for {folded} group(s)")
+
+
+# Singleton instance
+member_count_folder = MemberCountFolder(
+    interval=settings.GROUP_MEMBER_COUNT_FOLD_INTERVAL
+)
@@ -0,0 +1,57 @@
+from app.config import settings
+from app.database.db import get_db_connection
+from app.logger import logger
+from app.utils.periodic import PeriodicWorker
+
+# Serializes maintenance across workers; any constant unique to this job works
+MAINTENANCE_LOCK_ID = 4210
+
+
+class NotificationPartitionMaintainer(PeriodicWorker):
+    """
+    Keeps the monthly notifications partitions in shape: creates the next few
+    months ahead of time and expires old months by detaching them, so neither
+    inserts nor retention ever touch more than one partition's metadata.
+    Runs at startup and then periodically; only one worker does the DDL at a
+    time (transaction-scoped advisory lock), the others skip that round.
+    """
+
+    job = "maintaining notification partitions"
+    run_at_start = True
+
+    def maintain(self):
+        """Returns (partitions created, partitions expired), or None if skipped."""
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT pg_try_advisory_xact_lock(%s)", (MAINTENANCE_LOCK_ID,)
+                )
+                if not cur.fetchone()[0]:
+                    return None
+                cur.execute(
+                    "SELECT ensure_notification_partitions(%s)",
+                    (settings.NOTIFICATION_PARTITIONS_AHEAD,),
+                )
+                created = cur.fetchone()[0]
+                cur.execute(
+                    "SELECT expire_notification_partitions(%s, %s, %s)",
+                    (
+                        settings.NOTIFICATION_RETENTION_MONTHS,
+                        settings.NOTIFICATION_UNREAD_RETENTION_MONTHS,
+                        settings.NOTIFICATION_ARCHIVE_EXPIRED,
+                    ),
+                )
+                return created, cur.fetchone()[0]
+
+    def run_once(self):
+        result = self.maintain()
+        if result and any(result):
+            logger.info(
+                f"Notification partitions: {result[0]} created, {result[1]} expired"
+            )
+
+
+# Singleton instance
+notification_partition_maintainer = NotificationPartitionMaintainer(
+    interval=settings.NOTIFICATION_PARTITION_MAINTENANCE_INTERVAL
+)
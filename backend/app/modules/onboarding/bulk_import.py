@@ -0,0 +1,283 @@
+import argparse
+import csv
+import io
+import json
+import tempfile
+from typing import IO, Iterator, Tuple
+
+from app.config import settings
+from app.database.db import get_db_connection
+from app.logger import logger
+from app.modules.auth.auth_service import initial_status
+from app.modules.cache.invalidation_bus import invalidation_bus
+from app.modules.cache.user_cache import user_cache
+from app.payloads import BulkImportUser, UserRole
+from pydantic import ValidationError
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# Accounts with elevated access are never created in bulk
+IMPORTABLE_ROLES = {
+    UserRole.CAREGIVER,
+    UserRole.FAMILY_MEMBER,
+    UserRole.SENIOR_CITIZEN,
+    UserRole.INTEREST_GROUP_ADMIN,
+}
+
+# Column widths in users; longer values would abort the whole COPY
+FIELD_LIMITS = {
+    "gmail_id": 255,
+    "firebase_uid": 255,
+    "full_name": 255,
+    "youtube_url": 500,
+    "tags": 255,
+}
+
+STAGING_COLUMNS = (
+    "line_no",
+    "gmail_id",
+    "firebase_uid",
+    "full_name",
+    "role",
+    "status",
+    "youtube_url",
+    "date_of_birth",
+    "description",
+    "tags",
+    "latitude",
+    "longitude",
+)
+
+# Rows that would make the upsert fail or hit the same user twice
+REJECT_CONFLICTS = """
+    DELETE FROM user_import_staging s
+    USING (
+        SELECT checked.line_no, checked.reason FROM (
+            SELECT
+                st.line_no,
+                CASE
+                    WHEN row_number() OVER (
+                        PARTITION BY st.firebase_uid ORDER BY st.line_no
+                    ) > 1 THEN 'Duplicate firebase_uid in file.'
+                    WHEN row_number() OVER (
+                        PARTITION BY st.gmail_id ORDER BY st.line_no
+                    ) > 1 THEN 'Duplicate gmail_id in file.'
+                    WHEN u.id IS NOT NULL THEN 'gmail_id belongs to another user.'
+                    WHEN d.id IS NOT NULL THEN 'firebase_uid belongs to a deleted user.'
+                END AS reason
+            FROM user_import_staging st
+            LEFT JOIN users u
+                ON u.gmail_id = st.gmail_id AND u.firebase_uid <> st.firebase_uid
+            LEFT JOIN users d
+                ON d.firebase_uid = st.firebase_uid AND d.deleted_at IS NOT NULL
+        ) checked
+        WHERE checked.reason IS NOT NULL
+    ) conflicts
+    WHERE s.line_no = conflicts.line_no
+    RETURNING conflicts.line_no, conflicts.reason
+"""
+
+# Existing users (matched by firebase_uid) keep their role and status. Deleted
+# users are rejected above and never updated, even if deleted meanwhile
+UPSERT_USERS = """
+    WITH upserted AS (
+        INSERT INTO users (gmail_id, firebase_uid, full_name, role, status,
+                           youtube_url, date_of_birth, description, tags,
+                           latitude, longitude)
+        SELECT gmail_id, firebase_uid, full_name, role, status,
+               youtube_url, date_of_birth, description, tags,
+               latitude, longitude
+        FROM user_import_staging
+        ON CONFLICT (firebase_uid) DO UPDATE SET
+            full_name = EXCLUDED.full_name,
+            youtube_url = COALESCE(EXCLUDED.youtube_url, users.youtube_url),
+            date_of_birth = COALESCE(EXCLUDED.date_of_birth, users.date_of_birth),
+            description = COALESCE(EXCLUDED.description, users.description),
+            tags = COALESCE(EXCLUDED.tags, users.tags),
+            latitude = COALESCE(EXCLUDED.latitude, users.latitude),
+            longitude = COALESCE(EXCLUDED.longitude, users.longitude),
+            updated_at = CURRENT_TIMESTAMP
+        WHERE users.deleted_at IS NULL
+        RETURNING id, role, youtube_url, (xmax = 0) AS inserted
+    ),
+    queued AS (
+        INSERT INTO video_analysis_jobs (user_id, youtube_url)
+        SELECT id, youtube_url FROM upserted
+        WHERE inserted
+          AND youtube_url IS NOT NULL
+          AND role IN ('caregiver', 'interest_group_admin')
+        RETURNING 1
+    )
+    SELECT
+        COUNT(*) FILTER (WHERE inserted),
+        COUNT(*) FILTER (WHERE NOT inserted),
+        (SELECT COUNT(*) FROM queued)
+    FROM upserted
+"""
+
+
+def _read_rows(upload: IO[bytes], fmt: str) -> Iterator[Tuple[int, object]]:
+    """Yield (row number, raw row) pairs; raw rows are dicts or error strings."""
+    text = io.TextIOWrapper(upload, encoding="utf-8", newline="")
+    if fmt == "csv":
+        for number, row in enumerate(csv.DictReader(text), start=1):
+            yield number, row
+        return
+
+    for number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield number, "Invalid JSON."
+            continue
+        yield number, row if isinstance(row, dict) else "Expected a JSON object."
+
+
+def _validate(raw) -> BulkImportUser:
+    """Raises ValueError with a readable message for invalid rows."""
+    if isinstance(raw, str):
+        raise ValueError(raw)
+    # Blank CSV cells mean "not provided"; cells past the header have no key
+    data = {
+        key: value
+        for key, value in raw.items()
+        if key is not None and value not in ("", None)
+    }
+    try:
+        row = BulkImportUser(**data)
+    except ValidationError as e:
+        # Model-level checks (e.g. coordinates given together) have no field
+        raise ValueError(
+            "; ".join(
+                (
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                    if error["loc"]
+                    else error["msg"]
+                )
+                for error in e.errors()
+            )
+        )
+    if row.role not in IMPORTABLE_ROLES:
+        raise ValueError(f"role: {row.role.value} accounts cannot be bulk imported")
+    for field, limit in FIELD_LIMITS.items():
+        value = getattr(row, field)
+        if value is not None and len(value) > limit:
+            raise ValueError(f"{field}: must be at most {limit} characters")
+    return row
+
+
+def import_users(upload: IO[bytes], fmt: str) -> dict:
+    """
+    Validate an uploaded CSV/NDJSON file row by row, COPY the valid rows into
+    a temporary staging table and upsert them into users with one statement.
+    Only the staging spool (on disk past a few MB) grows with the file size.
+    Caregivers and interest group admins with a video get a video_analysis_jobs
+    entry instead of being analysed inline.
+    """
+    errors = []
+    failed = 0
+    total = 0
+
+    def reject(number, message):
+        nonlocal failed
+        failed += 1
+        if len(errors) < settings.BULK_IMPORT_MAX_ERRORS:
+            errors.append({"row": number, "error": message})
+
+    with tempfile.SpooledTemporaryFile(
+        max_size=8 * 1024 * 1024, mode="w+", newline=""
+    ) as staging:
+        writer = csv.writer(staging)
+        for number, raw in _read_rows(upload, fmt):
+            total += 1
+            try:
+                row = _validate(raw)
+            except ValueError as e:
+                reject(number, str(e))
+                continue
+            writer.writerow(
+                (
+                    number,
+                    row.gmail_id,
+                    row.firebase_uid,
+                    row.full_name,
+                    row.role.value,
+                    initial_status(row.role).value,
+                    row.youtube_url,
+                    row.date_of_birth.isoformat() if row.date_of_birth else None,
+                    row.description,
+                    row.tags,
+                    row.latitude,
+                    row.longitude,
+                )
+            )
+        staging.seek(0)
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """CREATE TEMP TABLE user_import_staging (
+                           line_no INTEGER PRIMARY KEY,
+                           gmail_id VARCHAR(255) NOT NULL,
+                           firebase_uid VARCHAR(255) NOT NULL,
+                           full_name VARCHAR(255) NOT NULL,
+                           role user_role NOT NULL,
+                           status user_status NOT NULL,
+                           youtube_url VARCHAR(500),
+                           date_of_birth DATE,
+                           description TEXT,
+                           tags VARCHAR(255),
+                           latitude DOUBLE PRECISION,
+                           longitude DOUBLE PRECISION
+                       ) ON COMMIT DROP"""
+                )
+                cur.copy_expert(
+                    f"COPY user_import_staging ({', '.join(STAGING_COLUMNS)}) "
+                    "FROM STDIN WITH (FORMAT csv)",
+                    staging,
+                )
+                cur.execute(REJECT_CONFLICTS)
+                for number, reason in sorted(cur.fetchall()):
+                    reject(number, reason)
+
+                cur.execute(UPSERT_USERS)
+                inserted, updated, queued = cur.fetchone()
+                if updated:
+                    invalidation_bus.publish(cur, "users")
+
+    if updated:
+        user_cache.invalidate()
+
+    logger.info(
+        f"Bulk import: {total} rows, {inserted} inserted, {updated} updated, "
+        f"{failed} failed, {queued} queued for video analysis"
+    )
+    errors.sort(key=lambda error: error["row"])
+    return {
+        "rows": total,
+        "inserted": inserted,
+        "updated": updated,
+        "failed": failed,
+        "errors": errors,
+        "queued_video_analysis": queued,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Bulk import users from a CSV or NDJSON file"
+    )
+    parser.add_argument("path", help="File to import")
+    parser.add_argument(
+        "--format",
+        choices=IMPORT_FORMATS,
+        help="File format (default: from the file extension, else csv)",
+    )
+    args = parser.parse_args()
+
+    fmt = args.format or ("ndjson" if args.path.endswith(".ndjson") else "csv")
+    with open(args.path, "rb") as upload:
+        result = import_users(upload, fmt)
+    print(json.dumps(result, indent=2))
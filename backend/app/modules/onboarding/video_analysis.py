@@ -0,0 +1,131 @@
+from app.config import settings
+from app.database.db import get_db_connection
+from app.logger import logger
+from app.modules.cache.invalidation_bus import invalidation_bus
+from app.modules.cache.user_cache import user_cache
+from app.modules.youtube.youtube_processor import youtube_processor
+from app.payloads import UserRole
+from app.utils.periodic import PeriodicWorker
+
+# Claimed jobs not finished within this window (worker crashed) are retried
+CLAIM_TIMEOUT = "10 minutes"
+MAX_ATTEMPTS = 3
+
+
+class VideoAnalysisWorker(PeriodicWorker):
+    """
+    Works through video_analysis_jobs queued by bulk imports, running the same
+    Gemini analysis as registration and storing the generated tags and
+    description on the user. Jobs are claimed with SKIP LOCKED, so every worker
+    process can run one; no connection is held while Gemini is called.
+    """
+
+    job = "processing video analysis jobs"
+
+    def __init__(self, interval: float, batch_size: int):
+        super().__init__(interval)
+        self.batch_size = batch_size
+
+    def _claim(self):
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                # Jobs that used their last attempt in a worker that crashed
+                cur.execute(
+                    """DELETE FROM video_analysis_jobs
+                       WHERE attempts >= %s
+                         AND claimed_at < CURRENT_TIMESTAMP - %s::interval
+                       RETURNING id, user_id""",
+                    (MAX_ATTEMPTS, CLAIM_TIMEOUT),
+                )
+                for job_id, user_id in cur.fetchall():
+                    logger.warning(
+                        f"Giving up on video analysis job {job_id} for user {user_id}"
+                    )
+                cur.execute(
+                    """UPDATE video_analysis_jobs j
+                       SET claimed_at = CURRENT_TIMESTAMP, attempts = j.attempts + 1
+                       FROM users u
+                       WHERE u.id = j.user_id AND j.id IN (
+                           SELECT id FROM video_analysis_jobs
+                           WHERE attempts < %s
+                             AND (claimed_at IS NULL
+                                  OR claimed_at < CURRENT_TIMESTAMP - %s::interval)
+                           ORDER BY id
+                           LIMIT %s
+                           FOR UPDATE SKIP LOCKED
+                       )
+                       RETURNING j.id, j.user_id, j.youtube_url, u.role, u.full_name, j.attempts""",
+                    (MAX_ATTEMPTS, CLAIM_TIMEOUT, self.batch_size),
+                )
+                return cur.fetchall()
+
+    def _complete(self, job_id, user_id, analysis):
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                # Generated content wins over the imported values, as in registration
+                cur.execute(
+                    """UPDATE users
+                       SET tags = COALESCE(%s, tags),
+                           description = COALESCE(%s, description),
+                           updated_at = CURRENT_TIMESTAMP
+                       WHERE id = %s""",
+                    (analysis.get("tags"), analysis.get("description"), user_id),
+                )
+                cur.execute("DELETE FROM video_analysis_jobs WHERE id = %s", (job_id,))
+                invalidation_bus.publish(cur, "users", user_id)
+        user_cache.invalidate(user_id)
+
+    def _fail(self, job_id, attempts):
+        """Retry the job on the next pass, or drop it after its last attempt."""
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                if attempts >= MAX_ATTEMPTS:
+                    cur.execute(
+                        "DELETE FROM video_analysis_jobs WHERE id = %s", (job_id,)
+                    )
+                else:
+                    cur.execute(
+                        "UPDATE video_analysis_jobs SET claimed_at = NULL WHERE id = %s",
+                        (job_id,),
+                    )
+
+    def _process(self, job_id, user_id, youtube_url, role, full_name):
+        if role == UserRole.INTEREST_GROUP_ADMIN.value:
+            analysis = youtube_processor.generate_interest_group_admin_analysis(
+                youtube_url, full_name
+            )
+        else:
+            analysis = youtube_processor.generate_caregiver_analysis(
+                youtube_url, full_name
+            )
+        self._complete(job_id, user_id, analysis)
+
+    def process_batch(self) -> int:
+        """Process one batch of jobs; returns how many were completed."""
+        completed = 0
+        for job_id, user_id, youtube_url, role, full_name, attempts in self._claim():
+            try:
+                self._process(job_id, user_id, youtube_url, role, full_name)
+                completed += 1
+            except Exception as e:
+                logger.error(
+                    f"Video analysis job {job_id} failed (attempt {attempts} of {MAX_ATTEMPTS}): {e}"
+                )
+                try:
+                    self._fail(job_id, attempts)
+                except Exception as e:
+                    # Left claimed; picked up again after CLAIM_TIMEOUT
+                    logger.error(f"Error releasing video analysis job {job_id}: {e}")
+        return completed
+
+    def run_once(self):
+        processed = self.process_batch()
+        if processed:
+            logger.info(f"Analysed {processed} queued video(s)")
+
+
+# Singleton instance
+video_analysis_worker = VideoAnalysisWorker(
+    interval=settings.VIDEO_ANALYSIS_INTERVAL,
+    batch_size=settings.VIDEO_ANALYSIS_BATCH_SIZE,
+)
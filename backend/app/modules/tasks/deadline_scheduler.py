@@ -0,0 +1,437 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import defaultdict
+
+import psycopg2
+from app.config import settings
+from app.logger import logger
+from app.modules.cache.invalidation_bus import invalidation_bus
+from app.modules.tasks.recurrence import RecurrenceRule
+
+# Session-level advisory lock held by the leader's dedicated connection
+LEADER_LOCK_ID = 4420
+ELECTION_INTERVAL = 15.0
+KEEPALIVE_SECONDS = 30.0
+# Tasks that went overdue longer ago than this (e.g. while no leader ran) are
+# not notified anymore
+OVERDUE_LOOKBACK = "1 day"
+
+LOAD_DEADLINES = """
+    SELECT id,
+           EXTRACT(EPOCH FROM time_of_completion - LOCALTIMESTAMP)::float8,
+           reminder_sent_at IS NULL
+    FROM tasks
+    WHERE status IN ('pending', 'in_progress')
+      AND time_of_completion >= LOCALTIMESTAMP - %(lookback)s::interval
+      AND time_of_completion < LOCALTIMESTAMP + %(horizon)s::interval
+      AND overdue_notified_at IS NULL
+"""
+
+# Each statement claims the tasks (guarded on the sent markers, so a task is
+# notified once however many leaders have come and gone) and inserts all of
+# their notifications in one multi-row INSERT ... SELECT.
+NOTIFY_STATEMENTS = {
+    "reminder": """
+        WITH due AS (
+            UPDATE tasks SET reminder_sent_at = CURRENT_TIMESTAMP
+            WHERE id = ANY(%(ids)s)
+              AND reminder_sent_at IS NULL
+              AND status IN ('pending', 'in_progress')
+              AND time_of_completion > LOCALTIMESTAMP
+              AND time_of_completion <= LOCALTIMESTAMP + %(lead)s::interval
+            RETURNING title, created_by, assigned_to, time_of_completion
+        )
+        INSERT INTO notifications (user_id, type, priority, body)
+        SELECT DISTINCT r.user_id, 'task'::notification_type,
+               'medium'::notification_priority,
+               'Reminder: "' || due.title || '" is due at '
+                   || to_char(due.time_of_completion, 'HH24:MI')
+        FROM due
+        CROSS JOIN LATERAL (VALUES (due.created_by), (due.assigned_to)) AS r(user_id)
+        WHERE r.user_id IS NOT NULL
+    """,
+    "overdue": """
+        WITH due AS (
+            UPDATE tasks SET overdue_notified_at = CURRENT_TIMESTAMP
+            WHERE id = ANY(%(ids)s)
+              AND overdue_notified_at IS NULL
+              AND status IN ('pending', 'in_progress')
+              AND time_of_completion <= LOCALTIMESTAMP
+            RETURNING title, created_by, assigned_to, time_of_completion
+        )
+        INSERT INTO notifications (user_id, type, priority, body)
+        SELECT DISTINCT r.user_id, 'task'::notification_type,
+               'high'::notification_priority,
+               'Overdue: "' || due.title || '" was due at '
+                   || to_char(due.time_of_completion, 'HH24:MI')
+        FROM due
+        CROSS JOIN LATERAL (VALUES (due.created_by), (due.assigned_to)) AS r(user_id)
+        WHERE r.user_id IS NOT NULL
+    """,
+}
+
+# Recurring rules are expanded in memory over the same window; occurrences have
+# no tasks row until completed, so their sent markers live in
+# task_occurrence_notices instead.
+LOAD_RULES = """
+    SELECT id, frequency::text, repeat_interval, by_weekday, starts_at, until,
+           LOCALTIMESTAMP,
+           LOCALTIMESTAMP - %(lookback)s::interval,
+           LOCALTIMESTAMP + %(horizon)s::interval
+    FROM task_recurrences
+    WHERE starts_at < LOCALTIMESTAMP + %(horizon)s::interval
+      AND (until IS NULL OR until >= LOCALTIMESTAMP - %(lookback)s::interval)
+"""
+
+LOAD_OCCURRENCE_STATE = """
+    SELECT recurrence_id, occurrence_at, reminder_sent_at IS NULL,
+           overdue_notified_at IS NULL
+    FROM task_occurrence_notices
+    WHERE recurrence_id = ANY(%(ids)s) AND occurrence_at BETWEEN %(start)s AND %(end)s
+    UNION ALL
+    -- Completed occurrences: nothing left to remind of
+    SELECT recurrence_id, time_of_completion, FALSE, FALSE
+    FROM tasks
+    WHERE recurrence_id = ANY(%(ids)s)
+      AND time_of_completion BETWEEN %(start)s AND %(end)s
+"""
+
+PRUNE_OCCURRENCE_NOTICES = """
+    DELETE FROM task_occurrence_notices
+    WHERE occurrence_at < LOCALTIMESTAMP - %(lookback)s::interval
+"""
+
+# Same claim-then-notify shape as NOTIFY_STATEMENTS, with the marker row
+# upserted; the rule must still cover the occurrence and it must not have been
+# completed in the meantime.
+OCCURRENCE_NOTIFY_STATEMENTS = {
+    "reminder": """
+        WITH due AS (
+            INSERT INTO task_occurrence_notices AS n
+                (recurrence_id, occurrence_at, reminder_sent_at)
+            SELECT o.recurrence_id, o.occurrence_at, CURRENT_TIMESTAMP
+            FROM unnest(%(rule_ids)s::int[], %(occurrences)s::timestamp[])
+                AS o(recurrence_id, occurrence_at)
+            JOIN task_recurrences tr ON tr.id = o.recurrence_id
+            WHERE o.occurrence_at > LOCALTIMESTAMP
+              AND o.occurrence_at <= LOCALTIMESTAMP + %(lead)s::interval
+              AND o.occurrence_at >= tr.starts_at
+              AND (tr.until IS NULL OR o.occurrence_at <= tr.until)
+              AND NOT EXISTS (
+                  SELECT 1 FROM tasks t
+                  WHERE t.recurrence_id = o.recurrence_id
+                    AND t.time_of_completion = o.occurrence_at
+              )
+            ON CONFLICT (recurrence_id, occurrence_at) DO UPDATE
+                SET reminder_sent_at = EXCLUDED.reminder_sent_at
+                WHERE n.reminder_sent_at IS NULL AND n.overdue_notified_at IS NULL
+            RETURNING recurrence_id, occurrence_at
+        )
+        INSERT INTO notifications (user_id, type, priority, body)
+        SELECT DISTINCT r.user_id, 'task'::notification_type,
+               'medium'::notification_priority,
+               'Reminder: "' || tr.title || '" is due at '
+                   || to_char(due.occurrence_at, 'HH24:MI')
+        FROM due
+        JOIN task_recurrences tr ON tr.id = due.recurrence_id
+        CROSS JOIN LATERAL (VALUES (tr.created_by), (tr.assigned_to)) AS r(user_id)
+        WHERE r.user_id IS NOT NULL
+    """,
+    "overdue": """
+        WITH due AS (
+            INSERT INTO task_occurrence_notices AS n
+                (recurrence_id, occurrence_at, overdue_notified_at)
+            SELECT o.recurrence_id, o.occurrence_at, CURRENT_TIMESTAMP
+            FROM unnest(%(rule_ids)s::int[], %(occurrences)s::timestamp[])
+                AS o(recurrence_id, occurrence_at)
+            JOIN task_recurrences tr ON tr.id = o.recurrence_id
+            WHERE o.occurrence_at <= LOCALTIMESTAMP
+              AND o.occurrence_at >= tr.starts_at
+              AND (tr.until IS NULL OR o.occurrence_at <= tr.until)
+              AND NOT EXISTS (
+                  SELECT 1 FROM tasks t
+                  WHERE t.recurrence_id = o.recurrence_id
+                    AND t.time_of_completion = o.occurrence_at
+              )
+            ON CONFLICT (recurrence_id, occurrence_at) DO UPDATE
+                SET overdue_notified_at = EXCLUDED.overdue_notified_at
+                WHERE n.overdue_notified_at IS NULL
+            RETURNING recurrence_id, occurrence_at
+        )
+        INSERT INTO notifications (user_id, type, priority, body)
+        SELECT DISTINCT r.user_id, 'task'::notification_type,
+               'high'::notification_priority,
+               'Overdue: "' || tr.title || '" was due at '
+                   || to_char(due.occurrence_at, 'HH24:MI')
+        FROM due
+        JOIN task_recurrences tr ON tr.id = due.recurrence_id
+        CROSS JOIN LATERAL (VALUES (tr.created_by), (tr.assigned_to)) AS r(user_id)
+        WHERE r.user_id IS NOT NULL
+    """,
+}
+
+
+class DeadlineScheduler:
+    """
+    Sends task reminders (TASK_REMINDER_LEAD_MINUTES before time_of_completion)
+    and overdue notices.
+
+    Every worker runs a scheduler thread, but only the one holding the
+    advisory lock on its dedicated connection leads; the others retry the lock
+    every few seconds and take over if the leader's connection goes away.
+    The leader keeps the deadlines of the next TASK_SCHEDULER_HORIZON_HOURS in
+    a heap, loaded through the (status, time_of_completion) index and reloaded
+    every TASK_SCHEDULER_RELOAD_INTERVAL. Recurring rules overlapping that
+    window are expanded into their occurrences alongside. Task and rule writes
+    publish "tasks" and "task_recurrences" events on the invalidation bus so
+    the leader can reschedule just those.
+    """
+
+    def __init__(self, lead_minutes, horizon_hours, reload_interval, batch_size):
+        self.lead = f"{lead_minutes} minutes"
+        self.lead_seconds = lead_minutes * 60
+        self.horizon = f"{horizon_hours} hours"
+        self.reload_interval = reload_interval
+        self.batch_size = batch_size
+        # (fire_at, seq, key, kind, due_at), monotonic clock; the key is a task
+        # id or a (rule id, occurrence time) pair
+        self._heap = []
+        self._seq = itertools.count()  # Keeps the two kinds of keys uncompared
+        self._due_at = {}  # key -> due_at of its live heap entries
+        self._pending_ids = set()
+        self._pending_rule_ids = set()
+        self._reload_all = True
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def refresh(self, *task_ids):
+        """Reschedule the given tasks (all tasks when none are given)."""
+        with self._lock:
+            if task_ids:
+                self._pending_ids.update(task_ids)
+            else:
+                self._reload_all = True
+        self._wake.set()
+
+    def refresh_rules(self, *rule_ids):
+        """Reschedule the occurrences of the given rules (everything when none)."""
+        with self._lock:
+            if rule_ids:
+                self._pending_rule_ids.update(rule_ids)
+            else:
+                self._reload_all = True
+        self._wake.set()
+
+    def start(self):
+        if not settings.TASK_SCHEDULER_ENABLED or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run_forever, name="task-deadlines", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run_forever(self):
+        backoff = 1.0
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(settings.DATABASE_URL)
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute("SELECT pg_try_advisory_lock(%s)", (LEADER_LOCK_ID,))
+                    is_leader = cur.fetchone()[0]
+                backoff = 1.0
+                if not is_leader:
+                    conn.close()
+                    self._stop.wait(ELECTION_INTERVAL)
+                    continue
+                logger.info("Task deadline scheduler is now the leader")
+                self.refresh()
+                self._lead(conn)
+            except Exception as e:
+                logger.warning(
+                    f"Task deadline scheduler lost its connection: {e}; "
+                    f"retrying in {backoff:.0f}s"
+                )
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                # Closing the session releases the leader lock
+                if conn is not None and not conn.closed:
+                    conn.close()
+                self._heap.clear()
+                self._due_at.clear()
+
+    def _lead(self, conn):
+        last_reload = 0.0
+        last_query = time.monotonic()
+        while not self._stop.is_set():
+            self._wake.clear()
+            now = time.monotonic()
+            with self._lock:
+                reload_all = (
+                    self._reload_all or now - last_reload >= self.reload_interval
+                )
+                task_ids = self._pending_ids
+                rule_ids = self._pending_rule_ids
+                self._pending_ids = set()
+                self._pending_rule_ids = set()
+                self._reload_all = False
+
+            if reload_all:
+                self._load(conn)
+                last_reload = last_query = now
+            elif task_ids or rule_ids:
+                self._load(conn, task_ids, rule_ids)
+                last_query = now
+            if self._fire_due(conn):
+                last_query = time.monotonic()
+
+            if time.monotonic() - last_query >= KEEPALIVE_SECONDS:
+                # Surfaces a dead session (and with it a lost lock) promptly
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                last_query = time.monotonic()
+
+            wait = KEEPALIVE_SECONDS
+            if self._heap:
+                wait = min(wait, max(0.0, self._heap[0][0] - time.monotonic()))
+            self._wake.wait(wait)
+
+    def _load(self, conn, task_ids=None, rule_ids=None):
+        """Reload everything, or just the given tasks and rules."""
+        if task_ids is None and rule_ids is None:
+            self._heap.clear()
+            self._due_at.clear()
+            self._load_tasks(conn)
+            self._load_occurrences(conn)
+            return
+        if task_ids:
+            self._load_tasks(conn, task_ids)
+        if rule_ids:
+            self._load_occurrences(conn, rule_ids)
+
+    def _schedule(self, key, seconds_left, needs_reminder):
+        due_at = time.monotonic() + seconds_left
+        self._due_at[key] = due_at
+        if needs_reminder and seconds_left > 0:
+            heapq.heappush(
+                self._heap,
+                (due_at - self.lead_seconds, next(self._seq), key, "reminder", due_at),
+            )
+        heapq.heappush(self._heap, (due_at, next(self._seq), key, "overdue", due_at))
+
+    def _load_tasks(self, conn, task_ids=None):
+        query = LOAD_DEADLINES
+        params = {"lookback": OVERDUE_LOOKBACK, "horizon": self.horizon}
+        if task_ids is not None:
+            query += " AND id = ANY(%(ids)s)"
+            params["ids"] = list(task_ids)
+            for task_id in task_ids:
+                # Cancels the old entries; rows still due below re-add them
+                self._due_at.pop(task_id, None)
+
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+            rows = cur.fetchall()
+
+        for task_id, seconds_left, needs_reminder in rows:
+            self._schedule(task_id, seconds_left, needs_reminder)
+
+    def _load_occurrences(self, conn, rule_ids=None):
+        query = LOAD_RULES
+        params = {"lookback": OVERDUE_LOOKBACK, "horizon": self.horizon}
+        if rule_ids is not None:
+            query += " AND id = ANY(%(ids)s)"
+            params["ids"] = list(rule_ids)
+            stale = [
+                key
+                for key in self._due_at
+                if isinstance(key, tuple) and key[0] in rule_ids
+            ]
+            for key in stale:
+                del self._due_at[key]
+
+        with conn.cursor() as cur:
+            if rule_ids is None:
+                cur.execute(PRUNE_OCCURRENCE_NOTICES, params)
+            cur.execute(query, params)
+            rules = cur.fetchall()
+            if not rules:
+                return
+            db_now, window_start, window_end = rules[0][6:]
+            cur.execute(
+                LOAD_OCCURRENCE_STATE,
+                {
+                    "ids": [rule[0] for rule in rules],
+                    "start": window_start,
+                    "end": window_end,
+                },
+            )
+            state = {
+                (rule_id, occurrence_at): (needs_reminder, needs_overdue)
+                for rule_id, occurrence_at, needs_reminder, needs_overdue in cur
+            }
+
+        for rule_id, *fields, _, _, _ in rules:
+            rule = RecurrenceRule(*fields)
+            for occurrence_at in rule.occurrences(window_start, window_end):
+                key = (rule_id, occurrence_at)
+                needs_reminder, needs_overdue = state.get(key, (True, True))
+                if needs_overdue:
+                    seconds_left = (occurrence_at - db_now).total_seconds()
+                    self._schedule(key, seconds_left, needs_reminder)
+
+    def _fire_due(self, conn) -> bool:
+        due = defaultdict(list)
+        now = time.monotonic()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, key, kind, due_at = heapq.heappop(self._heap)
+            if self._due_at.get(key) != due_at:
+                continue  # Rescheduled, completed or deleted since it was queued
+            due[kind, isinstance(key, tuple)].append(key)
+            if kind == "overdue":
+                del self._due_at[key]
+        if not due:
+            return False
+
+        with conn.cursor() as cur:
+            for (kind, is_occurrence), keys in due.items():
+                for start in range(0, len(keys), self.batch_size):
+                    batch = keys[start : start + self.batch_size]
+                    if is_occurrence:
+                        statement = OCCURRENCE_NOTIFY_STATEMENTS[kind]
+                        params = {
+                            "rule_ids": [rule_id for rule_id, _ in batch],
+                            "occurrences": [occurrence for _, occurrence in batch],
+                        }
+                    else:
+                        statement = NOTIFY_STATEMENTS[kind]
+                        params = {"ids": batch}
+                    cur.execute(statement, {**params, "lead": self.lead})
+                    if cur.rowcount:
+                        logger.info(f"Sent {cur.rowcount} task {kind} notification(s)")
+        return True
+
+
+# Singleton instance
+deadline_scheduler = DeadlineScheduler(
+    lead_minutes=settings.TASK_REMINDER_LEAD_MINUTES,
+    horizon_hours=settings.TASK_SCHEDULER_HORIZON_HOURS,
+    reload_interval=settings.TASK_SCHEDULER_RELOAD_INTERVAL,
+    batch_size=settings.TASK_NOTIFICATION_BATCH_SIZE,
+)
+invalidation_bus.subscribe("tasks", deadline_scheduler.refresh)
+invalidation_bus.subscribe("task_recurrences", deadline_scheduler.refresh_rules)
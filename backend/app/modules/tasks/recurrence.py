@@ -0,0 +1,191 @@
+from calendar import monthrange
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, Optional, Tuple
+
+from app.database.prepared import execute_prepared
+from app.modules.tasks.task_feed import LIVE_CREATOR, TASK_COLUMNS, build_task_filters
+
+# Longest date range get_tasks expands in one request
+MAX_WINDOW = timedelta(days=366)
+# Upcoming occurrences listed without a from/to range
+DEFAULT_WINDOW = timedelta(days=7)
+
+RULE_COLUMNS = """id, title, description, created_by, assigned_to, created_at,
+                  updated_at, priority, category, estimated_duration,
+                  frequency, repeat_interval, by_weekday, starts_at, until"""
+
+
+class RecurrenceRule(NamedTuple):
+    frequency: str
+    repeat_interval: int
+    by_weekday: Optional[List[int]]
+    starts_at: datetime
+    until: Optional[datetime]
+
+    def occurrences(self, window_start: datetime, window_end: datetime):
+        """
+        Occurrence times within [window_start, window_end], in order. Jumps
+        straight to the first period that can fall in the window, so the cost
+        depends on the window, not on how long the rule has been running.
+        """
+        start = max(window_start, self.starts_at)
+        end = window_end if self.until is None else min(window_end, self.until)
+        if start > end:
+            return []
+        expand = {
+            "daily": self._daily,
+            "weekly": self._weekly,
+            "monthly": self._monthly,
+        }[self.frequency]
+        return [t for t in expand(start, end) if start <= t <= end]
+
+    def _daily(self, start, end):
+        step = timedelta(days=self.repeat_interval)
+        # Ceiling division: the first step at or after start
+        t = self.starts_at + step * -((self.starts_at - start) // step)
+        while t <= end:
+            yield t
+            t += step
+
+    def _weekly(self, start, end):
+        weekdays = sorted(set(self.by_weekday or [self.starts_at.weekday()]))
+        # Monday of the first week, at the rule's time of day
+        anchor = self.starts_at - timedelta(days=self.starts_at.weekday())
+        week = (start - anchor).days // 7
+        week -= week % self.repeat_interval
+        while True:
+            monday = anchor + timedelta(weeks=week)
+            if monday > end:
+                return
+            for weekday in weekdays:
+                yield monday + timedelta(days=weekday)
+            week += self.repeat_interval
+
+    def _monthly(self, start, end):
+        first = self.starts_at
+        months = (start.year - first.year) * 12 + start.month - first.month
+        months += -months % self.repeat_interval
+        while True:
+            year, month = divmod(first.month - 1 + months, 12)
+            year, month = first.year + year, month + 1
+            if datetime(year, month, 1) > end:
+                return
+            # Months without the day (e.g. the 31st) are skipped, as in RRULE
+            if first.day <= monthrange(year, month)[1]:
+                yield first.replace(year=year, month=month)
+            months += self.repeat_interval
+
+
+def parse_window(query_params) -> Optional[Tuple[datetime, datetime]]:
+    """
+    Read the optional `from`/`to` range of get_tasks. Raises ValueError for
+    malformed, inverted or overlong ranges.
+    """
+    window_from = query_params.get("from")
+    window_to = query_params.get("to")
+    if not window_from and not window_to:
+        return None
+    if not window_from or not window_to:
+        raise ValueError("Both from and to are required")
+    # Task times are stored without a time zone
+    window_start = datetime.fromisoformat(window_from).replace(tzinfo=None)
+    window_end = datetime.fromisoformat(window_to).replace(tzinfo=None)
+    if window_start > window_end or window_end - window_start > MAX_WINDOW:
+        raise ValueError("Invalid date range")
+    return window_start, window_end
+
+
+def fetch_task_window(
+    cur, user_id: int, query_params, window_start: datetime, window_end: datetime
+) -> list:
+    """
+    Tasks created by or assigned to user_id that are due within the window,
+    ordered by time_of_completion.
+
+    Stored tasks come from the (owner, time_of_completion) indexes. Recurring
+    rules that overlap the window are expanded by fetch_occurrences(); an
+    occurrence that was already materialized (completed) is returned as its
+    stored row instead.
+    """
+    filters, filter_params = build_task_filters(query_params)
+
+    branch = (
+        f"SELECT {TASK_COLUMNS} FROM tasks"
+        f" WHERE {{owner}} AND time_of_completion BETWEEN %s AND %s{filters}"
+    )
+    execute_prepared(
+        cur,
+        f"({branch.format(owner='created_by = %s')})"
+        " UNION ALL "
+        f"({branch.format(owner=f'assigned_to = %s AND created_by <> %s AND {LIVE_CREATOR}')})",
+        tuple(
+            [user_id, window_start, window_end]
+            + filter_params
+            + [user_id, user_id, window_start, window_end]
+            + filter_params
+        ),
+    )
+    rows = cur.fetchall() + fetch_occurrences(
+        cur, user_id, query_params, window_start, window_end
+    )
+    rows.sort(key=lambda row: (row[3], row[0] or 0))
+    return rows
+
+
+def fetch_occurrences(
+    cur, user_id: int, query_params, window_start: datetime, window_end: datetime
+) -> list:
+    """
+    Pending occurrences within the window of the recurring rules created by or
+    assigned to user_id, as task rows with id None. Occurrences that were
+    already materialized (completed) are left out.
+    """
+    filters, filter_params = build_task_filters(query_params)
+
+    # Occurrences are pending until completed, so status filters apply as such
+    execute_prepared(
+        cur,
+        f"""SELECT {RULE_COLUMNS} FROM (
+                SELECT *, 'pending'::task_status AS status FROM task_recurrences
+                WHERE (created_by = %s OR (assigned_to = %s AND {LIVE_CREATOR}))
+                  AND starts_at <= %s AND (until IS NULL OR until >= %s)
+            ) rules WHERE TRUE{filters}""",
+        tuple([user_id, user_id, window_end, window_start] + filter_params),
+    )
+    rules = cur.fetchall()
+    if not rules:
+        return []
+
+    # Checked regardless of the filters: a completed occurrence must not come
+    # back as a pending one when only pending tasks are requested
+    execute_prepared(
+        cur,
+        """SELECT recurrence_id, time_of_completion FROM tasks
+           WHERE recurrence_id = ANY(%s) AND time_of_completion BETWEEN %s AND %s""",
+        ([rule[0] for rule in rules], window_start, window_end),
+    )
+    materialized = set(cur.fetchall())
+
+    rows = []
+    for rule in rules:
+        rule_id, title, description, created_by, assigned_to = rule[:5]
+        for occurrence in RecurrenceRule(*rule[10:]).occurrences(
+            window_start, window_end
+        ):
+            if (rule_id, occurrence) in materialized:
+                continue
+            rows.append(
+                (None, title, description, occurrence, "pending")
+                + (created_by, assigned_to)
+                + rule[5:10]
+                + (rule_id,)
+            )
+    rows.sort(key=lambda row: row[3])
+    return rows
+
+
+def fetch_upcoming_occurrences(cur, user_id: int, query_params) -> list:
+    """fetch_occurrences() for the DEFAULT_WINDOW from now on."""
+    cur.execute("SELECT LOCALTIMESTAMP")
+    now = cur.fetchone()[0]
+    return fetch_occurrences(cur, user_id, query_params, now, now + DEFAULT_WINDOW)
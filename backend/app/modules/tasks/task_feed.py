@@ -0,0 +1,134 @@
+import base64
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from app.database.prepared import execute_prepared
+
+TASK_COLUMNS = """id, title, description, time_of_completion, status,
+                  created_by, assigned_to, created_at, updated_at,
+                  priority, category, estimated_duration, recurrence_id"""
+
+MAX_PAGE_SIZE = 100
+
+# Tasks created by a user pending deletion stay hidden from their assignees
+# until the purge removes them (idx_users_pending_deletion keeps this cheap)
+LIVE_CREATOR = "created_by NOT IN (SELECT id FROM users WHERE deleted_at IS NOT NULL)"
+
+
+def encode_cursor(created_at: datetime, task_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{task_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Raises ValueError for malformed cursors."""
+    try:
+        created_at, task_id = base64.urlsafe_b64decode(cursor).decode().split("|")
+        return datetime.fromisoformat(created_at), int(task_id)
+    except (TypeError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def build_task_filters(query_params) -> Tuple[str, List]:
+    """Translate the get_tasks query parameters into extra WHERE clauses."""
+    clauses = ""
+    params = []
+
+    priority_filter = query_params.get("priority")
+    category_filter = query_params.get("category")
+    status_filter = query_params.get("status")
+    ai_generated_filter = query_params.get("ai_generated")  # true/false string
+    estimated_duration_min = query_params.get("estimated_duration_min")
+    estimated_duration_max = query_params.get("estimated_duration_max")
+
+    if priority_filter:
+        clauses += " AND priority = %s"
+        params.append(priority_filter)
+
+    if category_filter:
+        clauses += " AND category = %s"
+        params.append(category_filter)
+
+    if status_filter:
+        clauses += " AND status = %s"
+        params.append(status_filter)
+
+    if ai_generated_filter is not None:
+        if ai_generated_filter.lower() == "true":
+            clauses += " AND priority IS NOT NULL AND category IS NOT NULL"
+        elif ai_generated_filter.lower() == "false":
+            clauses += " AND (priority IS NULL OR category IS NULL)"
+
+    if estimated_duration_min:
+        try:
+            params.append(int(estimated_duration_min))
+            clauses += " AND estimated_duration >= %s"
+        except ValueError:
+            pass  # Ignore invalid duration filter
+
+    if estimated_duration_max:
+        try:
+            params.append(int(estimated_duration_max))
+            clauses += " AND estimated_duration <= %s"
+        except ValueError:
+            pass  # Ignore invalid duration filter
+
+    return clauses, params
+
+
+def fetch_task_feed(
+    cur,
+    user_id: int,
+    query_params,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[list, Optional[str]]:
+    """
+    Return (rows, next_cursor) for tasks created by or assigned to user_id,
+    newest first.
+
+    Each side of the UNION ALL walks its own (created_by|assigned_to,
+    created_at DESC, id DESC) index in order, so both branches stop after
+    `limit` rows instead of bitmap-ORing every matching task and sorting.
+    Tasks a user both created and is assigned to are only read from the
+    first branch.
+    """
+    filters, filter_params = build_task_filters(query_params)
+
+    keyset = ""
+    keyset_params = []
+    if cursor:
+        keyset = " AND (created_at, id) < (%s, %s)"
+        keyset_params = list(decode_cursor(cursor))
+
+    page_limit = ""
+    limit_params = []
+    if limit is not None:
+        # One extra row tells us whether there is another page
+        page_limit = " LIMIT %s"
+        limit_params = [limit + 1]
+
+    branch = (
+        f"SELECT {TASK_COLUMNS} FROM tasks WHERE {{owner}}{filters}{keyset}"
+        f" ORDER BY created_at DESC, id DESC{page_limit}"
+    )
+    query = (
+        f"SELECT {TASK_COLUMNS} FROM ("
+        f"({branch.format(owner='created_by = %s')})"
+        " UNION ALL "
+        f"({branch.format(owner=f'assigned_to = %s AND created_by <> %s AND {LIVE_CREATOR}')})"
+        f") feed ORDER BY created_at DESC, id DESC{page_limit}"
+    )
+    branch_params = filter_params + keyset_params + limit_params
+    params = (
+        [user_id] + branch_params + [user_id, user_id] + branch_params + limit_params
+    )
+
+    execute_prepared(cur, query, tuple(params))
+    rows = cur.fetchall()
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][7], rows[-1][0])
+    return rows, next_cursor
@@ -0,0 +1,34 @@
+import random
+from typing import Dict, Optional
+
+SUPPORT_WORKLOADS = """
+    SELECT u.id, COUNT(t.id) AS open_tickets
+    FROM users u
+    LEFT JOIN tickets t ON u.id = t.assigned_to AND t.status IN ('open', 'in_progress')
+    WHERE u.role IN ('support_user')
+    AND u.status = 'active'
+    AND u.deleted_at IS NULL
+    GROUP BY u.id
+"""
+
+
+def support_workloads(cur) -> Dict[int, int]:
+    """Open ticket count of every active support user."""
+    cur.execute(SUPPORT_WORKLOADS)
+    return dict(cur.fetchall())
+
+
+def least_loaded(workloads: Dict[int, int], exclude=None) -> Optional[int]:
+    """
+    The support user with the fewest open tickets, ties broken at random.
+    `exclude` is skipped unless nobody else is available.
+    """
+    candidates = {
+        user_id: count for user_id, count in workloads.items() if user_id != exclude
+    } or workloads
+    if not candidates:
+        return None
+    fewest = min(candidates.values())
+    return random.choice(
+        [user_id for user_id, count in candidates.items() if count == fewest]
+    )
@@ -0,0 +1,68 @@
+from typing import List, NamedTuple, Optional
+
+from app.config import settings
+
+MAX_DUPLICATES = 5
+OPEN_STATUSES = ("open", "in_progress")
+
+# Each branch first narrows to a small candidate set through a btree index (the
+# user's tickets, or one category's recent tickets) or the trigram GIN index,
+# whichever the planner finds cheaper, then filters on the similarity threshold
+_OWN_OPEN = """
+    SELECT id, user_id, subject, status, assigned_to, search_text FROM tickets
+    WHERE user_id = %(user_id)s AND status IN ('open', 'in_progress')
+      AND search_text %% %(text)s
+"""
+_RECENT_IN_CATEGORY = """
+    SELECT id, user_id, subject, status, assigned_to, search_text FROM tickets
+    WHERE category = %(category)s
+      AND created_at >= LOCALTIMESTAMP - %(window)s::interval
+      AND search_text %% %(text)s
+"""
+
+
+class DuplicateTicket(NamedTuple):
+    id: int
+    user_id: int
+    subject: str
+    status: str
+    assigned_to: Optional[int]
+    similarity: float
+
+    @property
+    def is_open(self) -> bool:
+        return self.status in OPEN_STATUSES
+
+
+def find_duplicate_tickets(
+    cur, user_id: int, subject: str, description: Optional[str], category=None
+) -> List[DuplicateTicket]:
+    """
+    Likely duplicates of a new ticket, most similar first: the user's own open
+    tickets and, when a category is given, anyone's tickets in that category
+    from the last TICKET_DUPLICATE_WINDOW_DAYS. Text is compared the way
+    tickets.search_text is built.
+    """
+    # Applies to the % operator for the rest of this transaction only
+    cur.execute(
+        "SELECT set_config('pg_trgm.similarity_threshold', %s, true)",
+        (str(settings.TICKET_DUPLICATE_SIMILARITY),),
+    )
+    branches = [_OWN_OPEN]
+    if category:
+        branches.append(_RECENT_IN_CATEGORY)
+    cur.execute(
+        f"""SELECT id, user_id, subject, status, assigned_to,
+                   similarity(search_text, %(text)s)
+            FROM ({' UNION '.join(f'({branch})' for branch in branches)}) candidates
+            ORDER BY 6 DESC, id DESC
+            LIMIT %(limit)s""",
+        {
+            "user_id": user_id,
+            "text": f"{subject} {description or ''}",
+            "category": category,
+            "window": f"{settings.TICKET_DUPLICATE_WINDOW_DAYS} days",
+            "limit": MAX_DUPLICATES,
+        },
+    )
+    return [DuplicateTicket(*row) for row in cur.fetchall()]
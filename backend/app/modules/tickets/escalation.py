@@ -0,0 +1,140 @@
+from app.config import settings
+from app.database.db import get_db_connection
+from app.logger import logger
+from app.modules.tickets.assignment import least_loaded, support_workloads
+from app.utils.periodic import PeriodicWorker
+
+# One LIMITed range scan of idx_tickets_status_priority_updated_at per
+# (policy, open status): only tickets already past their SLA are read, oldest
+# first. Escalating a ticket moves its updated_at to now, out of the range, so
+# each pass picks up where the last one stopped without a cursor.
+CLAIM_BREACHED = """
+    SELECT t.id, t.subject, t.priority, t.assigned_to, t.escalation_level + 1,
+           p.breach_after_minutes, p.notify_admins_from_level
+    FROM ticket_sla_policies p
+    CROSS JOIN (VALUES ('open'::ticket_status), ('in_progress'::ticket_status))
+        AS s(status)
+    CROSS JOIN LATERAL (
+        SELECT id, subject, priority, assigned_to, escalation_level
+        FROM tickets
+        WHERE status = s.status
+          AND priority = p.priority
+          AND updated_at < LOCALTIMESTAMP - p.breach_after_minutes * INTERVAL '1 minute'
+        ORDER BY updated_at
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    ) t
+"""
+
+ESCALATE = """
+    UPDATE tickets t
+    SET assigned_to = v.assigned_to,
+        escalation_level = t.escalation_level + 1,
+        escalated_at = CURRENT_TIMESTAMP,
+        updated_at = CURRENT_TIMESTAMP
+    FROM unnest(%s::int[], %s::int[]) AS v(id, assigned_to)
+    WHERE t.id = v.id
+"""
+
+NOTIFY = """
+    INSERT INTO notifications (user_id, type, priority, body)
+    SELECT user_id, 'support_ticket', 'high', body
+    FROM unnest(%s::int[], %s::text[]) AS n(user_id, body)
+"""
+
+
+class TicketEscalationEngine(PeriodicWorker):
+    """
+    Escalates open tickets that went without activity for longer than their
+    priority's ticket_sla_policies entry: each breach reassigns the ticket to
+    the least-loaded support user (preferring someone other than the current
+    assignee) and notifies the people involved, admins too from the policy's
+    notify_admins_from_level. Breached tickets are claimed with SKIP LOCKED,
+    so every worker process can run the engine.
+    """
+
+    job = "escalating tickets"
+
+    def __init__(self, interval: float, batch_size: int):
+        super().__init__(interval)
+        self.batch_size = batch_size
+
+    def escalate_batch(self) -> int:
+        """Escalate up to batch_size breached tickets per policy and status."""
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(CLAIM_BREACHED, (self.batch_size,))
+                breached = cur.fetchall()
+                if not breached:
+                    return 0
+
+                workloads = support_workloads(cur)
+                cur.execute(
+                    """SELECT id FROM users
+                       WHERE role = 'admin' AND status = 'active'
+                         AND deleted_at IS NULL"""
+                )
+                admin_ids = [row[0] for row in cur.fetchall()]
+
+                ticket_ids, assignees = [], []
+                recipients, bodies = [], []
+                for (
+                    ticket_id,
+                    subject,
+                    priority,
+                    previous,
+                    level,
+                    breach_after,
+                    admins_from_level,
+                ) in breached:
+                    assignee = least_loaded(workloads, exclude=previous)
+                    if assignee is not None and assignee != previous:
+                        # Keeps the rest of the batch balanced
+                        workloads[assignee] += 1
+                        if previous in workloads:
+                            workloads[previous] -= 1
+                    ticket_ids.append(ticket_id)
+                    assignees.append(assignee if assignee is not None else previous)
+
+                    summary = (
+                        f'Ticket #{ticket_id} "{subject}" ({priority}) breached its '
+                        f"{breach_after}-minute SLA (escalation {level})"
+                    )
+                    notify = {}
+                    if assignee is not None:
+                        notify[assignee] = f"{summary} and is now assigned to you."
+                    if previous is not None and previous != assignee:
+                        notify[previous] = f"{summary} and was reassigned."
+                    if level >= admins_from_level:
+                        for admin_id in admin_ids:
+                            notify.setdefault(admin_id, f"{summary}.")
+                    for user_id, body in notify.items():
+                        recipients.append(user_id)
+                        bodies.append(body)
+
+                cur.execute(ESCALATE, (ticket_ids, assignees))
+                if recipients:
+                    cur.execute(NOTIFY, (recipients, bodies))
+                return len(ticket_ids)
+
+    def escalate_all(self) -> int:
+        """Work through every current breach, a batch per transaction."""
+        escalated = 0
+        while True:
+            count = self.escalate_batch()
+            escalated += count
+            # Smaller than one full batch per policy and status: nothing left
+            if count < self.batch_size:
+                return escalated
+
+    def run_once(self):
+        escalated = self.escalate_all()
+        if escalated:
+            logger.info(f"Escalated {escalated} ticket(s) past their SLA")
+
+
+# Singleton instance
+ticket_escalation_engine = TicketEscalationEngine(
+    interval=settings.TICKET_ESCALATION_INTERVAL,
+    batch_size=settings.TICKET_ESCALATION_BATCH_SIZE,
+)
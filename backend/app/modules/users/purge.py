@@ -0,0 +1,252 @@
+import time
+
+from app.config import settings
+from app.database.db import get_db_connection
+from app.logger import logger
+from app.modules.cache.invalidation_bus import invalidation_bus
+from app.modules.cache.relation_cache import relation_cache
+from app.modules.cache.user_cache import user_cache
+from app.modules.tickets.assignment import least_loaded, support_workloads
+from app.utils.periodic import PeriodicWorker
+
+# A deletion whose progress hasn't moved for this long is picked up again
+STALE_AFTER = "5 minutes"
+
+# (step, batch statement). Each statement touches at most %(batch)s rows of the
+# user's data; a step repeats until a batch comes back short. Deleting
+# group_members rows goes through trg_group_member_count, so member counts are
+# adjusted as the memberships disappear.
+PURGE_STEPS = (
+    (
+        "relations",
+        """DELETE FROM relations WHERE id IN (
+               SELECT id FROM relations
+               WHERE senior_citizen_id = %(user_id)s OR family_member_id = %(user_id)s
+               LIMIT %(batch)s)""",
+    ),
+    (
+        # Assignees are chosen per ticket by _ticket_assignments
+        "ticket_reassignment",
+        """UPDATE tickets t
+           SET assigned_to = v.assigned_to, updated_at = CURRENT_TIMESTAMP
+           FROM unnest(%(ticket_ids)s::int[], %(assignees)s::int[])
+               AS v(id, assigned_to)
+           WHERE t.id = v.id""",
+    ),
+    (
+        "tickets",
+        """DELETE FROM tickets WHERE id IN (
+               SELECT id FROM tickets WHERE user_id = %(user_id)s LIMIT %(batch)s)""",
+    ),
+    (
+        "group_members",
+        """DELETE FROM group_members WHERE id IN (
+               SELECT id FROM group_members
+               WHERE user_id = %(user_id)s
+                  OR group_id IN (
+                      SELECT id FROM interest_groups WHERE created_by = %(user_id)s)
+               LIMIT %(batch)s)""",
+    ),
+    (
+        "interest_groups",
+        """DELETE FROM interest_groups WHERE id IN (
+               SELECT id FROM interest_groups WHERE created_by = %(user_id)s
+               LIMIT %(batch)s)""",
+    ),
+    (
+        "notifications",
+        """DELETE FROM notifications WHERE (id, created_at) IN (
+               SELECT id, created_at FROM notifications WHERE user_id = %(user_id)s
+               LIMIT %(batch)s)""",
+    ),
+    (
+        "task_assignments",
+        """UPDATE tasks SET assigned_to = NULL, updated_at = CURRENT_TIMESTAMP
+           WHERE id IN (
+               SELECT id FROM tasks
+               WHERE assigned_to = %(user_id)s AND created_by <> %(user_id)s
+               LIMIT %(batch)s)""",
+    ),
+    (
+        "task_recurrence_assignments",
+        """UPDATE task_recurrences SET assigned_to = NULL, updated_at = CURRENT_TIMESTAMP
+           WHERE id IN (
+               SELECT id FROM task_recurrences
+               WHERE assigned_to = %(user_id)s AND created_by <> %(user_id)s
+               LIMIT %(batch)s)""",
+    ),
+    (
+        # Takes the rules' task_occurrence_notices along (at most a day's worth)
+        "task_recurrences",
+        """DELETE FROM task_recurrences WHERE id IN (
+               SELECT id FROM task_recurrences WHERE created_by = %(user_id)s
+               LIMIT %(batch)s)""",
+    ),
+    (
+        "tasks",
+        """DELETE FROM tasks WHERE id IN (
+               SELECT id FROM tasks WHERE created_by = %(user_id)s LIMIT %(batch)s)""",
+    ),
+    (
+        "care_requests",
+        """DELETE FROM care_requests WHERE id IN (
+               SELECT id FROM care_requests
+               WHERE senior_citizen_id = %(user_id)s
+                  OR caregiver_id = %(user_id)s
+                  OR made_by = %(user_id)s
+               LIMIT %(batch)s)""",
+    ),
+    (
+        "video_analysis_jobs",
+        """DELETE FROM video_analysis_jobs WHERE id IN (
+               SELECT id FROM video_analysis_jobs WHERE user_id = %(user_id)s
+               LIMIT %(batch)s)""",
+    ),
+)
+
+# Caches that list other users' links to the purged user
+STEP_EVENTS = {
+    "relations": "relations",
+    "group_members": "interest_groups",
+    "interest_groups": "interest_groups",
+}
+
+
+class UserPurger(PeriodicWorker):
+    """
+    Finishes admin user deletions in the background. delete_user only marks
+    the user (users.deleted_at), which hides them at once; this worker then
+    removes their data in small batches, each in its own short transaction,
+    and records progress in user_deletions. The final DELETE FROM users has
+    nothing left to cascade over. Safe to run in every worker process.
+    """
+
+    job = "purging deleted users"
+
+    def __init__(self, interval: float, batch_size: int, pause: float):
+        super().__init__(interval)
+        self.batch_size = batch_size
+        self.pause = pause
+
+    def _claim(self):
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """UPDATE user_deletions
+                       SET status = 'purging', updated_at = CURRENT_TIMESTAMP
+                       WHERE user_id = (
+                           SELECT user_id FROM user_deletions
+                           WHERE status = 'pending'
+                              OR (status = 'purging'
+                                  AND updated_at < CURRENT_TIMESTAMP - %s::interval)
+                           ORDER BY requested_at
+                           LIMIT 1
+                           FOR UPDATE SKIP LOCKED
+                       )
+                       RETURNING user_id""",
+                    (STALE_AFTER,),
+                )
+                row = cur.fetchone()
+                return row[0] if row else None
+
+    def _ticket_assignments(self, cur, params):
+        """
+        Next batch of tickets assigned to the user, each open one going to the
+        support user with the fewest open tickets at that point, as in
+        create_ticket; closed ones are left unassigned.
+        """
+        cur.execute(
+            """SELECT id, status::text FROM tickets
+               WHERE assigned_to = %(user_id)s
+               ORDER BY id
+               LIMIT %(batch)s
+               FOR UPDATE""",
+            params,
+        )
+        tickets = cur.fetchall()
+        # The user being purged is no longer an active support user
+        workloads = support_workloads(cur) if tickets else {}
+        ticket_ids, assignees = [], []
+        for ticket_id, status in tickets:
+            assignee = None
+            if status != "closed":
+                assignee = least_loaded(workloads)
+                if assignee is not None:
+                    # Keeps the rest of the batch balanced
+                    workloads[assignee] += 1
+            ticket_ids.append(ticket_id)
+            assignees.append(assignee)
+        return {"ticket_ids": ticket_ids, "assignees": assignees}
+
+    def _run_batch(self, step, statement, params) -> int:
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                if step == "ticket_reassignment":
+                    params = {**params, **self._ticket_assignments(cur, params)}
+                cur.execute(statement, params)
+                affected = cur.rowcount
+                reassigned = affected if step == "ticket_reassignment" else 0
+                cur.execute(
+                    """UPDATE user_deletions
+                       SET current_step = %s,
+                           rows_processed = rows_processed + %s,
+                           tickets_reassigned = tickets_reassigned + %s,
+                           updated_at = CURRENT_TIMESTAMP
+                       WHERE user_id = %s""",
+                    (step, affected, reassigned, params["user_id"]),
+                )
+                if affected and step in STEP_EVENTS:
+                    invalidation_bus.publish(cur, STEP_EVENTS[step])
+        return affected
+
+    def purge(self, user_id) -> bool:
+        """Purge one user's data; returns False if interrupted by shutdown."""
+        params = {"user_id": user_id, "batch": self.batch_size}
+        for step, statement in PURGE_STEPS:
+            while True:
+                if self._stopping.is_set():
+                    # Resumed from this step once the deletion goes stale
+                    return False
+                affected = self._run_batch(step, statement, params)
+                if step == "relations" and affected:
+                    relation_cache.invalidate()
+                if affected < self.batch_size:
+                    break
+                time.sleep(self.pause)
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM users WHERE id = %s", (user_id,))
+                cur.execute(
+                    """UPDATE user_deletions
+                       SET status = 'completed', current_step = NULL,
+                           updated_at = CURRENT_TIMESTAMP,
+                           completed_at = CURRENT_TIMESTAMP
+                       WHERE user_id = %s""",
+                    (user_id,),
+                )
+                invalidation_bus.publish(cur, "users", user_id)
+        user_cache.invalidate(user_id)
+        return True
+
+    def process_pending(self) -> int:
+        purged = 0
+        while not self._stopping.is_set():
+            user_id = self._claim()
+            if user_id is None:
+                break
+            if self.purge(user_id):
+                logger.info(f"Purged deleted user {user_id}")
+                purged += 1
+        return purged
+
+    def run_once(self):
+        self.process_pending()
+
+
+# Singleton instance
+user_purger = UserPurger(
+    interval=settings.USER_PURGE_INTERVAL,
+    batch_size=settings.USER_PURGE_BATCH_SIZE,
+    pause=settings.USER_PURGE_BATCH_PAUSE,
+)
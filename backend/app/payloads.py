@@ -1,6 +1,6 @@
 from datetime import date, datetime
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, field_validator, model_validator
 
@@ -34,6 +34,12 @@ class TaskStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+class RecurrenceFrequency(str, Enum):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+
+
 class TicketStatus(str, Enum):
     OPEN = "open"
     IN_PROGRESS = "in_progress"
@@ -77,19 +83,62 @@ class LinkSeniorCitizenRequest(BaseModel):
     relation: str
 
 
-class CreateCareRequest(BaseModel):
+class Coordinates(BaseModel):
+    """Optional location in WGS84 degrees; both or neither must be given."""
+
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+
+    @field_validator("latitude")
+    @classmethod
+    def validate_latitude(cls, v):
+        if v is not None and not -90 <= v <= 90:
+            raise ValueError("Latitude must be between -90 and 90")
+        return v
+
+    @field_validator("longitude")
+    @classmethod
+    def validate_longitude(cls, v):
+        if v is not None and not -180 <= v <= 180:
+            raise ValueError("Longitude must be between -180 and 180")
+        return v
+
+    @model_validator(mode="after")
+    def validate_pair(self):
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError("Latitude and longitude must be given together")
+        return self
+
+
+class CreateCareRequest(Coordinates):
     id_token: str
     caregiver_firebase_uid: str
     timing_to_visit: datetime
     location: str
+    visit_duration_minutes: int = 60
+
+    @field_validator("visit_duration_minutes")
+    @classmethod
+    def validate_visit_duration(cls, v):
+        if v < 1:
+            raise ValueError("Visit duration must be at least one minute")
+        return v
 
 
 class UpdateCareRequest(BaseModel):
     id_token: str
     status: Optional[CareRequestStatus] = None
     timing_to_visit: Optional[datetime] = None
+    visit_duration_minutes: Optional[int] = None
     location: Optional[str] = None
 
+    @field_validator("visit_duration_minutes")
+    @classmethod
+    def validate_visit_duration(cls, v):
+        if v is not None and v < 1:
+            raise ValueError("Visit duration must be at least one minute")
+        return v
+
 
 class ApplyCareRequest(BaseModel):
     id_token: str
@@ -116,6 +165,27 @@ class RejectCaregiverRequest(BaseModel):
     request_id: int
 
 
+class TaskRecurrence(BaseModel):
+    frequency: RecurrenceFrequency
+    interval: int = 1  # every N days / weeks / months
+    by_weekday: Optional[List[int]] = None  # weekly only; 0 = Monday ... 6 = Sunday
+    until: Optional[datetime] = None
+
+    @field_validator("interval")
+    @classmethod
+    def validate_interval(cls, v):
+        if v < 1:
+            raise ValueError("Interval must be at least 1")
+        return v
+
+    @field_validator("by_weekday")
+    @classmethod
+    def validate_by_weekday(cls, v):
+        if v is not None and (not v or any(day < 0 or day > 6 for day in v)):
+            raise ValueError("by_weekday must list weekdays from 0 (Monday) to 6")
+        return v
+
+
 class CreateTask(BaseModel):
     id_token: str
     title: Optional[str] = None  # Optional when using AI mode
@@ -129,6 +199,8 @@ class CreateTask(BaseModel):
     priority: Optional[str] = "medium"
     category: Optional[str] = "other"
     estimated_duration: Optional[int] = None  # in minutes
+    # Stores a recurring task; time_of_completion is its first occurrence
+    recurrence: Optional[TaskRecurrence] = None
 
     @field_validator("priority")
     @classmethod
@@ -174,6 +246,11 @@ class CreateTask(BaseModel):
         return values
 
 
+class CompleteOccurrence(BaseModel):
+    id_token: str
+    occurrence_at: datetime
+
+
 class UpdateTask(BaseModel):
     id_token: str
     title: Optional[str] = None
@@ -183,6 +260,14 @@ class UpdateTask(BaseModel):
     assigned_to_firebase_uid: Optional[str] = None
 
 
+class UpdateRecurrence(BaseModel):
+    id_token: str
+    title: Optional[str] = None
+    description: Optional[str] = None
+    until: Optional[datetime] = None
+    assigned_to_firebase_uid: Optional[str] = None
+
+
 class CreateInterestGroup(BaseModel):
     title: str
     description: Optional[str] = None
@@ -273,7 +358,7 @@ class UnregisteredUser(BaseModel):
     full_name: str
 
 
-class RegistrationRequest(BaseModel):
+class RegistrationRequest(Coordinates):
     id_token: str
     full_name: str
     role: UserRole
@@ -295,6 +380,14 @@ class RegistrationRequest(BaseModel):
         return v
 
 
+class BulkImportUser(RegistrationRequest):
+    """One row of an admin bulk import: registration rules, identity given up front."""
+
+    id_token: Optional[str] = None
+    gmail_id: str
+    firebase_uid: str
+
+
 class RegistrationResponse(BaseModel):
     user: User
     message: str
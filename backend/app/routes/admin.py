@@ -17,6 +17,11 @@ async def delete_user(request: Request, userId: int, validated_data: TokenReques
     return await admin_controller.delete_user(request, userId, validated_data)
 
 
+@router.get("/admin/users/{userId}/deletion")
+async def get_user_deletion(request: Request, userId: int):
+    return await admin_controller.get_user_deletion(request, userId)
+
+
 @router.get("/admin/caregivers")
 async def get_caregivers_for_review(request: Request):
     return await admin_controller.get_caregivers_for_review(request)
@@ -61,3 +66,13 @@ async def resolve_ticket(
 @router.get("/admin/tickets/stats")
 async def get_ticket_stats(request: Request):
     return await admin_controller.get_ticket_stats(request)
+
+
+@router.get("/admin/export/{entity}")
+async def export_data(request: Request, entity: str):
+    return await admin_controller.export_data(request, entity)
+
+
+@router.post("/admin/import/users")
+async def import_users(request: Request):
+    return await admin_controller.import_users(request)
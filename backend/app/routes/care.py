@@ -49,6 +49,28 @@ async def get_caregivers(request: Request):
     return await care_controller.get_caregivers(request)
 
 
+@router.get("/caregivers/availability")
+async def get_caregiver_availability(request: Request):
+    """
+    Free/busy of active caregivers between 'start' and 'end' (ISO datetimes, at
+    most 31 days apart), optionally limited to 'caregiver_ids'.
+
+    Example: GET /caregivers/availability?start=2025-02-04T10:00:00&end=2025-02-04T12:00:00&caregiver_ids=5,7
+    """
+    return await care_controller.get_caregiver_availability(request)
+
+
+@router.get("/caregivers/nearby")
+async def get_nearby_caregivers(request: Request):
+    """
+    Active caregivers nearest to 'lat'/'lng', within 'radius' km (default 10),
+    optionally with one of the comma-separated 'tags'; at most 'limit' (default 20).
+
+    Example: GET /caregivers/nearby?lat=12.97&lng=77.59&radius=5&tags=elderly care
+    """
+    return await care_controller.get_nearby_caregivers(request)
+
+
 @router.get("/caregivers/{caregiverId}")
 async def get_caregiver_profile(request: Request, caregiverId: int):
     return await care_controller.get_caregiver_profile(request, caregiverId)
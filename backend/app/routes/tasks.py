@@ -1,5 +1,11 @@
 from app.controllers import tasks as tasks_controller
-from app.payloads import CreateTask, TokenRequest, UpdateTask
+from app.payloads import (
+    CompleteOccurrence,
+    CreateTask,
+    TokenRequest,
+    UpdateRecurrence,
+    UpdateTask,
+)
 from app.utils.request_validator import validate_body
 from fastapi import APIRouter, Request
 
@@ -15,6 +21,15 @@ async def get_tasks(request: Request):
     to get tasks related to a specific senior citizen they are linked to.
 
     Example: GET /tasks?senior_citizen_id=9
+
+    Pass 'include_occurrences=true' to also get the occurrences of recurring
+    tasks due in the next 7 days, in a separate 'occurrences' list of the first
+    page.
+
+    Pass 'from' and 'to' (ISO datetimes, at most a year apart) to get every task
+    due in that range, including the occurrences of recurring tasks.
+
+    Example: GET /tasks?from=2025-02-01T00:00:00&to=2025-02-08T00:00:00
     """
     return await tasks_controller.get_tasks(request)
 
@@ -25,6 +40,39 @@ async def create_task(request: Request, validated_data: CreateTask):
     return await tasks_controller.create_task(request, validated_data)
 
 
+@router.get("/tasks/recurring/{recurrenceId}")
+async def get_recurrence(request: Request, recurrenceId: int):
+    return await tasks_controller.get_recurrence(request, recurrenceId)
+
+
+@router.put("/tasks/recurring/{recurrenceId}")
+@validate_body(UpdateRecurrence)
+async def update_recurrence(
+    request: Request, recurrenceId: int, validated_data: UpdateRecurrence
+):
+    return await tasks_controller.update_recurrence(
+        request, recurrenceId, validated_data
+    )
+
+
+@router.post("/tasks/recurring/{recurrenceId}/complete")
+@validate_body(CompleteOccurrence)
+async def complete_occurrence(
+    request: Request, recurrenceId: int, validated_data: CompleteOccurrence
+):
+    return await tasks_controller.complete_occurrence(
+        request, recurrenceId, validated_data
+    )
+
+
+@router.delete("/tasks/recurring/{recurrenceId}")
+@validate_body(TokenRequest)
+async def end_recurrence(
+    request: Request, recurrenceId: int, validated_data: TokenRequest
+):
+    return await tasks_controller.end_recurrence(request, recurrenceId, validated_data)
+
+
 @router.get("/tasks/{taskId}")
 async def get_task(request: Request, taskId: int):
     return await tasks_controller.get_task(request, taskId)
@@ -0,0 +1,115 @@
+import asyncio
+import gzip
+from typing import Optional
+
+from app.config import settings
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; fall back to gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def supported_encodings():
+    """Encodings we can produce, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported encoding allowed by an Accept-Encoding header."""
+    qualities = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name] = quality
+
+    for encoding in supported_encodings():
+        if qualities.get(encoding, qualities.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.BROTLI_COMPRESSION_QUALITY)
+    return gzip.compress(body, compresslevel=settings.GZIP_COMPRESSION_LEVEL)
+
+
+async def compress_async(body: bytes, encoding: str) -> bytes:
+    """Compress small bodies inline and large ones in a worker thread."""
+    if len(body) >= settings.COMPRESSION_THREAD_THRESHOLD:
+        return await asyncio.to_thread(compress, body, encoding)
+    return compress(body, encoding)
+
+
+class CompressionMiddleware:
+    """
+    Negotiated brotli/gzip compression for buffered responses above
+    COMPRESSION_MIN_SIZE. Streaming responses and responses that already carry
+    a Content-Encoding (e.g. pre-compressed cache entries) pass through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, _CompressingSend(send, encoding))
+
+
+class _CompressingSend:
+    def __init__(self, send, encoding):
+        self.send = send
+        self.encoding = encoding
+        self.start_message = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        start_message, self.start_message = self.start_message, None
+        headers = MutableHeaders(raw=list(start_message["headers"]))
+        body = message.get("body", b"")
+
+        if (
+            message.get("more_body", False)
+            or "content-encoding" in headers
+            or len(body) < settings.COMPRESSION_MIN_SIZE
+            or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+        ):
+            self.passthrough = True
+            await self.send(start_message)
+            await self.send(message)
+            return
+
+        body = await compress_async(body, self.encoding)
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(body))
+        headers.add_vary_header("Accept-Encoding")
+        await self.send({**start_message, "headers": headers.raw})
+        await self.send({"type": "http.response.body", "body": body})
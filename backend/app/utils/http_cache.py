@@ -0,0 +1,53 @@
+import hashlib
+
+from fastapi.responses import Response
+
+
+def get_table_versions(cursor, tables):
+    """
+    Read the change counters maintained by the bump_table_version trigger.
+    This is a primary-key lookup, far cheaper than running the list query itself.
+    """
+    cursor.execute(
+        """SELECT table_name, SUM(version) FROM table_versions
+           WHERE table_name = ANY(%s)
+           GROUP BY table_name""",
+        (list(tables),),
+    )
+    versions = dict(cursor.fetchall())
+    return [int(versions.get(table) or 0) for table in tables]
+
+
+def make_etag(*parts):
+    """Build a weak ETag (the body may be served with different encodings)."""
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def is_not_modified(request, etag):
+    """Check the request's If-None-Match header against the current ETag."""
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: ignore the W/ prefix on both sides
+    current = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == current
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified_response(etag, cache_control):
+    return Response(
+        status_code=304, headers={"ETag": etag, "Cache-Control": cache_control}
+    )
+
+
+def set_cache_headers(response, etag, cache_control):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    if cache_control.startswith("private"):
+        response.headers["Vary"] = "Authorization"
+    return response
@@ -0,0 +1,271 @@
+import asyncio
+import hashlib
+import json
+import re
+import time
+import uuid
+from typing import Dict, Optional
+
+from app.config import settings
+from app.logger import logger
+from app.modules.auth.auth_service import auth_service
+from app.modules.idempotency import store
+from app.utils.response_formatter import format_response
+from starlette.datastructures import Headers
+
+# POST endpoints whose retries would repeat expensive work or create rows twice
+IDEMPOTENT_ROUTES = tuple(
+    re.compile(pattern)
+    for pattern in (
+        r"/api/tasks",
+        r"/api/auth/register",
+        r"/api/tickets",
+        r"/api/care-requests",
+        r"/api/me/request-caregiver",
+        r"/api/senior-citizens/\d+/request-caregiver",
+        r"/api/caregivers/requests/\d+/apply",
+    )
+)
+MAX_KEY_LENGTH = 255
+REPLAYED_HEADER = (b"idempotent-replayed", b"true")
+
+
+def is_idempotent_route(method: str, path: str) -> bool:
+    return method == "POST" and any(
+        pattern.fullmatch(path) for pattern in IDEMPOTENT_ROUTES
+    )
+
+
+def _digest(*parts) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _id_token(headers, body: bytes) -> Optional[str]:
+    """
+    The caller's Firebase ID token: the Authorization header's bearer token or,
+    for registration, the id_token field of the JSON body.
+    """
+    auth_header = headers.get("authorization", "")
+    if auth_header.startswith("Bearer "):
+        return auth_header.split(" ")[1]
+    try:
+        id_token = json.loads(body).get("id_token")
+    except (ValueError, AttributeError):
+        return None
+    return id_token if isinstance(id_token, str) else None
+
+
+def _caller_uid(headers, body: bytes) -> Optional[str]:
+    """Firebase uid of the caller, or None without a valid token."""
+    id_token = _id_token(headers, body)
+    if not id_token:
+        return None
+    try:
+        return auth_service.verify_id_token(id_token).get("uid")
+    except ValueError:
+        return None
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _replaying_receive(body: bytes, receive):
+    """Hand the already consumed body to the app, then defer to the server."""
+    delivered = False
+
+    async def replay():
+        nonlocal delivered
+        if not delivered:
+            delivered = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
+
+
+class IdempotencyMiddleware:
+    """
+    Honours an Idempotency-Key header on IDEMPOTENT_ROUTES. The first request
+    with a key runs normally and its response is kept in idempotency_keys for
+    IDEMPOTENCY_KEY_TTL_HOURS; retries get that response back (marked with
+    Idempotent-Replayed) without running the handler again. A duplicate that
+    arrives while the first request is still running waits for its response,
+    up to IDEMPOTENCY_WAIT_TIMEOUT. Keys are scoped to the caller's Firebase
+    uid (so a refreshed token still replays), method and path; reusing one
+    with a different body is rejected, and requests without a valid token are
+    left to the handler to reject. The first request renews its claim while it
+    runs. Server errors are not kept, so the next retry runs the request again.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        # Keys whose first request runs in this process, set when it finishes
+        self._in_flight: Dict[str, asyncio.Event] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not is_idempotent_route(
+            scope["method"], scope["path"]
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        key = headers.get("idempotency-key")
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            response = format_response(
+                status_code=400,
+                message=f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters.",
+            )
+            await response(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        receive = _replaying_receive(body, receive)
+        uid = await asyncio.to_thread(_caller_uid, headers, body)
+        if uid is None:
+            await self.app(scope, receive, send)
+            return
+
+        key_hash = _digest(
+            uid,
+            scope["method"],
+            scope["path"],
+            scope["query_string"],
+            key,
+        )
+        request_hash = _digest(body)
+
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+        while True:
+            event = self._in_flight.get(key_hash)
+            if event is None:
+                # Registered before claiming so duplicates in this process wait
+                # on it instead of polling
+                event = self._in_flight[key_hash] = asyncio.Event()
+                owner = uuid.uuid4().hex
+                try:
+                    claimed = await asyncio.to_thread(
+                        store.claim_key, key_hash, request_hash, owner
+                    )
+                except BaseException:
+                    self._in_flight.pop(key_hash).set()
+                    raise
+                if claimed:
+                    await self._execute(scope, receive, send, key_hash, owner)
+                    return
+                self._in_flight.pop(key_hash).set()
+                event = None
+
+                stored = await asyncio.to_thread(store.get_stored_response, key_hash)
+                if stored is not None and stored.request_hash != request_hash:
+                    response = format_response(
+                        status_code=422,
+                        message="Idempotency-Key was already used with a different request.",
+                    )
+                    await response(scope, receive, send)
+                    return
+                if stored is not None and stored.status_code is not None:
+                    await self._replay(send, stored)
+                    return
+
+            # Running elsewhere (or released just now): wait and check again
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                response = format_response(
+                    status_code=409,
+                    message="A request with this Idempotency-Key is still in progress.",
+                )
+                await response(scope, receive, send)
+                return
+            if event is not None:
+                try:
+                    await asyncio.wait_for(event.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(min(settings.IDEMPOTENCY_POLL_INTERVAL, remaining))
+
+    async def _execute(self, scope, receive, send, key_hash, owner):
+        recorder = _RecordingSend(send)
+        heartbeat = asyncio.create_task(self._renew(key_hash, owner))
+        try:
+            await self.app(scope, receive, recorder)
+        finally:
+            heartbeat.cancel()
+            try:
+                if recorder.complete and recorder.status_code < 500:
+                    await asyncio.to_thread(
+                        store.store_response,
+                        key_hash,
+                        owner,
+                        recorder.status_code,
+                        recorder.headers,
+                        b"".join(recorder.chunks),
+                    )
+                else:
+                    await asyncio.to_thread(store.release_key, key_hash, owner)
+            except Exception as e:
+                logger.error(f"Error saving idempotent response: {e}")
+            finally:
+                self._in_flight.pop(key_hash).set()
+
+    async def _renew(self, key_hash, owner):
+        """Keep a slow first request's claim from being taken over as abandoned."""
+        while True:
+            await asyncio.sleep(settings.IDEMPOTENCY_LOCK_TIMEOUT / 3)
+            try:
+                if not await asyncio.to_thread(store.renew_claim, key_hash, owner):
+                    return
+            except Exception as e:
+                logger.warning(f"Error renewing idempotency key claim: {e}")
+
+    async def _replay(self, send, stored):
+        headers = [
+            (name.encode("latin-1"), value.encode("latin-1"))
+            for name, value in stored.headers
+        ]
+        await send(
+            {
+                "type": "http.response.start",
+                "status": stored.status_code,
+                "headers": headers + [REPLAYED_HEADER],
+            }
+        )
+        await send({"type": "http.response.body", "body": stored.body})
+
+
+class _RecordingSend:
+    def __init__(self, send):
+        self.send = send
+        self.status_code = None
+        self.headers = []
+        self.chunks = []
+        self.complete = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.status_code = message["status"]
+            self.headers = [
+                [name.decode("latin-1"), value.decode("latin-1")]
+                for name, value in message["headers"]
+            ]
+        elif message["type"] == "http.response.body":
+            self.chunks.append(message.get("body", b""))
+            self.complete = not message.get("more_body", False)
+        await self.send(message)
@@ -0,0 +1,52 @@
+import asyncio
+import threading
+
+from app.logger import logger
+
+
+class PeriodicWorker:
+    """
+    Base for background jobs that run every `interval` seconds while the app is
+    up; an interval of 0 or less disables the job. Subclasses implement
+    run_once(), which runs in a worker thread so it may block on the database.
+    A failed round is logged and the job carries on with the next one.
+    """
+
+    # Completes the "Error <job>: ..." log line of a failed round
+    job = "running a periodic job"
+    # Whether the first round runs at start() or only after one interval
+    run_at_start = False
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task = None
+        # Set by stop(); long rounds check it to end between batches
+        self._stopping = threading.Event()
+
+    def run_once(self):
+        raise NotImplementedError
+
+    async def _run(self):
+        if not self.run_at_start:
+            await asyncio.sleep(self.interval)
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:
+                logger.error(f"Error {self.job}: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None and self.interval > 0:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._stopping.set()
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
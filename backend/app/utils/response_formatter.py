@@ -2,7 +2,7 @@ import json
 from datetime import date, datetime
 from typing import Any, Optional
 
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 
 class CustomJSONEncoder(json.JSONEncoder):
@@ -12,6 +12,37 @@ class CustomJSONEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+def serialize_response(message: str, data: Optional[Any] = None) -> bytes:
+    """
+    Render the standard response envelope to the exact bytes JSONResponse would send.
+    """
+    return json.dumps(
+        {"message": message, "data": data},
+        cls=CustomJSONEncoder,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def json_data_response(status_code: int, message: str, data_json: str) -> Response:
+    """
+    Wrap an already rendered JSON `data` document (e.g. built by Postgres) in
+    the standard envelope without parsing it.
+    """
+    body = b"".join(
+        (
+            b'{"message":',
+            json.dumps(message, ensure_ascii=False).encode("utf-8"),
+            b',"data":',
+            data_json.encode("utf-8"),
+            b"}",
+        )
+    )
+    return Response(
+        content=body, status_code=status_code, media_type="application/json"
+    )
+
+
 def format_response(
     status_code: int,
     message: str,
@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+# Tests that need PostgreSQL run against TEST_DATABASE_URL and are skipped when
+# it is unset. The schema there is dropped and recreated from schema.sql, so
+# never point it at a database you want to keep.
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+# Settings are read at import time; keep tests away from real credentials
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL or "postgresql://localhost/test"
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ["TEST_MODE"] = "true"
+os.environ["DATABASE_REPLICA_URLS"] = ""
+
+# app/modules/auth/test_*.py is the TEST_MODE auth stand-in, not a test module
+collect_ignore_glob = ["app/*"]
+
+
+@pytest.fixture
+def database():
+    """A freshly initialized test database with the seed data from schema.sql."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    from app.database.db import close_pool
+    from app.database.init_db import initialize_schema
+    from app.modules.cache.relation_cache import relation_cache
+    from app.modules.cache.user_cache import user_cache
+
+    initialize_schema()
+    relation_cache.invalidate()
+    user_cache.invalidate()
+    yield
+    close_pool()
+
+
+@pytest.fixture
+def client(database):
+    """HTTP client for the app; TEST_MODE accepts the tokens in test_data.py."""
+    from fastapi.testclient import TestClient
+    from main import app
+
+    return TestClient(app)
+
+
+def bearer(token):
+    return {"Authorization": f"Bearer {token}"}
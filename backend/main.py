@@ -1,9 +1,21 @@
 import argparse
+import asyncio
 import os
 from contextlib import asynccontextmanager
 
+from app.config import settings
+from app.database.db import close_pool, init_pool, track_request_user
 from app.database.init_db import initialize_schema
 from app.logger import logger
+from app.modules.cache.invalidation_bus import invalidation_bus
+from app.modules.cache.relation_cache import track_relation_lookups
+from app.modules.idempotency.store import idempotency_key_purger
+from app.modules.interest_groups.member_counts import member_count_folder
+from app.modules.notifications.partitions import notification_partition_maintainer
+from app.modules.onboarding.video_analysis import video_analysis_worker
+from app.modules.tasks.deadline_scheduler import deadline_scheduler
+from app.modules.tickets.escalation import ticket_escalation_engine
+from app.modules.users.purge import user_purger
 from app.routes import admin as admin_routes
 from app.routes import auth as auth_routes
 from app.routes import care as care_routes
@@ -13,9 +25,15 @@ from app.routes import notifications as notifications_routes
 from app.routes import tasks as tasks_routes
 from app.routes import tickets as tickets_routes
 from app.routes import user as user_routes
-from fastapi import FastAPI
+from app.utils.compression import CompressionMiddleware
+from app.utils.idempotency import IdempotencyMiddleware
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
+# Every worker needs a useful share of DB_CONNECTION_BUDGET; raise the worker
+# count (and the budget) explicitly rather than following the CPU count
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -32,12 +50,36 @@ async def lifespan(app: FastAPI):
             logger.error(f"Failed to initialize database schema: {e}")
             raise
 
+    init_pool()
+    invalidation_bus.start()
+    member_count_folder.start()
+    video_analysis_worker.start()
+    notification_partition_maintainer.start()
+    user_purger.start()
+    deadline_scheduler.start()
+    ticket_escalation_engine.start()
+    idempotency_key_purger.start()
+
     yield
+    # Uvicorn drains in-flight requests before running this part of the lifespan
+    await member_count_folder.stop()
+    await video_analysis_worker.stop()
+    await notification_partition_maintainer.stop()
+    await user_purger.stop()
+    await ticket_escalation_engine.stop()
+    await idempotency_key_purger.stop()
+    await asyncio.to_thread(deadline_scheduler.stop)
+    await asyncio.to_thread(invalidation_bus.stop)
+    close_pool()
     logger.info("Application shutdown")
 
 
 app = FastAPI(lifespan=lifespan)
 
+# Replay responses to retried POSTs that carry an Idempotency-Key. Innermost, so
+# stored bodies are uncompressed and replays still get CORS headers.
+app.add_middleware(IdempotencyMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -47,6 +89,32 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+# Compress large JSON responses (gzip, or brotli when installed)
+app.add_middleware(CompressionMiddleware)
+
+
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    # Users who just wrote read from the primary until replicas catch up; the
+    # write is announced to every worker when its transaction commits
+    track_request_user()
+    return await call_next(request)
+
+
+@app.middleware("http")
+async def relation_cache_stats(request: Request, call_next):
+    # Report how many relations queries the relationship cache saved
+    stats = track_relation_lookups()
+    response = await call_next(request)
+    if stats["hits"] or stats["loads"]:
+        response.headers["X-Relation-Queries-Saved"] = str(stats["hits"])
+        logger.debug(
+            f"{request.method} {request.url.path}: relation cache "
+            f"{stats['hits']} hit(s), {stats['loads']} load(s)"
+        )
+    return response
+
+
 app.include_router(auth_routes.router, prefix="/api")
 app.include_router(user_routes.router, prefix="/api")
 app.include_router(family_routes.router, prefix="/api")
@@ -85,21 +153,58 @@ def main():
     parser.add_argument(
         "--reload", action="store_true", help="Enable auto-reload for development"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("WEB_CONCURRENCY", DEFAULT_WORKERS)),
+        help=(
+            "Number of worker processes "
+            f"(default: $WEB_CONCURRENCY or {DEFAULT_WORKERS})"
+        ),
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=30,
+        help="Seconds to wait for in-flight requests on shutdown (default: 30)",
+    )
 
     args = parser.parse_args()
 
+    workers = max(1, args.workers)
+    if args.reload and workers > 1:
+        logger.info("Auto-reload enabled, running a single worker process")
+        workers = 1
+
+    # Workers read this to size their share of the database connection budget
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    settings.WEB_CONCURRENCY = workers
+
     # Set environment variable for database initialization
     if args.init_db:
         os.environ["INIT_DB_ON_STARTUP"] = "true"
         logger.info("Database schema will be initialized on startup")
 
+    if workers > 1 and os.getenv("INIT_DB_ON_STARTUP", "false").lower() == "true":
+        # Initialize once in the supervisor instead of once per worker
+        initialize_schema()
+        close_pool()
+        os.environ["INIT_DB_ON_STARTUP"] = "false"
+
     # Import uvicorn here to avoid import issues
     import uvicorn
 
-    logger.info(f"Starting server on {args.host}:{args.port}")
+    logger.info(f"Starting server on {args.host}:{args.port} with {workers} worker(s)")
 
     # Start the server
-    uvicorn.run("main:app", host=args.host, port=args.port, reload=args.reload)
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        reload=args.reload,
+        workers=workers,
+        timeout_graceful_shutdown=args.graceful_timeout,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,154 @@
+import io
+
+import pytest
+from app.database.db import get_db_connection
+from app.modules.onboarding import video_analysis
+from app.modules.onboarding.bulk_import import _read_rows, _validate, import_users
+from app.modules.onboarding.video_analysis import MAX_ATTEMPTS, VideoAnalysisWorker
+from app.payloads import UserRole
+
+
+def _rows(text, fmt):
+    return list(_read_rows(io.BytesIO(text.encode()), fmt))
+
+
+def test_csv_rows_are_numbered_from_the_first_data_line():
+    rows = _rows("full_name,role\nAsha,senior_citizen\nRohan,family_member\n", "csv")
+    assert rows == [
+        (1, {"full_name": "Asha", "role": "senior_citizen"}),
+        (2, {"full_name": "Rohan", "role": "family_member"}),
+    ]
+
+
+def test_ndjson_reports_bad_lines_and_skips_blank_ones():
+    rows = _rows('{"full_name": "Asha"}\n\nnot json\n[1, 2]\n', "ndjson")
+    assert rows == [
+        (1, {"full_name": "Asha"}),
+        (3, "Invalid JSON."),
+        (4, "Expected a JSON object."),
+    ]
+
+
+def _raw(**overrides):
+    raw = {
+        "gmail_id": "new.senior@example.com",
+        "firebase_uid": "bulk_uid_001",
+        "full_name": "New Senior",
+        "role": "senior_citizen",
+    }
+    raw.update(overrides)
+    return raw
+
+
+def test_blank_cells_and_extra_columns_are_dropped():
+    row = _validate({**_raw(description="", tags=None), None: ["extra"]})
+    assert row.role == UserRole.SENIOR_CITIZEN
+    assert row.description is None
+
+
+@pytest.mark.parametrize(
+    "raw, message",
+    [
+        ("Invalid JSON.", "Invalid JSON."),
+        (_raw(role="admin"), "role: admin accounts cannot be bulk imported"),
+        (_raw(role="pilot"), "role: "),
+        (_raw(full_name="x" * 256), "full_name: must be at most 255 characters"),
+        (_raw(latitude="12.5"), "Value error, Latitude and longitude must be"),
+    ],
+)
+def test_invalid_rows_raise_readable_errors(raw, message):
+    with pytest.raises(ValueError) as error:
+        _validate(raw)
+    assert str(error.value).startswith(message)
+
+
+def _import(text):
+    return import_users(io.BytesIO(text.encode()), "csv")
+
+
+def test_import_inserts_updates_and_rejects(database):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("UPDATE users SET deleted_at = now() WHERE id = 7")
+
+    result = _import(
+        "gmail_id,firebase_uid,full_name,role,youtube_url\n"
+        "new.cg@example.com,bulk_uid_001,New Caregiver,caregiver,https://youtu.be/x\n"
+        "rohan.family@example.com,story_rohan_uid_001,Rohan K,family_member,\n"
+        "caregiver2@test.com,test_caregiver_uid_002,Revived,caregiver,https://youtu.be/y\n"
+        "other@example.com,bulk_uid_001,Again,senior_citizen,\n"
+    )
+    assert result["rows"] == 4
+    assert (result["inserted"], result["updated"], result["failed"]) == (1, 1, 2)
+    assert result["queued_video_analysis"] == 1
+    assert result["errors"] == [
+        {"row": 3, "error": "firebase_uid belongs to a deleted user."},
+        {"row": 4, "error": "Duplicate firebase_uid in file."},
+    ]
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT full_name FROM users WHERE id IN (4, 7) ORDER BY id")
+            assert cur.fetchall() == [("Rohan K",), ("Test Caregiver Two",)]
+
+
+@pytest.fixture
+def queued_jobs(database):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """INSERT INTO video_analysis_jobs (user_id, youtube_url, attempts)
+                   VALUES (5, 'https://youtu.be/ok', 0),
+                          (7, 'https://youtu.be/bad', 0),
+                          (6, 'https://youtu.be/last', %s)
+                   RETURNING id""",
+                (MAX_ATTEMPTS - 1,),
+            )
+            return [row[0] for row in cur.fetchall()]
+
+
+def _jobs():
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """SELECT youtube_url, attempts, claimed_at IS NOT NULL
+                   FROM video_analysis_jobs ORDER BY id"""
+            )
+            return cur.fetchall()
+
+
+def test_failed_jobs_are_retried_then_dropped(queued_jobs, monkeypatch):
+    def analyse(youtube_url, full_name):
+        if youtube_url != "https://youtu.be/ok":
+            raise RuntimeError("analysis failed")
+        return {"tags": "patient,kind", "description": "Analysed"}
+
+    processor = video_analysis.youtube_processor
+    monkeypatch.setattr(processor, "generate_caregiver_analysis", analyse)
+    monkeypatch.setattr(processor, "generate_interest_group_admin_analysis", analyse)
+    worker = VideoAnalysisWorker(interval=0, batch_size=10)
+
+    assert worker.process_batch() == 1
+    # The failure is released for the next pass; the last attempt is dropped
+    assert _jobs() == [("https://youtu.be/bad", 1, False)]
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT tags, description FROM users WHERE id = 5")
+            assert cur.fetchone() == ("patient,kind", "Analysed")
+
+    for _ in range(MAX_ATTEMPTS - 1):
+        assert worker.process_batch() == 0
+    assert _jobs() == []
+
+
+def test_exhausted_jobs_from_crashed_workers_are_dropped(queued_jobs):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """UPDATE video_analysis_jobs
+                   SET attempts = %s, claimed_at = now() - interval '1 hour'""",
+                (MAX_ATTEMPTS,),
+            )
+
+    assert VideoAnalysisWorker(interval=0, batch_size=10).process_batch() == 0
+    assert _jobs() == []
@@ -0,0 +1,103 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from app.controllers.care import insert_care_request
+from app.database.db import get_db_connection
+from conftest import bearer
+
+ATTEMPTS = 8
+
+
+def _insert_concurrently(senior_citizen_id, made_by, check_senior_citizen_id=None):
+    barrier = threading.Barrier(ATTEMPTS)
+
+    def attempt():
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                barrier.wait(5)
+                return insert_care_request(
+                    cur,
+                    senior_citizen_id,
+                    5,  # Priya
+                    made_by,
+                    None,
+                    "Home",
+                    check_senior_citizen_id=check_senior_citizen_id,
+                )
+
+    with ThreadPoolExecutor(max_workers=ATTEMPTS) as executor:
+        return list(executor.map(lambda _: attempt(), range(ATTEMPTS)))
+
+
+def _active_requests(made_by):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """SELECT COUNT(*) FROM care_requests
+                   WHERE caregiver_id = 5 AND made_by = %s
+                     AND status IN ('pending', 'accepted')""",
+                (made_by,),
+            )
+            return cur.fetchone()[0]
+
+
+@pytest.mark.parametrize(
+    "senior_citizen_id, made_by, check_senior_citizen_id",
+    [
+        (3, 3, None),  # Asha for herself
+        (None, 4, 3),  # Rohan's direct request, checked against Asha
+    ],
+)
+def test_concurrent_submissions_create_one_request(
+    database, senior_citizen_id, made_by, check_senior_citizen_id
+):
+    results = _insert_concurrently(senior_citizen_id, made_by, check_senior_citizen_id)
+
+    created = [request_id for request_id, _ in results if request_id is not None]
+    assert len(created) == 1
+    assert all(
+        error.startswith("Duplicate care request not allowed")
+        for request_id, error in results
+        if request_id is None
+    )
+    assert _active_requests(made_by) == 1
+
+
+def test_accepted_direct_request_is_reported(database):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            request_id, _ = insert_care_request(cur, None, 5, 4, None, "Home", 3)
+            cur.execute(
+                "UPDATE care_requests SET status = 'accepted' WHERE id = %s",
+                (request_id,),
+            )
+            assert insert_care_request(cur, None, 5, 4, None, "Home", 3) == (
+                None,
+                "Duplicate care request not allowed. You already have a accepted request with this caregiver.",
+            )
+
+
+def test_overlaps_are_only_reported_to_those_who_may_accept(client):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            # Priya (5) already visits Asha (3) at 10:00; a second request overlaps
+            cur.execute(
+                """INSERT INTO care_requests
+                       (senior_citizen_id, caregiver_id, made_by, timing_to_visit, status)
+                   VALUES (3, 5, 4, '2030-01-01 10:00', 'accepted'),
+                          (3, 5, 3, '2030-01-01 10:30', 'pending')
+                   RETURNING id"""
+            )
+            request_id = cur.fetchall()[1][0]
+
+    def accept(token):
+        return client.post(
+            "/api/me/accept-caregiver-request",
+            headers=bearer(token),
+            json={"request_id": request_id},
+        ).status_code
+
+    # A senior citizen unrelated to the request learns nothing about it
+    assert accept("test_senior_token_002") == 404
+    assert accept("story_asha_token_001") == 409
@@ -0,0 +1,103 @@
+import asyncio
+import gzip
+
+import pytest
+from app.config import settings
+from app.utils import compression
+from app.utils.compression import _CompressingSend, choose_encoding
+
+JSON = [(b"content-type", b"application/json")]
+
+
+@pytest.fixture
+def gzip_only(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip", "gzip"),
+        ("GZIP, deflate", "gzip"),
+        ("gzip; q=0.5", "gzip"),
+        ("gzip;q=0", None),
+        ("gzip;q=0.0, deflate", None),
+        ("gzip;q=nonsense", None),
+        ("*", "gzip"),
+        ("*;q=0", None),
+        # An explicit q=0 wins over the wildcard
+        ("*, gzip;q=0", None),
+        ("identity, deflate", None),
+        ("", None),
+    ],
+)
+def test_choose_encoding(gzip_only, accept_encoding, expected):
+    assert choose_encoding(accept_encoding) == expected
+
+
+@pytest.mark.skipif(compression.brotli is None, reason="brotli is not installed")
+def test_brotli_is_preferred_unless_refused():
+    assert choose_encoding("gzip, br") == "br"
+    assert choose_encoding("gzip, br;q=0") == "gzip"
+    assert choose_encoding("*") == "br"
+
+
+def _send_through(messages, encoding="gzip"):
+    """Feed ASGI messages through _CompressingSend; returns what it sent on."""
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def main():
+        compressing_send = _CompressingSend(send, encoding)
+        for message in messages:
+            await compressing_send(message)
+
+    asyncio.run(main())
+    return sent
+
+
+def _start(headers=JSON):
+    return {"type": "http.response.start", "status": 200, "headers": headers}
+
+
+def _body(body, more_body=False):
+    return {"type": "http.response.body", "body": body, "more_body": more_body}
+
+
+def test_large_bodies_are_compressed():
+    body = b'{"data": "' + b"x" * settings.COMPRESSION_MIN_SIZE + b'"}'
+    start, message = _send_through([_start(), _body(body)])
+
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"content-length"] == str(len(message["body"])).encode()
+    assert headers[b"vary"] == b"Accept-Encoding"
+    assert gzip.decompress(message["body"]) == body
+
+
+@pytest.mark.parametrize(
+    "headers, body",
+    [
+        # Below COMPRESSION_MIN_SIZE
+        (JSON, b'{"data": null}'),
+        # Already encoded, e.g. a pre-compressed cache entry
+        (JSON + [(b"content-encoding", b"br")], b"\x00" * 4096),
+        ([(b"content-type", b"image/png")], b"\x00" * 4096),
+    ],
+)
+def test_other_bodies_pass_through(headers, body):
+    messages = [_start(headers), _body(body)]
+    assert _send_through(messages) == messages
+
+
+def test_streaming_responses_pass_through():
+    chunk = b"x" * 4096
+    messages = [
+        _start(),
+        _body(chunk, more_body=True),
+        _body(chunk, more_body=True),
+        _body(b""),
+    ]
+    assert _send_through(messages) == messages
@@ -0,0 +1,152 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app.database.db import get_db_connection
+from conftest import bearer
+
+ASHA = "story_asha_token_001"
+ROHAN = "story_rohan_token_001"
+SENIOR_TWO = "test_senior_token_002"
+FAMILY_TWO = "test_family_token_002"
+CONCURRENCY = 8
+
+
+def _concurrently(*calls):
+    """Start every call at once and return their status codes in order."""
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        futures = [executor.submit(call) for call in calls]
+        return [future.result().status_code for future in futures]
+
+
+def _member_counts(group_id):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """SELECT current_member_count(id, member_count),
+                          (SELECT COUNT(*) FROM group_members WHERE group_id = %s)
+                   FROM interest_groups WHERE id = %s""",
+                (group_id, group_id),
+            )
+            return cur.fetchone()
+
+
+def test_concurrent_joins_add_one_membership(client):
+    # Laughter Yoga Club (2) has no members in the seed data
+    statuses = _concurrently(
+        *[
+            lambda: client.post("/api/interest-groups/2/join", headers=bearer(ASHA))
+            for _ in range(CONCURRENCY)
+        ]
+    )
+    assert sorted(statuses) == [200] + [400] * (CONCURRENCY - 1)
+    assert _member_counts(2) == (1, 1)
+
+
+def test_concurrent_joins_and_leaves_keep_the_count_exact(client):
+    def join(token):
+        return lambda: client.post("/api/interest-groups/2/join", headers=bearer(token))
+
+    def leave(token):
+        return lambda: client.delete(
+            "/api/interest-groups/2/leave", headers=bearer(token)
+        )
+
+    _concurrently(join(ASHA), join(ROHAN))
+    statuses = _concurrently(
+        leave(ASHA), leave(ASHA), join(SENIOR_TWO), join(FAMILY_TWO), leave(ROHAN)
+    )
+    assert sorted(statuses) == [200, 200, 200, 200, 400]
+    assert _member_counts(2) == (2, 2)
+
+
+def _age_group(group_id):
+    """Backdate the group's updated_at; True if it moved since the last call."""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """UPDATE interest_groups g SET updated_at = '2000-01-01'
+                   FROM interest_groups old
+                   WHERE g.id = %s AND old.id = g.id
+                   RETURNING old.updated_at::date <> DATE '2000-01-01'""",
+                (group_id,),
+            )
+            return cur.fetchone()[0]
+
+
+def test_only_membership_changes_touch_the_group(client):
+    path = "/api/interest-groups/2"
+    _age_group(2)
+    assert client.post(f"{path}/join", headers=bearer(ASHA)).status_code == 200
+    assert _age_group(2)
+    assert client.post(f"{path}/join", headers=bearer(ASHA)).status_code == 400
+    assert not _age_group(2)
+    assert client.delete(f"{path}/leave", headers=bearer(ASHA)).status_code == 200
+    assert _age_group(2)
+    assert client.delete(f"{path}/leave", headers=bearer(ASHA)).status_code == 400
+    assert not _age_group(2)
+
+
+def test_concurrent_mark_as_read_succeeds_once(client):
+    # Notification 1 belongs to Rohan and is unread
+    statuses = _concurrently(
+        *[
+            lambda: client.post(
+                "/api/notifications/1/read",
+                headers=bearer(ROHAN),
+                json={"id_token": ROHAN},
+            )
+            for _ in range(CONCURRENCY)
+        ]
+    )
+    assert sorted(statuses) == [200] + [400] * (CONCURRENCY - 1)
+
+
+def test_concurrent_acceptance_of_overlapping_visits(client):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            # Two requests for Priya (5) at the same time, concerning Asha (3)
+            cur.execute(
+                """INSERT INTO care_requests
+                       (senior_citizen_id, caregiver_id, made_by, timing_to_visit)
+                   VALUES (3, 5, 4, '2030-01-01 10:00'), (3, 5, 3, '2030-01-01 10:30')
+                   RETURNING id"""
+            )
+            request_ids = [row[0] for row in cur.fetchall()]
+
+    statuses = _concurrently(
+        *[
+            lambda request_id=request_id: client.post(
+                "/api/me/accept-caregiver-request",
+                headers=bearer(ROHAN),
+                json={"request_id": request_id},
+            )
+            for request_id in request_ids
+        ]
+    )
+    assert sorted(statuses) == [200, 409]
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT status::text FROM care_requests WHERE id = ANY(%s)",
+                (request_ids,),
+            )
+            assert sorted(row[0] for row in cur.fetchall()) == ["accepted", "pending"]
+
+
+def test_concurrent_ticket_updates_respect_ownership(client):
+    # Ticket 2 belongs to Asha; Rohan may not change it
+    def update(token, subject):
+        return lambda: client.put(
+            "/api/tickets/2", headers=bearer(token), json={"subject": subject}
+        )
+
+    statuses = _concurrently(
+        *[update(ROHAN, "Changed by Rohan") for _ in range(CONCURRENCY // 2)],
+        *[update(ASHA, "Changed by Asha") for _ in range(CONCURRENCY // 2)],
+    )
+    assert sorted(statuses) == [200] * (CONCURRENCY // 2) + [403] * (CONCURRENCY // 2)
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT subject FROM tickets WHERE id = 2")
+            assert cur.fetchone() == ("Changed by Asha",)
@@ -0,0 +1,93 @@
+import csv
+import io
+import json
+
+import pytest
+from app.config import settings
+from app.controllers import admin
+from app.database.db import get_db_connection
+from app.modules.export.data_export import ExportStream, build_export_query
+from conftest import bearer
+
+ADMIN = "test_admin_token_001"
+
+
+def test_filters_are_parameterized_in_declaration_order():
+    query, params = build_export_query(
+        "tickets", {"assigned_to": "11", "status": "open", "unknown": "x"}
+    )
+    assert query.endswith(" AND t.status::text = %s AND t.assigned_to = %s ORDER BY 1")
+    assert params == ["open", 11]
+
+
+def test_empty_filters_are_ignored():
+    query, params = build_export_query("users", {"role": "", "status": None})
+    assert query.endswith("WHERE deleted_at IS NULL ORDER BY 1")
+    assert params == []
+
+
+def test_bad_filters_and_entities_raise():
+    with pytest.raises(ValueError):
+        build_export_query("care-requests", {"caregiver_id": "abc"})
+    with pytest.raises(KeyError):
+        build_export_query("passwords", {})
+
+
+def test_stream_is_chunked_with_one_header(database, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_ITERSIZE", 2)
+    query, params = build_export_query("users", {})
+    chunks = list(ExportStream("users", query, params, "csv"))
+
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+    assert rows[0][0] == "id"
+    assert len(chunks) == -(-(len(rows) - 1) // 2)
+    assert [int(row[0]) for row in rows[1:]] == sorted(int(row[0]) for row in rows[1:])
+
+
+def test_deleted_users_names_are_left_empty(client):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            # Rohan (4) raised ticket 1 and made no care requests yet
+            cur.execute(
+                """INSERT INTO care_requests (senior_citizen_id, caregiver_id, made_by)
+                   VALUES (3, 5, 4)"""
+            )
+            cur.execute("UPDATE users SET deleted_at = now() WHERE id = 4")
+
+    response = client.get(
+        "/api/admin/export/tickets?format=ndjson", headers=bearer(ADMIN)
+    )
+    assert response.status_code == 200
+    tickets = {row["id"]: row for row in map(json.loads, response.text.splitlines())}
+    assert tickets[1]["created_by_name"] is None
+    assert tickets[1]["assigned_to_name"] == "Test Support User One"
+
+    response = client.get(
+        "/api/admin/export/care-requests?format=ndjson&made_by=4",
+        headers=bearer(ADMIN),
+    )
+    (request,) = map(json.loads, response.text.splitlines())
+    assert request["requester_name"] is None
+    assert request["senior_citizen_name"] == "Asha"
+
+
+def test_busy_exports_get_a_status_before_streaming(client, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 0.1)
+    held = ExportStream("users", *build_export_query("users", {}), "csv")
+    try:
+        response = client.get("/api/admin/export/users", headers=bearer(ADMIN))
+        assert response.status_code == 503
+        assert "attachment" not in response.headers.get("content-disposition", "")
+    finally:
+        held.close()
+    assert (
+        client.get("/api/admin/export/users", headers=bearer(ADMIN)).status_code == 200
+    )
+
+
+def test_failing_exports_get_a_server_error(client, monkeypatch):
+    monkeypatch.setattr(
+        admin, "build_export_query", lambda entity, filters: ("SELECT 1 / 0", [])
+    )
+    response = client.get("/api/admin/export/users", headers=bearer(ADMIN))
+    assert response.status_code == 500
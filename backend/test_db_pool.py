@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from app.config import settings
+from app.database.db import BlockingConnectionPool, _Replica, get_pool_size
+from conftest import TEST_DATABASE_URL
+from psycopg2 import pool
+
+
+def test_pool_size_splits_budget_and_reserves_dedicated_connections(monkeypatch):
+    monkeypatch.setattr(settings, "DB_CONNECTION_BUDGET", 40)
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 4)
+    monkeypatch.setattr(settings, "CACHE_INVALIDATION_BUS", True)
+    monkeypatch.setattr(settings, "TASK_SCHEDULER_ENABLED", True)
+    monkeypatch.setattr(settings, "EXPORT_MAX_CONCURRENT", 2)
+    assert get_pool_size() == 6
+
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 40)
+    assert get_pool_size() == settings.DB_POOL_MIN_SIZE
+
+
+@pytest.fixture
+def small_pool(monkeypatch):
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 0.2)
+    db_pool = BlockingConnectionPool(0, 1, TEST_DATABASE_URL)
+    yield db_pool
+    db_pool.closeall()
+
+
+def test_getconn_waits_for_a_returned_connection(small_pool, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 5.0)
+    conn = small_pool.getconn()
+    threading.Timer(0.2, small_pool.putconn, args=(conn,)).start()
+
+    started = time.monotonic()
+    second = small_pool.getconn()
+    assert time.monotonic() - started >= 0.15
+    small_pool.putconn(second)
+
+
+def test_getconn_times_out_when_pool_stays_exhausted(small_pool):
+    conn = small_pool.getconn()
+    with pytest.raises(pool.PoolError):
+        small_pool.getconn()
+    small_pool.putconn(conn)
+    # The failed attempt did not use up a slot
+    small_pool.putconn(small_pool.getconn())
+
+
+def test_getconn_fails_fast_on_the_event_loop(small_pool, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 5.0)
+    conn = small_pool.getconn()
+
+    async def checkout():
+        return small_pool.getconn()
+
+    started = time.monotonic()
+    with pytest.raises(pool.PoolError):
+        asyncio.run(checkout())
+    assert time.monotonic() - started < 1
+    small_pool.putconn(conn)
+
+
+def test_lag_check_returns_a_transactional_connection(small_pool):
+    # The primary reports no lag, so it stands in for a replica here
+    replica = _Replica(0, TEST_DATABASE_URL)
+    try:
+        assert replica._check_lag()
+        conn = replica.pool.getconn()
+        assert not conn.autocommit
+        replica.pool.putconn(conn)
+    finally:
+        replica.pool.closeall()
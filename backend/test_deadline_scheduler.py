@@ -0,0 +1,88 @@
+import psycopg2
+import pytest
+from app.modules.tasks.deadline_scheduler import DeadlineScheduler
+from conftest import TEST_DATABASE_URL
+
+RULE_TITLES = ("Soon", "Late", "Done")
+
+
+@pytest.fixture
+def conn(database):
+    conn = psycopg2.connect(TEST_DATABASE_URL)
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        # Daily rules by Rohan (4) for Asha (3): one due within the reminder
+        # lead, one overdue, and one whose overdue occurrence was completed
+        cur.execute(
+            """INSERT INTO task_recurrences
+                   (title, frequency, starts_at, created_by, assigned_to)
+               VALUES ('Soon', 'daily', LOCALTIMESTAMP + interval '10 minutes', 4, 3),
+                      ('Late', 'daily', LOCALTIMESTAMP - interval '2 hours', 4, 3),
+                      ('Done', 'daily', LOCALTIMESTAMP - interval '3 hours', 4, 3)
+               RETURNING id"""
+        )
+        rule_ids = [row[0] for row in cur.fetchall()]
+        cur.execute(
+            """INSERT INTO tasks (title, time_of_completion, status, created_by,
+                                  assigned_to, recurrence_id)
+               SELECT title, starts_at, 'completed', created_by, assigned_to, id
+               FROM task_recurrences WHERE id = %s""",
+            (rule_ids[2],),
+        )
+    yield conn
+    conn.close()
+
+
+def _scheduler():
+    return DeadlineScheduler(
+        lead_minutes=30, horizon_hours=6, reload_interval=900, batch_size=200
+    )
+
+
+def _notifications(conn):
+    with conn.cursor() as cur:
+        cur.execute(
+            """SELECT user_id, priority::text, split_part(body, '"', 2)
+               FROM notifications
+               WHERE split_part(body, '"', 2) = ANY(%s)
+               ORDER BY 3, 1""",
+            (list(RULE_TITLES),),
+        )
+        return cur.fetchall()
+
+
+def test_occurrences_are_notified_once(conn):
+    scheduler = _scheduler()
+    scheduler._load(conn)
+    assert scheduler._fire_due(conn)
+    expected = [
+        (3, "high", "Late"),
+        (4, "high", "Late"),
+        (3, "medium", "Soon"),
+        (4, "medium", "Soon"),
+    ]
+    assert _notifications(conn) == expected
+
+    # A new leader finds the markers and does not repeat them
+    scheduler = _scheduler()
+    scheduler._load(conn)
+    scheduler._fire_due(conn)
+    assert _notifications(conn) == expected
+
+
+def test_ended_rules_are_unscheduled(conn):
+    scheduler = _scheduler()
+    scheduler._load(conn)
+    with conn.cursor() as cur:
+        cur.execute(
+            """UPDATE task_recurrences SET until = LOCALTIMESTAMP
+               WHERE title = 'Soon' RETURNING id"""
+        )
+        (rule_id,) = cur.fetchone()
+
+    scheduler._load(conn, rule_ids={rule_id})
+    assert not any(
+        isinstance(key, tuple) and key[0] == rule_id for key in scheduler._due_at
+    )
+    scheduler._fire_due(conn)
+    assert [title for _, _, title in _notifications(conn)] == ["Late", "Late"]
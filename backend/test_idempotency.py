@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+from app.config import settings
+from app.database.db import get_db_connection
+from app.modules.idempotency import store
+from app.utils.idempotency import (
+    IdempotencyMiddleware,
+    _digest,
+    _id_token,
+    is_idempotent_route,
+)
+from conftest import bearer
+from starlette.datastructures import Headers
+
+ASHA = "story_asha_token_001"
+ROHAN = "story_rohan_token_001"
+
+
+@pytest.mark.parametrize(
+    "method, path, expected",
+    [
+        ("POST", "/api/tasks", True),
+        ("POST", "/api/senior-citizens/12/request-caregiver", True),
+        ("POST", "/api/caregivers/requests/3/apply", True),
+        ("GET", "/api/tasks", False),
+        ("PUT", "/api/tickets", False),
+        ("POST", "/api/tasks/1/complete", False),
+        ("POST", "/api/senior-citizens/abc/request-caregiver", False),
+    ],
+)
+def test_is_idempotent_route(method, path, expected):
+    assert is_idempotent_route(method, path) is expected
+
+
+def test_digest_separates_its_parts():
+    assert _digest("ab", "c") != _digest("a", "bc")
+    assert _digest("a", b"b") == _digest(b"a", "b")
+    assert len(_digest()) == 64
+
+
+def test_id_token_from_header_or_body():
+    headers = Headers({"authorization": f"Bearer {ASHA}"})
+    assert _id_token(headers, b"") == ASHA
+    assert _id_token(Headers({}), b'{"id_token": "abc"}') == "abc"
+    assert _id_token(Headers({}), b'{"id_token": 5}') is None
+    assert _id_token(Headers({}), b"[1]") is None
+    assert _id_token(Headers({}), b"not json") is None
+
+
+def _create_ticket(client, token, key, subject="Idempotent ticket"):
+    return client.post(
+        "/api/tickets",
+        headers={**bearer(token), "Idempotency-Key": key},
+        json={"subject": subject, "description": "Created once"},
+    )
+
+
+def test_retries_are_replayed_per_user(client):
+    first = _create_ticket(client, ASHA, "key-1")
+    assert first.status_code == 201
+    retry = _create_ticket(client, ASHA, "key-1")
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+
+    # The same key from someone else is a different request
+    other = _create_ticket(client, ROHAN, "key-1")
+    assert "idempotent-replayed" not in other.headers
+    assert other.json()["data"]["ticket_id"] != first.json()["data"]["ticket_id"]
+
+    assert _create_ticket(client, ASHA, "key-1", "Changed").status_code == 422
+
+
+def test_requests_without_a_valid_token_are_not_stored(client):
+    response = _create_ticket(client, "not_a_token", "key-2")
+    assert response.status_code == 401
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*) FROM idempotency_keys")
+            assert cur.fetchone()[0] == 0
+
+
+def test_renew_claim_only_for_the_unfinished_owner(database):
+    assert store.claim_key("a" * 64, "b" * 64, "owner")
+    assert store.renew_claim("a" * 64, "owner")
+    assert not store.renew_claim("a" * 64, "someone-else")
+    store.store_response("a" * 64, "owner", 201, [], b"{}")
+    assert not store.renew_claim("a" * 64, "owner")
+
+
+def test_slow_requests_keep_their_claim(database, monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_LOCK_TIMEOUT", 0.6)
+    takeovers = []
+
+    async def slow_app(scope, receive, send):
+        # Longer than the lock timeout; only the renewals keep the claim
+        await asyncio.sleep(1.0)
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT key_hash FROM idempotency_keys")
+                (key_hash,) = cur.fetchone()
+        takeovers.append(store.claim_key(key_hash, "c" * 64, "intruder"))
+        await send({"type": "http.response.start", "status": 201, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def receive():
+        return {"type": "http.request", "body": b"{}", "more_body": False}
+
+    async def send(message):
+        pass
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/api/tickets",
+        "query_string": b"",
+        "headers": [
+            (b"authorization", f"Bearer {ASHA}".encode()),
+            (b"idempotency-key", b"slow"),
+        ],
+    }
+    asyncio.run(IdempotencyMiddleware(slow_app)(scope, receive, send))
+    assert takeovers == [False]
@@ -0,0 +1,41 @@
+import re
+from datetime import datetime
+
+import pytest
+from app.config import settings
+from conftest import bearer
+
+ISO_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?")
+
+
+def _parse_timestamps(value):
+    """Postgres drops trailing zeros from fractional seconds; Python keeps six."""
+    if isinstance(value, dict):
+        return {key: _parse_timestamps(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_parse_timestamps(item) for item in value]
+    if isinstance(value, str) and ISO_TIMESTAMP.fullmatch(value):
+        return datetime.fromisoformat(value)
+    return value
+
+
+@pytest.mark.parametrize(
+    "path, token",
+    [
+        ("/api/admin/users", "test_admin_token_001"),
+        ("/api/tickets", "test_admin_token_001"),
+        ("/api/tickets", "story_asha_token_001"),
+        ("/api/care-requests", "story_priya_token_001"),
+    ],
+)
+def test_postgres_rendering_matches_python_rendering(client, monkeypatch, path, token):
+    monkeypatch.setattr(settings, "RENDER_JSON_IN_DB", False)
+    rendered_in_python = client.get(path, headers=bearer(token))
+    monkeypatch.setattr(settings, "RENDER_JSON_IN_DB", True)
+    rendered_in_db = client.get(path, headers=bearer(token))
+
+    assert rendered_in_python.status_code == 200
+    assert rendered_in_db.status_code == 200
+    assert _parse_timestamps(rendered_in_db.json()) == _parse_timestamps(
+        rendered_in_python.json()
+    )
@@ -0,0 +1,70 @@
+import psycopg2
+from app.database.db import get_db_connection
+from app.modules.interest_groups.member_counts import member_count_folder
+from conftest import TEST_DATABASE_URL
+
+COUNTS = """SELECT ig.id, current_member_count(ig.id, ig.member_count),
+                   (SELECT COUNT(*) FROM group_members gm WHERE gm.group_id = ig.id)
+            FROM interest_groups ig ORDER BY ig.id"""
+
+
+def _counts():
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(COUNTS)
+            return cur.fetchall()
+
+
+def _assert_counts_match_members():
+    for group_id, member_count, members in _counts():
+        assert member_count == members, f"group {group_id}"
+
+
+def test_seeded_counts_match_memberships(database):
+    _assert_counts_match_members()
+
+
+def test_changes_from_several_backends_add_up(database):
+    # Each connection is its own backend, so the deltas land in different shards
+    connections = [psycopg2.connect(TEST_DATABASE_URL) for _ in range(4)]
+    try:
+        for user_id, conn in zip([4, 5, 7, 9], connections):
+            with conn, conn.cursor() as cur:
+                cur.execute(
+                    "INSERT INTO group_members (group_id, user_id) VALUES (1, %s)",
+                    (user_id,),
+                )
+        with connections[0], connections[0].cursor() as cur:
+            cur.execute("DELETE FROM group_members WHERE group_id = 1 AND user_id = 3")
+    finally:
+        for conn in connections:
+            conn.close()
+
+    _assert_counts_match_members()
+
+
+def test_fold_moves_deltas_into_the_base(database):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("INSERT INTO group_members (group_id, user_id) VALUES (2, 4)")
+            cur.execute("SELECT COUNT(DISTINCT group_id) FROM group_member_counts")
+            pending_groups = cur.fetchone()[0]
+
+    assert member_count_folder.fold() == pending_groups
+    assert member_count_folder.fold() == 0
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*) FROM group_member_counts")
+            assert cur.fetchone()[0] == 0
+            cur.execute("SELECT id, member_count FROM interest_groups ORDER BY id")
+            bases = cur.fetchall()
+    assert bases == [(group_id, members) for group_id, _, members in _counts()]
+
+
+def test_deleting_a_group_with_members(database):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM interest_groups WHERE id = 1")
+            cur.execute("SELECT COUNT(*) FROM group_member_counts WHERE group_id = 1")
+            assert cur.fetchone()[0] == 0
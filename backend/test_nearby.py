@@ -0,0 +1,106 @@
+import pytest
+from app.database.db import get_db_connection
+from app.modules.care.nearby import KM_PER_DEGREE, bounding_box, find_nearby_caregivers
+from conftest import bearer
+
+# Central Bangalore
+LAT, LNG = 12.9716, 77.5946
+
+
+def test_bounding_box_at_the_equator_is_square():
+    box = bounding_box(0.0, 10.0, KM_PER_DEGREE)
+    assert box == pytest.approx((-1.0, 9.0, 1.0, 11.0))
+
+
+def test_bounding_box_widens_towards_the_poles():
+    min_lat, min_lng, max_lat, max_lng = bounding_box(60.0, 10.0, KM_PER_DEGREE)
+    assert (min_lat, max_lat) == pytest.approx((59.0, 61.0))
+    # cos(60°) = 0.5: twice as many longitude degrees for the same distance
+    assert (min_lng, max_lng) == pytest.approx((8.0, 12.0))
+
+
+def test_bounding_box_is_clamped_at_the_poles():
+    min_lat, min_lng, max_lat, max_lng = bounding_box(90.0, 0.0, 50.0)
+    assert max_lat == 90.0
+    assert min_lat == pytest.approx(90.0 - 50.0 / KM_PER_DEGREE)
+    # cos(90°) = 0 would make the box infinitely wide; the clamp keeps it finite
+    lng_delta = 50.0 / (KM_PER_DEGREE * 0.01)
+    assert (min_lng, max_lng) == pytest.approx((-lng_delta, lng_delta))
+    assert bounding_box(-89.9, 0.0, 50.0)[0] == -90.0
+
+
+def test_bounding_box_is_cut_off_at_the_antimeridian():
+    min_lat, min_lng, max_lat, max_lng = bounding_box(0.0, 179.9, 50.0)
+    assert max_lng == 180.0
+    assert min_lng == pytest.approx(179.9 - 50.0 / KM_PER_DEGREE)
+    assert bounding_box(0.0, -179.9, 50.0)[1] == -180.0
+
+
+@pytest.fixture
+def caregivers(database):
+    """Priya (5) in central Bangalore and others around her."""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "UPDATE users SET latitude = %s, longitude = %s WHERE id = 5",
+                (LAT, LNG),
+            )
+            cur.execute(
+                """INSERT INTO users (gmail_id, firebase_uid, full_name, role, status,
+                                      tags, latitude, longitude, deleted_at)
+                   VALUES ('near@test.com', 'near_uid', 'Near', 'caregiver', 'active',
+                           'nurse, Home-Care', 12.99, 77.60, NULL),
+                          ('far@test.com', 'far_uid', 'Far', 'caregiver', 'active',
+                           'nurse', 13.30, 77.60, NULL),
+                          ('gone@test.com', 'gone_uid', 'Gone', 'caregiver', 'active',
+                           'nurse', 12.972, 77.595, now())"""
+            )
+            # Pending approval; not listed either
+            cur.execute(
+                """UPDATE users SET latitude = 12.972, longitude = 77.595
+                   WHERE firebase_uid = 'test_caregiver_uid_002'"""
+            )
+
+
+def _nearby(*args, **kwargs):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            return find_nearby_caregivers(cur, *args, **kwargs)
+
+
+def test_active_caregivers_within_the_radius_nearest_first(caregivers):
+    found = _nearby(LAT, LNG, radius_km=10)
+    assert [c["full_name"] for c in found] == ["Priya", "Near"]
+    assert found[0]["distance_km"] == 0
+    # About 2 km north
+    assert 1.5 < found[1]["distance_km"] < 2.5
+
+    assert [c["full_name"] for c in _nearby(LAT, LNG, radius_km=50)] == [
+        "Priya",
+        "Near",
+        "Far",
+    ]
+    assert [c["full_name"] for c in _nearby(LAT, LNG, radius_km=50, limit=1)] == [
+        "Priya"
+    ]
+
+
+def test_tags_match_whole_entries_case_insensitively(caregivers):
+    found = _nearby(LAT, LNG, radius_km=50, tags=[" home-care "])
+    assert [c["full_name"] for c in found] == ["Near"]
+    found = _nearby(LAT, LNG, radius_km=50, tags=["nurse", "physiotherapy"])
+    assert [c["full_name"] for c in found] == ["Priya", "Near", "Far"]
+    assert _nearby(LAT, LNG, radius_km=50, tags=["home"]) == []
+
+
+def test_nearby_endpoint_validates_the_search(caregivers, client):
+    headers = bearer("story_asha_token_001")
+    response = client.get(
+        f"/api/caregivers/nearby?lat={LAT}&lng={LNG}&radius=5", headers=headers
+    )
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()["data"]["caregivers"]][0] == 5
+
+    for query in ("lat=abc&lng=1", "lat=91&lng=0", "lat=0&lng=0&radius=500"):
+        response = client.get(f"/api/caregivers/nearby?{query}", headers=headers)
+        assert response.status_code == 400
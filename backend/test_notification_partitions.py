@@ -0,0 +1,114 @@
+import pytest
+from app.config import settings
+from app.database.db import get_db_connection
+from app.modules.notifications.partitions import NotificationPartitionMaintainer
+
+
+def _execute(query, params=()):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+            return cur.fetchall() if cur.description else None
+
+
+def _month(offset):
+    """(partition name, first day) of the month `offset` months from now."""
+    ((month_start,),) = _execute(
+        """SELECT (date_trunc('month', CURRENT_DATE)
+                   + make_interval(months => %s))::date""",
+        (offset,),
+    )
+    return f"notifications_{month_start:%Y_%m}", month_start
+
+
+def _notify(offset, is_read=True):
+    _, month_start = _month(offset)
+    _execute(
+        """INSERT INTO notifications (user_id, type, body, is_read, created_at)
+           VALUES (3, 'task', 'Partition test', %s, %s + interval '1 day')""",
+        (is_read, month_start),
+    )
+
+
+def _partitions():
+    return {
+        row[0]
+        for row in _execute(
+            """SELECT c.relname FROM pg_inherits i
+               JOIN pg_class c ON c.oid = i.inhrelid
+               WHERE i.inhparent = 'notifications'::regclass"""
+        )
+    }
+
+
+def test_rows_move_out_of_the_default_partition(database):
+    # The schema creates this month and three ahead; five ahead lands in default
+    name, _ = _month(5)
+    assert name not in _partitions()
+    _notify(5)
+    assert _execute("SELECT COUNT(*) FROM notifications_default") == [(1,)]
+
+    assert _execute("SELECT ensure_notification_partitions(6)") == [(3,)]
+    assert name in _partitions()
+    assert _execute("SELECT COUNT(*) FROM notifications_default") == [(0,)]
+    assert (
+        _execute(
+            """SELECT tableoid::regclass::text FROM notifications
+           WHERE body = 'Partition test'"""
+        )
+        == [(name,)]
+    )
+
+    # Nothing left to create
+    assert _execute("SELECT ensure_notification_partitions(6)") == [(0,)]
+
+
+def _old_partition(offset, *rows_read):
+    name, month_start = _month(offset)
+    _execute(
+        f"""CREATE TABLE {name} PARTITION OF notifications
+            FOR VALUES FROM (%s) TO (%s::date + interval '1 month')""",
+        (month_start, month_start),
+    )
+    for is_read in rows_read:
+        _notify(offset, is_read)
+    return name
+
+
+@pytest.fixture
+def old_partitions(database):
+    """Past months by retention outcome, for 6 months read, 12 months unread."""
+    return {
+        # Read months are kept for six full months after they end
+        "recent_read": _old_partition(-6, True),
+        "expired_read": _old_partition(-7, True, True),
+        "unread": _old_partition(-9, True, False),
+        "expired_unread": _old_partition(-13, False),
+    }
+
+
+def test_old_months_expire_once_read_or_past_the_unread_limit(old_partitions):
+    assert _execute("SELECT expire_notification_partitions(6, 12, FALSE)") == [(2,)]
+    remaining = _partitions()
+    assert old_partitions["recent_read"] in remaining
+    assert old_partitions["unread"] in remaining
+    for name in (old_partitions["expired_read"], old_partitions["expired_unread"]):
+        assert name not in remaining
+        assert _execute("SELECT to_regclass(%s)", (name,)) == [(None,)]
+    # Current and upcoming months are never touched
+    assert _month(0)[0] in remaining
+
+
+def test_expired_months_can_be_archived(old_partitions, monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATION_RETENTION_MONTHS", 6)
+    monkeypatch.setattr(settings, "NOTIFICATION_UNREAD_RETENTION_MONTHS", 12)
+    monkeypatch.setattr(settings, "NOTIFICATION_ARCHIVE_EXPIRED", True)
+    try:
+        assert NotificationPartitionMaintainer(interval=0).maintain() == (0, 2)
+        name = old_partitions["expired_read"]
+        assert name not in _partitions()
+        assert _execute(f"SELECT COUNT(*) FROM archived_{name}") == [(2,)]
+    finally:
+        # Detached tables are not part of the schema and survive its reset
+        for name in (old_partitions["expired_read"], old_partitions["expired_unread"]):
+            _execute(f"DROP TABLE IF EXISTS archived_{name}")
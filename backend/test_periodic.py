@@ -0,0 +1,56 @@
+import asyncio
+
+from app.utils.periodic import PeriodicWorker
+
+
+class Counter(PeriodicWorker):
+    job = "counting"
+
+    def __init__(self, interval, fail_first=False):
+        super().__init__(interval)
+        self.rounds = 0
+        self.fail_first = fail_first
+
+    def run_once(self):
+        self.rounds += 1
+        if self.fail_first and self.rounds == 1:
+            raise RuntimeError("first round fails")
+
+
+def _run_for(worker, seconds):
+    async def main():
+        worker.start()
+        await asyncio.sleep(seconds)
+        await worker.stop()
+
+    asyncio.run(main())
+
+
+def test_rounds_wait_for_the_interval():
+    worker = Counter(interval=0.2)
+    _run_for(worker, 0.1)
+    assert worker.rounds == 0
+
+    worker.run_at_start = True
+    _run_for(worker, 0.1)
+    assert worker.rounds == 1
+
+
+def test_a_failed_round_does_not_stop_the_worker():
+    worker = Counter(interval=0.05, fail_first=True)
+    _run_for(worker, 0.3)
+    assert worker.rounds >= 2
+
+
+def test_stop_signals_the_running_round():
+    worker = Counter(interval=0.05)
+    _run_for(worker, 0.1)
+    assert worker._stopping.is_set()
+    assert worker._task is None
+
+
+def test_zero_interval_disables_the_worker():
+    worker = Counter(interval=0)
+    worker.run_at_start = True
+    _run_for(worker, 0.05)
+    assert worker.rounds == 0
@@ -0,0 +1,91 @@
+import psycopg2
+import pytest
+from app.database import prepared
+from app.database.prepared import (
+    PreparingConnection,
+    _statement_name,
+    _to_positional,
+    execute_prepared,
+)
+from conftest import TEST_DATABASE_URL
+
+
+def test_placeholders_become_positional():
+    assert (
+        _to_positional("SELECT * FROM t WHERE a = %s AND b IN (%s, %s)")
+        == "SELECT * FROM t WHERE a = $1 AND b IN ($2, $3)"
+    )
+
+
+def test_escaped_percent_becomes_percent():
+    assert (
+        _to_positional("SELECT a %% 2, b FROM t WHERE c LIKE '10%%' AND d %% %s")
+        == "SELECT a % 2, b FROM t WHERE c LIKE '10%' AND d % $1"
+    )
+
+
+def test_quoted_text_is_not_rewritten():
+    assert (
+        _to_positional(
+            """SELECT 'it''s' AS "col%s" FROM t -- %s here is a comment
+               WHERE a = %s"""
+        )
+        == """SELECT 'it''s' AS "col%s" FROM t -- %s here is a comment
+               WHERE a = $1"""
+    )
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SELECT * FROM t WHERE a = %(a)s",
+        "SELECT 5 % 2",
+        "SELECT * FROM t WHERE name = '%s'",
+    ],
+)
+def test_unsupported_placeholders_are_rejected(query):
+    with pytest.raises(psycopg2.ProgrammingError):
+        _to_positional(query)
+
+
+@pytest.fixture
+def conn():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    conn = psycopg2.connect(TEST_DATABASE_URL, connection_factory=PreparingConnection)
+    yield conn
+    conn.close()
+
+
+def test_escaped_percent_runs_prepared(conn):
+    query = "SELECT %s %% 3, '10%%'"
+    with conn.cursor() as cur:
+        execute_prepared(cur, query, (5,))
+        assert cur.fetchone() == (2, "10%")
+        # Served from the prepared statement the second time
+        execute_prepared(cur, query, (7,))
+        assert cur.fetchone() == (1, "10%")
+    assert _statement_name(query) in conn.prepared_statements
+
+
+def test_rejected_prepare_falls_back_and_keeps_the_transaction(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1")
+        # PREPARE does not accept utility statements
+        execute_prepared(cur, "SHOW TimeZone")
+        assert cur.fetchone()
+        cur.execute("SELECT 2")
+        assert cur.fetchone() == (2,)
+    assert _statement_name("SHOW TimeZone") in prepared._unpreparable
+
+
+def test_statement_missing_from_registry_is_reused(conn):
+    query = "SELECT %s + 1"
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1")
+        execute_prepared(cur, query, (1,))
+        conn.prepared_statements.clear()
+        execute_prepared(cur, query, (2,))
+        assert cur.fetchone() == (3,)
+        cur.execute("SELECT 2")
+        assert cur.fetchone() == (2,)
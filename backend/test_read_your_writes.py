@@ -0,0 +1,71 @@
+import time
+
+import pytest
+from app.config import settings
+from app.database import db
+from app.modules.cache.invalidation_bus import invalidation_bus
+
+
+@pytest.fixture
+def clean_marks(monkeypatch):
+    monkeypatch.setattr(db, "_recent_writes", {})
+    monkeypatch.setattr(db, "_all_written_at", None)
+    db.track_request_user()
+
+
+def test_mark_pins_only_that_user(clean_marks):
+    db.mark_recent_write(3)
+    db.set_request_user(3)
+    assert db._wrote_recently()
+    db.set_request_user(4)
+    assert not db._wrote_recently()
+
+
+def test_mark_without_ids_pins_everyone(clean_marks):
+    db.mark_recent_write()
+    db.set_request_user(4)
+    assert db._wrote_recently()
+
+
+def test_marks_expire(clean_marks, monkeypatch):
+    db.mark_recent_write(3)
+    db.set_request_user(3)
+    monkeypatch.setattr(settings, "DB_READ_YOUR_WRITES_SECONDS", 0.0)
+    assert not db._wrote_recently()
+
+
+def test_only_committed_writes_are_announced(database, clean_marks, monkeypatch):
+    # Any replica makes get_db_connection announce writes
+    monkeypatch.setattr(db, "_replicas", [object()])
+    received = []
+    invalidation_bus.subscribe(db.RECENT_WRITES, lambda *ids: received.append(ids))
+    invalidation_bus.start()
+    try:
+        # Connecting flushes every subscriber, since events may have been missed
+        assert _wait_until(lambda: received)
+        received.clear()
+        db.set_request_user(3)
+
+        with db.get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+        with db.get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("UPDATE users SET full_name = full_name WHERE id = 3")
+
+        assert 3 in db._recent_writes
+        assert _wait_until(lambda: received)
+        time.sleep(0.2)
+        assert received == [(3,)]
+    finally:
+        invalidation_bus.stop()
+        invalidation_bus._callbacks[db.RECENT_WRITES].pop()
+
+
+def _wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
@@ -0,0 +1,198 @@
+from datetime import datetime, timedelta
+
+import pytest
+from app.database.db import get_db_connection
+from app.modules.tasks.recurrence import RecurrenceRule, parse_window
+from conftest import bearer
+
+ROHAN = "story_rohan_token_001"
+
+
+def _occurrences(frequency, starts_at, start, end, interval=1, **kwargs):
+    rule = RecurrenceRule(
+        frequency,
+        interval,
+        kwargs.get("by_weekday"),
+        datetime.fromisoformat(starts_at),
+        kwargs.get("until") and datetime.fromisoformat(kwargs["until"]),
+    )
+    return [
+        t.isoformat()
+        for t in rule.occurrences(
+            datetime.fromisoformat(start), datetime.fromisoformat(end)
+        )
+    ]
+
+
+def test_daily_every_other_day_from_a_late_window():
+    assert _occurrences(
+        "daily", "2025-01-01T09:00", "2025-03-01T00:00", "2025-03-06T00:00", 2
+    ) == ["2025-03-02T09:00:00", "2025-03-04T09:00:00"]
+
+
+def test_weekly_on_several_weekdays():
+    # 2025-01-06 is a Monday; every other week on Monday and Friday
+    assert _occurrences(
+        "weekly",
+        "2025-01-06T08:00",
+        "2025-01-06T00:00",
+        "2025-01-25T00:00",
+        2,
+        by_weekday=[4, 0],
+    ) == [
+        "2025-01-06T08:00:00",
+        "2025-01-10T08:00:00",
+        "2025-01-20T08:00:00",
+        "2025-01-24T08:00:00",
+    ]
+
+
+def test_monthly_skips_months_without_the_day():
+    assert _occurrences(
+        "monthly", "2025-01-31T10:00", "2025-01-01T00:00", "2025-06-01T00:00"
+    ) == ["2025-01-31T10:00:00", "2025-03-31T10:00:00", "2025-05-31T10:00:00"]
+
+
+def test_until_and_starts_at_bound_the_window():
+    assert _occurrences(
+        "daily",
+        "2025-01-03T09:00",
+        "2025-01-01T00:00",
+        "2025-01-10T00:00",
+        until="2025-01-05T09:00",
+    ) == ["2025-01-03T09:00:00", "2025-01-04T09:00:00", "2025-01-05T09:00:00"]
+    assert (
+        _occurrences(
+            "daily", "2025-02-01T09:00", "2025-01-01T00:00", "2025-01-10T00:00"
+        )
+        == []
+    )
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"from": "2025-01-01T00:00:00"},
+        {"from": "2025-01-02T00:00:00", "to": "2025-01-01T00:00:00"},
+        {"from": "2025-01-01T00:00:00", "to": "2026-06-01T00:00:00"},
+    ],
+)
+def test_invalid_windows_raise(params):
+    with pytest.raises(ValueError):
+        parse_window(params)
+
+
+def _create_rule(client, starts_at, **recurrence):
+    # By Rohan (4) for Asha (3)
+    response = client.post(
+        "/api/tasks",
+        headers=bearer(ROHAN),
+        json={
+            "id_token": ROHAN,
+            "title": "Evening walk",
+            "description": "Around the park",
+            "time_of_completion": starts_at.isoformat(),
+            "assigned_to_firebase_uid": "story_asha_uid_001",
+            "recurrence": {"frequency": "daily", **recurrence},
+        },
+    )
+    return response
+
+
+def test_upcoming_occurrences_are_listed_on_request(client):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT date_trunc('second', LOCALTIMESTAMP)")
+            starts_at = cur.fetchone()[0] + timedelta(hours=1)
+    response = _create_rule(client, starts_at)
+    assert response.status_code == 201
+    rule_id = response.json()["data"]["recurrence_id"]
+
+    # The default feed is unchanged
+    data = client.get("/api/tasks?limit=2", headers=bearer(ROHAN)).json()["data"]
+    assert "occurrences" not in data
+    assert len(data["tasks"]) == 2
+    assert all(task["id"] is not None for task in data["tasks"])
+
+    data = client.get(
+        "/api/tasks?limit=2&include_occurrences=true", headers=bearer(ROHAN)
+    ).json()["data"]
+    assert len(data["tasks"]) == 2
+    occurrences = data["occurrences"]
+    assert len(occurrences) == 7
+    assert {task["recurrence_id"] for task in occurrences} == {rule_id}
+    assert all(task["id"] is None for task in occurrences)
+
+    # Not repeated on later pages
+    data = client.get(
+        f"/api/tasks?limit=2&include_occurrences=true&cursor={data['next_cursor']}",
+        headers=bearer(ROHAN),
+    ).json()["data"]
+    assert "occurrences" not in data
+
+
+def test_rules_of_deleted_creators_cannot_be_managed(client):
+    rule_id = _create_rule(client, datetime(2025, 3, 1, 9, 0)).json()["data"][
+        "recurrence_id"
+    ]
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("UPDATE users SET deleted_at = now() WHERE id = 4")
+
+    asha = "story_asha_token_001"
+    path = f"/api/tasks/recurring/{rule_id}"
+    assert (
+        client.put(
+            path, headers=bearer(asha), json={"id_token": asha, "title": "x"}
+        ).status_code
+        == 404
+    )
+    assert (
+        client.post(
+            f"{path}/complete",
+            headers=bearer(asha),
+            json={"id_token": asha, "occurrence_at": "2025-03-02T09:00:00"},
+        ).status_code
+        == 404
+    )
+    assert (
+        client.request(
+            "DELETE", path, headers=bearer(asha), json={"id_token": asha}
+        ).status_code
+        == 404
+    )
+
+
+def test_until_must_follow_the_first_occurrence(client):
+    starts_at = datetime(2025, 3, 1, 9, 0)
+    response = _create_rule(client, starts_at, until=starts_at.isoformat())
+    assert response.status_code == 400
+
+
+def test_rules_can_be_read_and_updated(client):
+    starts_at = datetime(2025, 3, 1, 9, 0)
+    rule_id = _create_rule(client, starts_at).json()["data"]["recurrence_id"]
+    path = f"/api/tasks/recurring/{rule_id}"
+
+    response = client.put(
+        path,
+        headers=bearer(ROHAN),
+        json={"id_token": ROHAN, "title": "Morning walk", "until": "2025-02-01"},
+    )
+    assert response.status_code == 400
+    response = client.put(
+        path,
+        headers=bearer(ROHAN),
+        json={"id_token": ROHAN, "title": "Morning walk", "until": "2025-04-01"},
+    )
+    assert response.status_code == 200
+
+    response = client.get(path, headers=bearer(ROHAN))
+    rule = response.json()["data"]["recurrence"]
+    assert (rule["title"], rule["frequency"]) == ("Morning walk", "daily")
+    assert rule["until"].startswith("2025-04-01")
+
+    assert client.get(path, headers=bearer("story_priya_token_001")).status_code == 403
+    assert (
+        client.get("/api/tasks/recurring/999", headers=bearer(ROHAN)).status_code == 404
+    )
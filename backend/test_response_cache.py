@@ -0,0 +1,101 @@
+import asyncio
+import threading
+
+import pytest
+from app.modules.cache.response_cache import CachedResponse, ResponseCache
+
+
+def _entry(body=b"{}"):
+    return CachedResponse(200, body, 'W/"etag"')
+
+
+def test_concurrent_misses_share_one_load():
+    calls = []
+    release = threading.Event()
+
+    def loader():
+        calls.append(1)
+        release.wait(5)
+        return _entry()
+
+    async def main():
+        cache = ResponseCache(ttl=30)
+        first = asyncio.create_task(cache.get_or_load("k", loader))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(cache.get_or_load("k", loader))
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(first, second)
+
+    first, second = asyncio.run(main())
+    assert first is second
+    assert len(calls) == 1
+
+
+def test_load_error_reaches_waiters():
+    release = threading.Event()
+
+    def loader():
+        release.wait(5)
+        raise RuntimeError("boom")
+
+    async def main():
+        cache = ResponseCache(ttl=30)
+        first = asyncio.create_task(cache.get_or_load("k", loader))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(cache.get_or_load("k", loader))
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(first, second, return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_waiters_reload_when_the_leader_is_cancelled():
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        if len(calls) == 1:
+            release.wait(5)
+        return _entry()
+
+    async def main():
+        cache = ResponseCache(ttl=30)
+        leader = asyncio.create_task(cache.get_or_load("k", loader))
+        await asyncio.sleep(0.05)
+        waiter = asyncio.create_task(cache.get_or_load("k", loader))
+        await asyncio.sleep(0.05)
+        leader.cancel()
+        try:
+            return await asyncio.wait_for(waiter, timeout=2)
+        finally:
+            release.set()
+
+    entry = asyncio.run(main())
+    assert entry.status_code == 200
+    assert len(calls) == 2
+
+
+def test_cancelled_waiter_does_not_cancel_the_load():
+    release = threading.Event()
+
+    def loader():
+        release.wait(5)
+        return _entry()
+
+    async def main():
+        cache = ResponseCache(ttl=30)
+        leader = asyncio.create_task(cache.get_or_load("k", loader))
+        await asyncio.sleep(0.05)
+        waiter = asyncio.create_task(cache.get_or_load("k", loader))
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        release.set()
+        return await leader
+
+    assert asyncio.run(main()).status_code == 200
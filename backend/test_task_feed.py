@@ -0,0 +1,73 @@
+from datetime import datetime
+
+import pytest
+from app.database.db import get_db_connection
+from app.modules.tasks.task_feed import (
+    build_task_filters,
+    decode_cursor,
+    encode_cursor,
+    fetch_task_feed,
+)
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 1, 20, 8, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "", "MjAyNS0wMS0yMA==", "eHx5"])
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_filters_ignore_invalid_durations():
+    clauses, params = build_task_filters(
+        {
+            "priority": "high",
+            "status": "pending",
+            "estimated_duration_min": "abc",
+            "estimated_duration_max": "30",
+        }
+    )
+    assert clauses == (
+        " AND priority = %s AND status = %s AND estimated_duration <= %s"
+    )
+    assert params == ["high", "pending", 30]
+
+
+def test_ai_generated_filter():
+    assert build_task_filters({"ai_generated": "true"}) == (
+        " AND priority IS NOT NULL AND category IS NOT NULL",
+        [],
+    )
+    assert build_task_filters({"ai_generated": "FALSE"}) == (
+        " AND (priority IS NULL OR category IS NULL)",
+        [],
+    )
+    assert build_task_filters({"ai_generated": "maybe"}) == ("", [])
+
+
+def test_pages_cover_created_and_assigned_tasks_once(database):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            # Rohan (4) creates a task for himself and is assigned one by Asha (3)
+            cur.execute(
+                """INSERT INTO tasks (title, created_by, assigned_to) VALUES
+                   ('Own task', 4, 4), ('From Asha', 3, 4)"""
+            )
+            everything, no_cursor = fetch_task_feed(cur, 4, {})
+            assert no_cursor is None
+
+            pages, cursor = [], None
+            while True:
+                rows, cursor = fetch_task_feed(cur, 4, {}, limit=2, cursor=cursor)
+                pages.extend(rows)
+                if cursor is None:
+                    break
+
+    ids = [row[0] for row in pages]
+    assert len(ids) == len(set(ids))
+    assert ids == [row[0] for row in everything]
+    keys = [(row[7], row[0]) for row in pages]
+    assert keys == sorted(keys, reverse=True)
@@ -0,0 +1,86 @@
+import pytest
+from app.database.db import get_db_connection
+from app.modules.tickets.duplicates import DuplicateTicket, find_duplicate_tickets
+from conftest import bearer
+
+# Seeded ticket 2, Asha's (3) open "Technical" ticket
+SUBJECT = "App navigation help"
+DESCRIPTION = "Having trouble finding the local groups section in the app"
+
+
+@pytest.mark.parametrize(
+    "status, is_open",
+    [("open", True), ("in_progress", True), ("resolved", False), ("closed", False)],
+)
+def test_is_open(status, is_open):
+    assert DuplicateTicket(1, 3, "Subject", status, 11, 0.9).is_open is is_open
+
+
+def _find(user_id, subject, description=None, category=None):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            return find_duplicate_tickets(cur, user_id, subject, description, category)
+
+
+def test_own_open_tickets_are_found(database):
+    (duplicate,) = _find(3, SUBJECT, "Having trouble finding the groups section")
+    assert (duplicate.id, duplicate.status, duplicate.assigned_to) == (2, "open", 11)
+    assert 0.45 <= duplicate.similarity < 1
+
+    assert _find(3, "Payment refund", "Charged twice for a visit") == []
+
+
+def test_other_users_tickets_only_count_within_the_category(database):
+    # Rohan (4) has no such ticket of their own
+    assert _find(4, SUBJECT, DESCRIPTION) == []
+    assert [d.id for d in _find(4, SUBJECT, DESCRIPTION, "Technical")] == [2]
+    assert _find(4, SUBJECT, DESCRIPTION, "Billing") == []
+
+
+def test_closed_own_tickets_are_ignored_outside_the_category(database):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("UPDATE tickets SET status = 'closed' WHERE id = 2")
+    assert _find(3, SUBJECT, DESCRIPTION) == []
+    (duplicate,) = _find(3, SUBJECT, DESCRIPTION, "Technical")
+    assert not duplicate.is_open
+
+
+def test_most_similar_first(database):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """INSERT INTO tickets (user_id, subject, description, category)
+                   VALUES (3, 'App navigation', 'Cannot find the groups', 'Technical')"""
+            )
+    duplicates = _find(3, SUBJECT, DESCRIPTION)
+    assert duplicates[0].id == 2
+    assert [d.similarity for d in duplicates] == sorted(
+        (d.similarity for d in duplicates), reverse=True
+    )
+
+
+def test_near_identical_ticket_is_linked(client):
+    response = client.post(
+        "/api/tickets",
+        headers=bearer("story_asha_token_001"),
+        json={"subject": SUBJECT, "description": DESCRIPTION, "category": "Technical"},
+    )
+    assert response.status_code == 201
+    data = response.json()["data"]
+    assert data["duplicate_of"] == 2
+    assert data["auto_assigned_to"] == 11
+    assert [d["id"] for d in data["possible_duplicates"]] == [2]
+
+
+def test_other_users_tickets_are_never_linked(client):
+    response = client.post(
+        "/api/tickets",
+        headers=bearer("story_rohan_token_001"),
+        json={"subject": SUBJECT, "description": DESCRIPTION, "category": "Technical"},
+    )
+    assert response.status_code == 201
+    data = response.json()["data"]
+    assert "duplicate_of" not in data
+    assert data["possible_duplicates"] == []
+    assert data["similar_tickets_in_category"] == 1
@@ -0,0 +1,101 @@
+from collections import Counter
+
+import pytest
+from app.database.db import get_db_connection
+from app.modules.tickets.assignment import least_loaded
+from app.modules.tickets.escalation import TicketEscalationEngine
+
+
+def test_least_loaded_picks_the_fewest_open_tickets():
+    assert least_loaded({11: 3, 12: 1, 13: 2}) == 12
+    assert least_loaded({11: 3, 12: 1, 13: 2}, exclude=12) == 13
+
+
+def test_least_loaded_falls_back_to_the_excluded_user():
+    assert least_loaded({11: 5}, exclude=11) == 11
+    assert least_loaded({}) is None
+    assert least_loaded({}, exclude=11) is None
+
+
+def test_least_loaded_breaks_ties_among_the_fewest():
+    picks = {least_loaded({11: 1, 12: 1, 13: 4}) for _ in range(50)}
+    assert picks <= {11, 12}
+
+
+def _execute(query, params=()):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+            return cur.fetchall() if cur.description else None
+
+
+def _breach(*ticket_ids):
+    # Seeded ticket 1 is medium priority (1440-minute SLA)
+    _execute(
+        """UPDATE tickets SET updated_at = LOCALTIMESTAMP - interval '2 days'
+           WHERE id = ANY(%s)""",
+        (list(ticket_ids),),
+    )
+
+
+def _notifications():
+    return _execute(
+        """SELECT user_id, body FROM notifications
+           WHERE type = 'support_ticket' ORDER BY user_id"""
+    )
+
+
+@pytest.fixture
+def engine(database):
+    return TicketEscalationEngine(interval=0, batch_size=10)
+
+
+def test_breached_ticket_moves_to_another_support_user(engine):
+    _breach(1)
+    assert engine.escalate_batch() == 1
+    assert _execute(
+        "SELECT assigned_to, escalation_level FROM tickets WHERE id = 1"
+    ) == [(12, 1)]
+    notifications = _notifications()
+    assert [user_id for user_id, _ in notifications] == [11, 12]
+    assert notifications[0][1].endswith("and was reassigned.")
+    assert notifications[1][1].endswith("and is now assigned to you.")
+
+    # The escalation counts as activity
+    assert engine.escalate_batch() == 0
+
+
+def test_admins_are_notified_from_the_policy_level(engine):
+    admin_ids = [
+        row[0]
+        for row in _execute(
+            """SELECT id FROM users WHERE role = 'admin' AND status = 'active'
+               AND deleted_at IS NULL"""
+        )
+    ]
+    _execute("UPDATE tickets SET escalation_level = 1 WHERE id = 1")
+    _breach(1)
+
+    assert engine.escalate_batch() == 1
+    notified = {user_id for user_id, _ in _notifications()}
+    assert notified == {11, 12, *admin_ids}
+
+
+def test_a_batch_is_spread_across_support_users(engine):
+    _execute(
+        """INSERT INTO tickets (user_id, assigned_to, subject, priority, status)
+           SELECT 3, NULL, 'Breached ' || n, 'medium', 'open'
+           FROM generate_series(1, 4) n"""
+    )
+    _execute("UPDATE tickets SET updated_at = LOCALTIMESTAMP - interval '2 days'")
+
+    # Ticket 1 and the new ones; low-priority tickets 2 and 3 have 3 days
+    assert engine.escalate_all() == 5
+    load = Counter(
+        row[0]
+        for row in _execute(
+            "SELECT assigned_to FROM tickets WHERE status IN ('open', 'in_progress')"
+        )
+    )
+    assert set(load) == {11, 12}
+    assert abs(load[11] - load[12]) <= 1
@@ -0,0 +1,97 @@
+from collections import Counter
+
+import pytest
+from app.database.db import get_db_connection
+from app.modules.users.purge import user_purger
+from conftest import bearer
+
+
+def _execute(query, params=()):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+            return cur.fetchall() if cur.description else None
+
+
+@pytest.fixture
+def rohan_deleted(client):
+    # A request by Rohan (4) for Priya (5), then Rohan is deleted (not yet purged)
+    _execute(
+        """INSERT INTO care_requests (senior_citizen_id, caregiver_id, made_by)
+           VALUES (3, 5, 4), (3, 5, 3)"""
+    )
+    _execute("UPDATE users SET deleted_at = now() WHERE id = 4")
+    return client
+
+
+def test_care_requests_from_deleted_users_are_hidden(rohan_deleted):
+    response = rohan_deleted.get(
+        "/api/care-requests", headers=bearer("story_priya_token_001")
+    )
+    assert response.status_code == 200
+    requests = [
+        request
+        for group in response.json()["data"]["care_requests"]
+        for request in group["requests"]
+    ]
+    assert [request["made_by"] for request in requests] == [3]
+
+
+def test_tasks_from_deleted_users_are_hidden(rohan_deleted):
+    # Every seeded task was created by Rohan for Asha (3)
+    headers = bearer("story_asha_token_001")
+    response = rohan_deleted.get("/api/tasks", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["data"]["tasks"] == []
+    assert rohan_deleted.get("/api/tasks/1", headers=headers).status_code == 404
+
+
+def test_ticket_names_of_deleted_users_are_empty(rohan_deleted):
+    response = rohan_deleted.get("/api/tickets", headers=bearer("test_admin_token_001"))
+    tickets = {ticket["id"]: ticket for ticket in response.json()["data"]["tickets"]}
+    assert tickets[1]["created_by_name"] is None
+    assert tickets[2]["created_by_name"] == "Asha"
+
+
+def test_purge_spreads_open_tickets_across_support_users(database):
+    # Support user 11 has tickets 1 and 2; 12 already has ticket 3
+    _execute(
+        """INSERT INTO users (gmail_id, firebase_uid, full_name, role, status)
+           VALUES ('support3@test.com', 'test_support_uid_003', 'Support Three',
+                   'support_user', 'active')"""
+    )
+    _execute(
+        """INSERT INTO tickets (user_id, assigned_to, subject, status) VALUES
+           (3, 11, 'Open one', 'open'), (3, 11, 'Open two', 'open'),
+           (3, 11, 'Done', 'closed')"""
+    )
+    _execute("UPDATE users SET deleted_at = now() WHERE id = 11")
+
+    assert user_purger.purge(11)
+
+    rows = _execute("SELECT assigned_to, status::text FROM tickets ORDER BY id")
+    assert (None, "closed") in rows
+    open_load = Counter(assignee for assignee, status in rows if status != "closed")
+    assert None not in open_load
+    assert set(open_load) == {12, 13}
+    assert max(open_load.values()) - min(open_load.values()) <= 1
+
+
+def test_purge_removes_recurring_tasks_in_batches(database, monkeypatch):
+    monkeypatch.setattr(user_purger, "batch_size", 2)
+    monkeypatch.setattr(user_purger, "pause", 0)
+    _execute(
+        """INSERT INTO task_recurrences (title, frequency, starts_at, created_by,
+                                         assigned_to)
+           SELECT 'By Rohan ' || n, 'daily'::recurrence_frequency, LOCALTIMESTAMP, 4, 3
+           FROM generate_series(1, 3) n
+           UNION ALL
+           SELECT 'For Rohan', 'daily', LOCALTIMESTAMP, 3, 4"""
+    )
+    _execute("UPDATE users SET deleted_at = now() WHERE id = 4")
+
+    assert user_purger.purge(4)
+
+    assert _execute("SELECT title, created_by, assigned_to FROM task_recurrences") == [
+        ("For Rohan", 3, None)
+    ]
@@ -0,0 +1,125 @@
+import pytest
+from app.database.db import get_db_connection
+from app.modules.care.visits import find_conflicting_visit, parse_availability_query
+from conftest import bearer
+from psycopg2 import errors
+
+PRIYA = "story_priya_token_001"
+
+
+@pytest.fixture
+def visits(database):
+    """
+    Requests to Priya (5) concerning Asha (3), by name: an accepted 10:00-11:00
+    visit and pending ones around it. Each comes from a different user, who
+    may only have one active request with her.
+    """
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """INSERT INTO care_requests (senior_citizen_id, caregiver_id, made_by,
+                                              timing_to_visit, visit_duration_minutes,
+                                              status)
+                   VALUES (3, 5, 4, '2030-01-01 10:00', 60, 'accepted'),
+                          (3, 5, 3, '2030-01-01 10:30', 60, 'pending'),
+                          (3, 5, 1, '2030-01-01 11:00', 30, 'pending'),
+                          (3, 5, 6, '2030-01-01 09:00', 120, 'pending'),
+                          (3, 5, 7, NULL, 60, 'pending')
+                   RETURNING id"""
+            )
+            names = ("accepted", "overlapping", "adjacent", "enclosing", "untimed")
+            return dict(zip(names, (row[0] for row in cur.fetchall())))
+
+
+def _conflict(request_id):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            return find_conflicting_visit(cur, request_id)
+
+
+def test_overlapping_accepted_visits_are_found(visits):
+    start, end = _conflict(visits["overlapping"])
+    assert (start.isoformat(), end.isoformat()) == (
+        "2030-01-01T10:00:00",
+        "2030-01-01T11:00:00",
+    )
+    assert _conflict(visits["enclosing"]) is not None
+    # Visits are half-open: one may start when the other ends
+    assert _conflict(visits["adjacent"]) is None
+    assert _conflict(visits["untimed"]) is None
+    # The accepted visit does not conflict with itself
+    assert _conflict(visits["accepted"]) is None
+
+
+def test_pending_requests_never_conflict(visits):
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "UPDATE care_requests SET status = 'pending' WHERE id = %s",
+                (visits["accepted"],),
+            )
+    assert _conflict(visits["overlapping"]) is None
+
+
+def test_constraint_rejects_a_second_overlapping_acceptance(visits):
+    with pytest.raises(errors.ExclusionViolation):
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "UPDATE care_requests SET status = 'accepted' WHERE id = %s",
+                    (visits["overlapping"],),
+                )
+
+
+def _accept(client, request_id):
+    return client.post(
+        f"/api/caregivers/engagements/{request_id}/accept",
+        headers=bearer(PRIYA),
+        json={"id_token": PRIYA},
+    )
+
+
+def test_caregiver_cannot_accept_an_overlapping_visit(client, visits):
+    response = _accept(client, visits["overlapping"])
+    assert response.status_code == 409
+    assert _accept(client, visits["enclosing"]).status_code == 409
+    assert _accept(client, visits["adjacent"]).status_code == 200
+    assert _accept(client, visits["untimed"]).status_code == 200
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT status::text FROM care_requests WHERE id = %s",
+                (visits["overlapping"],),
+            )
+            assert cur.fetchone()[0] == "pending"
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"end": "2030-01-02T00:00:00"},
+        {"start": "2030-01-02T00:00:00", "end": "2030-01-01T00:00:00"},
+        {"start": "2030-01-01T00:00:00", "end": "2030-03-01T00:00:00"},
+        {
+            "start": "2030-01-01T00:00:00",
+            "end": "2030-01-02T00:00:00",
+            "caregiver_ids": "5,x",
+        },
+    ],
+)
+def test_invalid_availability_queries_raise(params):
+    with pytest.raises(ValueError):
+        parse_availability_query(params)
+
+
+def test_availability_lists_accepted_visits(client, visits):
+    response = client.get(
+        "/api/caregivers/availability?start=2030-01-01T00:00:00"
+        "&end=2030-01-02T00:00:00&caregiver_ids=5",
+        headers=bearer("story_rohan_token_001"),
+    )
+    assert response.status_code == 200
+    (priya,) = response.json()["data"]["caregivers"]
+    assert not priya["free"]
+    assert [visit["start"] for visit in priya["busy"]] == ["2030-01-01T10:00:00"]